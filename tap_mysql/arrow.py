@@ -0,0 +1,165 @@
+"""Columnar extraction into Arrow record batches.
+
+Needs the optional `pyarrow` package, from the `arrow` extra. Rows are turned
+into one Arrow array per column, typed from the column's SQL type, so
+conversions run once per column and batch rather than once per value.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+import sqlalchemy
+from sqlalchemy.dialects import mysql
+
+from tap_mysql.converters import DECIMAL_AS
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    import pyarrow as pa
+
+# Largest precision of Arrow's 128 bit decimals.
+DECIMAL128_MAX_PRECISION = 38
+
+
+def import_pyarrow() -> Any:  # noqa: ANN401
+    """Import `pyarrow`, explaining how to get it if it is missing.
+
+    Returns:
+        The `pyarrow` module.
+
+    Raises:
+        ImportError: If `pyarrow` is not installed.
+    """
+    try:
+        import pyarrow  # noqa: ICN001, PLC0415
+    except ImportError as ex:
+        msg = (
+            "Arrow record batches need the `pyarrow` package, "
+            "install tap-mysql with the `arrow` extra."
+        )
+        raise ImportError(msg) from ex
+    return pyarrow
+
+
+def _json_text(values: list[Any]) -> list[str | None]:
+    return [None if value is None else json.dumps(value) for value in values]
+
+
+def arrow_type(  # noqa: C901, PLR0911, PLR0912
+    column_type: sqlalchemy.types.TypeEngine,
+    decimal_as: str = "decimal",
+) -> pa.DataType | None:
+    """Return the Arrow type for values of a column.
+
+    Values are as read by `MySQLConnector` connections, see
+    `driver_conversions`.
+
+    Args:
+        column_type: The column's SQLAlchemy type, as from `get_sqlalchemy_type`.
+        decimal_as: How DECIMAL values are read, one of `DECIMAL_AS`.
+
+    Returns:
+        The Arrow type, or None to let Arrow infer it from the values.
+    """
+    pyarrow = import_pyarrow()
+    if isinstance(column_type, sqlalchemy.types.Boolean):
+        return pyarrow.bool_()
+    if isinstance(column_type, mysql.BIT):
+        return pyarrow.uint64()
+    if isinstance(column_type, sqlalchemy.types.Integer):
+        if getattr(column_type, "unsigned", False):
+            return pyarrow.uint64()
+        return pyarrow.int64()
+    if isinstance(column_type, sqlalchemy.types.Float):
+        return pyarrow.float64()
+    if isinstance(column_type, sqlalchemy.types.Numeric):
+        if decimal_as == "float":
+            return pyarrow.float64()
+        if decimal_as == "string":
+            return pyarrow.string()
+        precision, scale = column_type.precision, column_type.scale
+        if precision is None or scale is None:
+            return None
+        if precision > DECIMAL128_MAX_PRECISION:
+            return pyarrow.decimal256(precision, scale)
+        return pyarrow.decimal128(precision, scale)
+    if isinstance(column_type, sqlalchemy.types.DateTime):
+        return pyarrow.timestamp("us")
+    if isinstance(column_type, sqlalchemy.types.Date):
+        return pyarrow.date32()
+    if isinstance(column_type, sqlalchemy.types.Time):
+        return pyarrow.time64("us")
+    if isinstance(column_type, sqlalchemy.types.JSON):
+        return pyarrow.string()
+    if isinstance(column_type, sqlalchemy.types._Binary):  # noqa: SLF001
+        return pyarrow.binary()
+    if isinstance(column_type, sqlalchemy.types.String):
+        return pyarrow.string()
+    return None
+
+
+class ArrowBatchBuilder:
+    """Build Arrow record batches of a fixed set of columns from row tuples."""
+
+    def __init__(
+        self,
+        columns: Sequence[sqlalchemy.Column],
+        decimal_as: str = "decimal",
+    ) -> None:
+        """Pick each column's Arrow type and conversion.
+
+        Args:
+            columns: The columns, in the order of values in the rows.
+            decimal_as: How DECIMAL values are read, one of `DECIMAL_AS`.
+
+        Raises:
+            ValueError: If `decimal_as` is not one of `DECIMAL_AS`.
+        """
+        if decimal_as not in DECIMAL_AS:
+            msg = f"decimal_as must be one of {', '.join(DECIMAL_AS)}."
+            raise ValueError(msg)
+        pyarrow = import_pyarrow()
+        self.names = [column.name for column in columns]
+        self._types = [arrow_type(column.type, decimal_as) for column in columns]
+        # Per column: a conversion of the Python values, and the type Arrow
+        # reads them as before a cast to the final type.
+        self._plans: list[tuple[Callable | None, pa.DataType | None]] = []
+        for column, column_arrow_type in zip(columns, self._types):
+            if isinstance(column.type, sqlalchemy.types.JSON):
+                self._plans.append((_json_text, column_arrow_type))
+            elif column_arrow_type == pyarrow.bool_():
+                # BOOLEAN (TINYINT(1)) values are ints, cast in one go.
+                self._plans.append((None, pyarrow.int64()))
+            else:
+                self._plans.append((None, column_arrow_type))
+
+    def build(self, rows: Sequence[Sequence[Any]]) -> pa.RecordBatch:
+        """Build a record batch.
+
+        Args:
+            rows: Row tuples, with values in the order of the columns.
+
+        Returns:
+            A record batch with one array per column.
+        """
+        pyarrow = import_pyarrow()
+        columns: Iterable[Sequence[Any]] = (
+            zip(*rows) if rows else [() for _ in self.names]
+        )
+        arrays = []
+        for values, (convert, read_type), final_type in zip(
+            columns,
+            self._plans,
+            self._types,
+        ):
+            array = pyarrow.array(
+                convert(list(values)) if convert is not None else values,
+                type=read_type,
+            )
+            if final_type is not None and array.type != final_type:
+                array = array.cast(final_type)
+            arrays.append(array)
+        return pyarrow.RecordBatch.from_arrays(arrays, names=self.names)
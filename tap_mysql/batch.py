@@ -0,0 +1,160 @@
+"""BATCH files written straight from query results."""
+
+from __future__ import annotations
+
+import gzip
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+import simplejson
+
+from tap_mysql.arrow import import_pyarrow
+from tap_mysql.conform import convert_by_type
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from singer_sdk.helpers._batch import BatchConfig
+
+    from tap_mysql.arrow import ArrowBatchBuilder
+
+
+def import_parquet() -> Any:  # noqa: ANN401
+    """Import `pyarrow.parquet`, explaining how to get it if it is missing.
+
+    Returns:
+        The `pyarrow.parquet` module.
+
+    Raises:
+        ImportError: If `pyarrow` is not installed.
+    """
+    try:
+        import_pyarrow()
+        import pyarrow.parquet as pq  # noqa: PLC0415
+    except ImportError as ex:
+        msg = (
+            "Parquet batch files need the `pyarrow` package, "
+            "install tap-mysql with the `parquet` extra."
+        )
+        raise ImportError(msg) from ex
+    return pq
+
+
+def _json_default(value: Any) -> Any:  # noqa: ANN401
+    # Values JSON has no type for are written like `RecordConformer` writes them.
+    converted = convert_by_type(value)
+    return str(value) if converted is value else converted
+
+
+# One encoder for every row: `simplejson.dumps` with options builds a new one
+# per call. Without an encoding, bytes go to `_json_default` (hex) rather than
+# being decoded as text.
+_ENCODER = simplejson.JSONEncoder(
+    use_decimal=True,
+    encoding=None,
+    default=_json_default,
+    separators=(",", ":"),
+)
+
+
+class BatchFileWriter:
+    """Write batches of rows to files in a stream's batch storage.
+
+    Rows are written as they come from the cursor, as tuples in the order of
+    `keys`, without building RECORD messages or conforming each record.
+    """
+
+    def __init__(
+        self,
+        batch_config: BatchConfig,
+        *,
+        tap_name: str,
+        stream_name: str,
+        arrow_builder: ArrowBatchBuilder | None = None,
+    ) -> None:
+        """Prepare file names for one sync of a stream.
+
+        Args:
+            batch_config: The stream's batch configuration.
+            tap_name: Name of the tap, used in file names.
+            stream_name: Name of the stream, used in file names.
+            arrow_builder: Builds the Parquet columns with the stream's column
+                types. Without it, Arrow infers types from each batch's values.
+        """
+        if batch_config.encoding.format == "parquet":
+            # Fail before the query, not on the first batch file.
+            import_parquet()
+        self.batch_config = batch_config
+        self.arrow_builder = arrow_builder
+        self._sync_id = f"{tap_name}--{stream_name}-{uuid4()}"
+        self._file_count = 0
+
+    @property
+    def _compressed(self) -> bool:
+        return self.batch_config.encoding.compression == "gzip"
+
+    def write(self, keys: Sequence[str], rows: Sequence[Sequence[Any]]) -> list[str]:
+        """Write one batch of rows to a new file.
+
+        Args:
+            keys: Column names.
+            rows: Row tuples, in the order of `keys`.
+
+        Returns:
+            The manifest of the batch: the URL of the file.
+
+        Raises:
+            ValueError: If the batch encoding format is not supported.
+        """
+        self._file_count += 1
+        encoding_format = self.batch_config.encoding.format
+        if encoding_format == "jsonl":
+            extension = ".json.gz" if self._compressed else ".json"
+            write = self._write_jsonl
+        elif encoding_format == "parquet":
+            extension = ".parquet.gz" if self._compressed else ".parquet"
+            write = self._write_parquet
+        else:
+            msg = f"Unsupported batch encoding format: {encoding_format}"
+            raise ValueError(msg)
+
+        prefix = self.batch_config.storage.prefix or ""
+        filename = f"{prefix}{self._sync_id}-{self._file_count}{extension}"
+        with self.batch_config.storage.fs(create=True) as fs:
+            with fs.open(filename, "wb") as f:
+                write(f, keys, rows)
+            return [fs.geturl(filename)]
+
+    def _write_jsonl(
+        self,
+        f: Any,  # noqa: ANN401
+        keys: Sequence[str],
+        rows: Sequence[Sequence[Any]],
+    ) -> None:
+        encode = _ENCODER.encode
+        lines = ((encode(dict(zip(keys, row))) + "\n").encode() for row in rows)
+        if self._compressed:
+            with gzip.GzipFile(fileobj=f, mode="wb") as gz:
+                gz.writelines(lines)
+        else:
+            f.writelines(lines)
+
+    def _write_parquet(
+        self,
+        f: Any,  # noqa: ANN401
+        keys: Sequence[str],
+        rows: Sequence[Sequence[Any]],
+    ) -> None:
+        pq = import_parquet()
+        pyarrow = import_pyarrow()
+
+        if self.arrow_builder is not None:
+            table = pyarrow.Table.from_batches([self.arrow_builder.build(rows)])
+        else:
+            # Columns straight from the row tuples, no per-row dicts.
+            columns = list(zip(*rows)) if rows else [() for _ in keys]
+            table = pyarrow.Table.from_arrays(
+                [pyarrow.array(column) for column in columns],
+                names=list(keys),
+            )
+        pq.write_table(table, f, compression="gzip" if self._compressed else "snappy")
@@ -0,0 +1,501 @@
+"""Binlog (LOG_BASED) replication helpers.
+
+Reading the binlog needs the optional `mysql-replication` package, installed
+with the `binlog` extra. Everything else here works on plain event dicts, so
+decoding can be tested against recorded events without a server.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any, cast
+
+import sqlalchemy
+from sqlalchemy.dialects import mysql
+
+from tap_mysql.lobs import FILE, apply_policy, as_text
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Iterable, Iterator, Mapping
+
+    from sqlalchemy.engine import Connection
+
+    from tap_mysql.lobs import LobStore
+
+ROW_EVENT_KINDS = {
+    "WriteRowsEvent": "insert",
+    "UpdateRowsEvent": "update",
+    "PartialUpdateRowsEvent": "update",
+    "DeleteRowsEvent": "delete",
+}
+UNKNOWN_COLUMN_PREFIX = "UNKNOWN_COL"
+
+# Range of derived replica server ids, above the small ids replicas are
+# usually given by hand.
+SERVER_ID_MIN = 2**16
+SERVER_ID_MAX = 2**32 - 1
+
+
+def add_gtid(gtid_set: str | None, gtid: str) -> str:
+    """Add one transaction to a GTID set.
+
+    Args:
+        gtid_set: A GTID set such as `uuid:1-5:7,uuid2:1-3`, or None.
+        gtid: A single GTID, `uuid:transaction_id`.
+
+    Returns:
+        The GTID set including `gtid`, with intervals merged.
+    """
+    intervals: dict[str, list[tuple[int, int]]] = {}
+    for member in (gtid_set or "").replace("\n", "").split(","):
+        if not member.strip():
+            continue
+        source_id, *member_intervals = member.strip().split(":")
+        for interval in member_intervals:
+            first, _, last = interval.partition("-")
+            intervals.setdefault(source_id, []).append((int(first), int(last or first)))
+
+    source_id, _, transaction_id = gtid.partition(":")
+    intervals.setdefault(source_id, []).append(
+        (int(transaction_id), int(transaction_id))
+    )
+
+    members = []
+    for source_id, source_intervals in intervals.items():
+        merged: list[list[int]] = []
+        for low, high in sorted(source_intervals):
+            if merged and low <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], high)
+            else:
+                merged.append([low, high])
+        members.append(
+            ":".join(
+                [source_id]
+                + [
+                    str(low) if low == high else f"{low}-{high}" for low, high in merged
+                ],
+            )
+        )
+    return ",".join(members)
+
+
+def _decode_json(value: Any) -> Any:  # noqa: ANN401
+    """Decode the keys and text of a JSON value parsed from the binlog.
+
+    The binlog reader parses JSON documents, but leaves object keys and
+    strings as bytes.
+
+    Args:
+        value: The parsed document.
+
+    Returns:
+        The document with all bytes decoded as UTF-8.
+    """
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    if isinstance(value, dict):
+        return {_decode_json(key): _decode_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode_json(item) for item in value]
+    return value
+
+
+def _value_converter(  # noqa: PLR0911
+    column_type: sqlalchemy.types.TypeEngine,
+    decimal_as: str = "decimal",
+) -> Callable | None:
+    """Return a function turning a binlog value into what a SELECT returns.
+
+    The binlog reader decodes values from the row image, which differs from
+    the DBAPI for a few types (BIT as a bit string, TIME as a timedelta,
+    undecoded text on servers that do not log charsets, DECIMAL always as a
+    `Decimal`).
+
+    Args:
+        column_type: The column's reflected SQLAlchemy type.
+        decimal_as: How DECIMAL values are read, see `driver_conversions`.
+
+    Returns:
+        The converter, or None if values can be used as they are.
+    """
+    if isinstance(column_type, sqlalchemy.types.Numeric) and not isinstance(
+        column_type,
+        sqlalchemy.types.Float,
+    ):
+        return {"float": float, "string": str}.get(decimal_as)
+    if isinstance(column_type, mysql.BIT):
+        return lambda value: int(value, 2) if isinstance(value, str) else value
+    if isinstance(column_type, sqlalchemy.types.JSON):
+        return lambda value: (
+            json.loads(value) if isinstance(value, str) else _decode_json(value)
+        )
+    if isinstance(column_type, mysql.SET):
+        order = list(column_type.values)
+        return lambda value: (
+            ",".join(item for item in order if item in value)
+            if isinstance(value, (set, frozenset))
+            else value
+        )
+    if isinstance(column_type, sqlalchemy.types.Time):
+        # Same as SQLAlchemy's MySQL TIME result processor.
+        return lambda value: (
+            (
+                datetime.datetime.min  # noqa: DTZ901
+                + datetime.timedelta(
+                    seconds=value.seconds,
+                    microseconds=value.microseconds,
+                )
+            ).time()
+            if isinstance(value, datetime.timedelta)
+            else value
+        )
+    if isinstance(column_type, sqlalchemy.types.String) and not isinstance(
+        column_type,
+        sqlalchemy.types._Binary,  # noqa: SLF001
+    ):
+        return lambda value: (
+            value.decode("utf-8", errors="replace")
+            if isinstance(value, bytes)
+            else value
+        )
+    return None
+
+
+class BinlogDecoder:
+    """Turn the row images of one table's binlog events into records.
+
+    Columns are named by the event when the server logs full row metadata
+    (`binlog_row_metadata=FULL`), and by their position in the table's
+    current definition otherwise.
+
+    Large objects are emitted under their LOB policy as by a SELECT, see
+    `tap_mysql.lobs`, only applied here rather than by the server.
+    """
+
+    def __init__(
+        self,
+        table: sqlalchemy.Table,
+        decimal_as: str = "decimal",
+        *,
+        lob_policies: Mapping[str, str] | None = None,
+        lob_max_length: int = 0,
+        lob_store: LobStore | None = None,
+    ) -> None:
+        """Prepare value converters for the table's columns.
+
+        Args:
+            table: The table, with all of its columns in ordinal order.
+            decimal_as: How DECIMAL values are read, see `driver_conversions`.
+            lob_policies: Policies of large object columns, by column name,
+                for those that are not `inline`.
+            lob_max_length: Characters, or bytes, kept by the `truncate` policy.
+            lob_store: Where the `file` policy writes values to.
+
+        Raises:
+            ValueError: If a column has the `file` policy and no `lob_store`
+                is given.
+        """
+        self.column_names = [column.name for column in table.columns]
+        self._converters = {
+            column.name: converter
+            for column in table.columns
+            if (converter := _value_converter(column.type, decimal_as)) is not None
+        }
+        self._lob_policies = dict(lob_policies or {})
+        if FILE in self._lob_policies.values() and lob_store is None:
+            msg = "The `file` LOB policy needs a store to write values to."
+            raise ValueError(msg)
+        self._lob_max_length = lob_max_length
+        self._lob_store = lob_store
+        self._json_columns = {
+            column.name
+            for column in table.columns
+            if isinstance(column.type, sqlalchemy.types.JSON)
+        }
+
+    def _apply_lob_policy(self, column_name: str, value: Any) -> Any:  # noqa: ANN401
+        policy = self._lob_policies[column_name]
+        text = as_text(value, is_json=column_name in self._json_columns)
+        if policy == FILE:
+            return cast("LobStore", self._lob_store).put_value(column_name, text)
+        return apply_policy(text, policy, max_length=self._lob_max_length)
+
+    def _column_name(self, name: str) -> str:
+        if name.startswith(UNKNOWN_COLUMN_PREFIX):
+            index = int(name[len(UNKNOWN_COLUMN_PREFIX) :])
+            if index < len(self.column_names):
+                return self.column_names[index]
+        return name
+
+    def decode_row(self, values: dict[str, Any]) -> dict[str, Any]:
+        """Name and convert the values of one row image.
+
+        Args:
+            values: Column values as read from the binlog.
+
+        Returns:
+            The row as a record.
+        """
+        record = {}
+        for name, read_value in values.items():
+            column_name = self._column_name(name)
+            converter = self._converters.get(column_name)
+            value = read_value
+            if converter is not None and value is not None:
+                value = converter(value)
+            if column_name in self._lob_policies and value is not None:
+                value = self._apply_lob_policy(column_name, value)
+            record[column_name] = value
+        return record
+
+    def records(self, event: dict[str, Any]) -> list[dict[str, Any]]:
+        """Return the records of one rows event.
+
+        Inserts and updates are the row as written, deletes are the row as it
+        was with `_sdc_deleted_at` set to the time of the event.
+
+        Args:
+            event: A rows event, see `event_to_dict`.
+
+        Returns:
+            One record per row.
+        """
+        deleted_at = None
+        if event["kind"] == "delete":
+            deleted_at = datetime.datetime.fromtimestamp(
+                event["timestamp"],
+                tz=datetime.timezone.utc,
+            ).isoformat()
+
+        records = []
+        for row in event["rows"]:
+            # Deleted rows are in `values`, as inserted ones.
+            values = row["after_values"] if event["kind"] == "update" else row["values"]
+            record = self.decode_row(values)
+            record["_sdc_deleted_at"] = deleted_at
+            records.append(record)
+        return records
+
+
+def iter_changes(
+    events: Iterable[dict[str, Any]],
+    decoder: BinlogDecoder,
+    position: dict[str, Any],
+    end_position: dict[str, Any] | None = None,
+) -> Iterator[tuple[list[dict[str, Any]], dict[str, Any] | None]]:
+    """Walk binlog events, yielding records and safe resume positions.
+
+    A position is only yielded at a transaction commit, since resuming in the
+    middle of a transaction would skip the table map its rows refer to.
+
+    Args:
+        events: Event dicts, see `event_to_dict`.
+        decoder: Decoder for the table the events are about.
+        position: Where reading started: `log_file`, `log_pos` and, when
+            GTIDs are tracked, `gtid_set`.
+        end_position: Stop at the first commit at or after this `log_file`
+            and `log_pos`, so a sync ends even while the table keeps changing.
+
+    Yields:
+        `(records, None)` for every rows event, and `([], position)` after
+        every commit with the position to resume from.
+    """
+    position = dict(position)
+    pending_gtid = None
+    for event in events:
+        kind = event["kind"]
+        if kind in {"insert", "update", "delete"}:
+            yield decoder.records(event), None
+        elif kind == "rotate":
+            position["log_file"] = event["next_binlog"]
+            position["log_pos"] = event["position"]
+        elif kind == "gtid":
+            pending_gtid = event["gtid"]
+        elif kind == "commit":
+            position["log_pos"] = event["log_pos"]
+            if pending_gtid is not None and "gtid_set" in position:
+                position["gtid_set"] = add_gtid(position["gtid_set"], pending_gtid)
+            pending_gtid = None
+            yield [], dict(position)
+            if end_position is not None and (
+                position["log_file"],
+                position["log_pos"],
+            ) >= (end_position["log_file"], end_position["log_pos"]):
+                return
+
+
+def event_to_dict(event: Any) -> dict[str, Any] | None:  # noqa: ANN401
+    """Convert an event from `mysql-replication` to a plain event dict.
+
+    Args:
+        event: A `pymysqlreplication` event.
+
+    Returns:
+        A dict with a `kind` key, or None for events that do not matter here.
+    """
+    event_type = type(event).__name__
+    if event_type in ROW_EVENT_KINDS:
+        return {
+            "kind": ROW_EVENT_KINDS[event_type],
+            "schema": event.schema,
+            "table": event.table,
+            "timestamp": event.timestamp,
+            "rows": event.rows,
+        }
+    if event_type == "RotateEvent":
+        return {
+            "kind": "rotate",
+            "next_binlog": event.next_binlog,
+            "position": event.position,
+        }
+    if event_type == "GtidEvent":
+        return {"kind": "gtid", "gtid": event.gtid}
+    if event_type == "XidEvent" or (
+        event_type == "QueryEvent" and event.query.strip().upper() == "COMMIT"
+    ):
+        return {"kind": "commit", "log_pos": event.packet.log_pos}
+    return None
+
+
+def binlog_position(conn: Connection) -> dict[str, Any] | None:
+    """Return the server's current binlog position.
+
+    Args:
+        conn: An open connection.
+
+    Returns:
+        `log_file`, `log_pos` and the executed `gtid_set`, empty unless GTIDs
+        are used, or None if binary logging is not enabled.
+    """
+    try:
+        row = conn.exec_driver_sql("SHOW BINARY LOG STATUS").mappings().first()
+    except sqlalchemy.exc.DBAPIError:
+        # Before MySQL 8.2
+        row = conn.exec_driver_sql("SHOW MASTER STATUS").mappings().first()
+    if row is None:
+        return None
+    return {
+        "log_file": row["File"],
+        "log_pos": row["Position"],
+        "gtid_set": (row.get("Executed_Gtid_Set") or "").replace("\n", ""),
+    }
+
+
+def connection_settings(url: sqlalchemy.engine.URL) -> dict[str, Any]:
+    """Return the PyMySQL connect arguments the binlog is read with.
+
+    The same as those of the tap's connections, including SSL and the other
+    options in the URL's query, as the binlog reader connects with PyMySQL
+    whatever the URL's driver.
+
+    Args:
+        url: URL of the server to read from.
+
+    Returns:
+        Keyword arguments of `pymysql.connect`, without the database, which
+        the reader sets itself.
+    """
+    _, settings = mysql.pymysql.dialect().create_connect_args(
+        url.set(drivername="mysql+pymysql")
+    )
+    settings.pop("database", None)
+    settings.setdefault("port", 3306)
+    settings.setdefault("password", "")
+    return settings
+
+
+def derive_server_id(url: sqlalchemy.engine.URL, tap_stream_id: str) -> int:
+    """Return a replica server id for a stream, the same on every run.
+
+    It is derived from the server, the user and the stream, so streams synced
+    concurrently read the binlog with different ids.
+
+    Args:
+        url: URL of the server to read from.
+        tap_stream_id: The stream's id.
+
+    Returns:
+        A server id from `SERVER_ID_MIN` to `SERVER_ID_MAX`.
+    """
+    key = f"{url.host}:{url.port or 3306}:{url.username}:{tap_stream_id}"
+    digest = int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "big")
+    return SERVER_ID_MIN + digest % (SERVER_ID_MAX - SERVER_ID_MIN + 1)
+
+
+def read_events(  # noqa: PLR0913
+    url: sqlalchemy.engine.URL,
+    *,
+    server_id: int,
+    schema_name: str,
+    table_name: str,
+    position: dict[str, Any],
+    use_gtid: bool,
+) -> Generator[dict[str, Any], None, None]:
+    """Read one table's binlog events from the server until the end of the log.
+
+    Args:
+        url: URL of the server to read from.
+        server_id: Replica server id to connect with, unique among replicas.
+        schema_name: Schema of the table.
+        table_name: Name of the table.
+        position: Where to start, see `iter_changes`.
+        use_gtid: Start from `gtid_set` rather than the binlog file position.
+
+    Yields:
+        Event dicts, see `event_to_dict`.
+
+    Raises:
+        ImportError: If `mysql-replication` is not installed.
+    """
+    try:
+        from pymysqlreplication import BinLogStreamReader  # noqa: PLC0415
+        from pymysqlreplication.event import (  # noqa: PLC0415
+            GtidEvent,
+            QueryEvent,
+            RotateEvent,
+            XidEvent,
+        )
+        from pymysqlreplication.row_event import (  # noqa: PLC0415
+            DeleteRowsEvent,
+            UpdateRowsEvent,
+            WriteRowsEvent,
+        )
+    except ImportError as ex:
+        msg = (
+            "LOG_BASED replication needs the `mysql-replication` package, "
+            "install tap-mysql with the `binlog` extra."
+        )
+        raise ImportError(msg) from ex
+
+    start: dict[str, Any] = {"resume_stream": True}
+    if use_gtid and position.get("gtid_set"):
+        start["auto_position"] = position["gtid_set"]
+    else:
+        start["log_file"] = position["log_file"]
+        start["log_pos"] = position["log_pos"]
+
+    reader = BinLogStreamReader(
+        connection_settings=connection_settings(url),
+        server_id=server_id,
+        blocking=False,
+        only_schemas=[schema_name],
+        only_tables=[table_name],
+        only_events=[
+            WriteRowsEvent,
+            UpdateRowsEvent,
+            DeleteRowsEvent,
+            RotateEvent,
+            GtidEvent,
+            XidEvent,
+            QueryEvent,
+        ],
+        **start,
+    )
+    try:
+        for event in reader:
+            if (event_dict := event_to_dict(event)) is not None:
+                yield event_dict
+    finally:
+        reader.close()
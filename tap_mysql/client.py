@@ -3,46 +3,221 @@
 from __future__ import annotations
 
 import datetime
-from typing import TYPE_CHECKING, Any
+import decimal
+import json
+import time
+from contextlib import AbstractContextManager, closing, contextmanager, nullcontext
+from functools import cached_property, partial
+from typing import TYPE_CHECKING, Any, cast
 
-import singer_sdk.helpers._typing
 import sqlalchemy
-from sqlalchemy.types import TypeDecorator, DateTime, Date
-from singer_sdk import SQLConnector, SQLStream
+from singer_sdk import SQLConnector, SQLStream, metrics
 from singer_sdk import typing as th
-from singer_sdk._singerlib import CatalogEntry, MetadataMapping, Schema
+from singer_sdk._singerlib import (
+    CatalogEntry,
+    MetadataMapping,
+    RecordMessage,
+    Schema,
+)
+from singer_sdk.batch import lazy_chunked_generator
 from singer_sdk.helpers._typing import TypeConformanceLevel
+from singer_sdk.helpers._util import utc_now
 from sqlalchemy import text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine.reflection import ObjectKind
+
+from tap_mysql.arrow import ArrowBatchBuilder
+from tap_mysql.batch import BatchFileWriter
+from tap_mysql.binlog import (
+    BinlogDecoder,
+    binlog_position,
+    derive_server_id,
+    iter_changes,
+    read_events,
+)
+from tap_mysql.compression import compression_connect_args
+from tap_mysql.conform import RecordConformer
+from tap_mysql.converters import DRIVER_MODULES, DecodedBit, driver_conversions
+from tap_mysql.discovery import (
+    DiscoveryCache,
+    leading_index_columns,
+    reflect_tables,
+    schema_columns,
+    table_estimates,
+    table_fingerprints,
+)
+from tap_mysql.instrumentation import (
+    CONFORM,
+    DEFAULT_PROFILE_INTERVAL,
+    SERIALIZE,
+    WRITE,
+    SamplingProfiler,
+    bytes_sent,
+)
+from tap_mysql.lobs import (
+    CHUNK_SIZE,
+    FILE,
+    INLINE,
+    LobStore,
+    as_utf8,
+    column_policy,
+    is_json_schema,
+    is_lob,
+    select_column,
+)
+from tap_mysql.local_cache import ProbeCache
+from tap_mysql.partitions import (
+    PartitionReader,
+    histogram_bounds,
+    linear_bounds,
+    to_bound,
+)
+from tap_mysql.planner import (
+    BINLOG,
+    KEYSET_CHUNKS,
+    PARALLEL_RANGES,
+    SINGLE_SCAN,
+    explain,
+    recommend_strategy,
+    summarize_plan,
+)
+from tap_mysql.progress import ReadProgress
+from tap_mysql.sql_types import parse_column_type, sdk_type_for_name
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
-
-    from sqlalchemy.engine import Engine
+    from collections.abc import (
+        Callable,
+        Collection,
+        Generator,
+        Iterable,
+        Iterator,
+        Mapping,
+        Sequence,
+    )
+
+    import pyarrow as pa
+    from singer_sdk.helpers._batch import BaseBatchFileEncoding, BatchConfig
+    from sqlalchemy.engine import Connection, Engine
     from sqlalchemy.engine.reflection import Inspector, ReflectedPrimaryKeyConstraint
 
+    from tap_mysql.instrumentation import StageMetrics
+    from tap_mysql.snapshot import ConsistentSnapshot
+    from tap_mysql.tap import TapMySQL
 
-unpatched_conform = (
-    singer_sdk.helpers._typing._conform_primitive_property  # noqa: SLF001
-)
+
+DEFAULT_FETCH_SIZE = 10000
+DEFAULT_PARTITION_WORKERS = 4
+DEFAULT_LOB_LENGTH = 65535
+
+
+def record_batches(
+    result: sqlalchemy.CursorResult,
+    batch_size: int,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield the rows of a result as lists of up to `batch_size` dicts.
+
+    Rows are read as plain tuples and zipped with the column names, which are
+    looked up once per query rather than once per row as `result.mappings()`
+    does. Result processors (type decorators, JSON) still apply.
+
+    Args:
+        result: The result of executing a select.
+        batch_size: Maximum number of rows per `fetchmany` call and batch.
+
+    Yields:
+        One list of dicts per fetched batch.
+    """
+    keys = tuple(result.keys())
+    for rows in result.partitions(batch_size):
+        yield [dict(zip(keys, row)) for row in rows]
 
 
-def patched_conform(
-    elem: Any,  # noqa: ANN401
-    property_schema: dict,
-) -> Any:  # noqa: ANN401
-    """Override type conformance to prevent dates turning into datetimes.
+def rows_after(
+    columns: Sequence[sqlalchemy.ColumnElement],
+    values: Sequence[Any],
+) -> sqlalchemy.ColumnElement[bool]:
+    """Return the condition that `(columns...) > (values...)`, in sort order.
 
-    Converts a primitive to a json compatible type.
+    Spelled out as `c1 > v1 OR (c1 = v1 AND (c2 > v2 OR ...))`, which MySQL's
+    range optimizer turns into index ranges, unlike a row comparison.
+
+    Args:
+        columns: The sort columns.
+        values: A value for each of them.
+
+    Returns:
+        The condition.
+    """
+    column, value = columns[-1], values[-1]
+    condition = column > value
+    for column, value in zip(reversed(columns[:-1]), reversed(values[:-1])):
+        condition = sqlalchemy.or_(
+            column > value,
+            sqlalchemy.and_(column == value, condition),
+        )
+    return condition
+
+
+def key_to_state(value: Any) -> Any:  # noqa: ANN401
+    """Return a key value as it is saved in state.
+
+    State is written as JSON, so values JSON has no type for are saved in a
+    form `key_from_state` reads back exactly: bytes as hex, dates and
+    datetimes in ISO 8601, decimals as strings and TIME values as seconds.
+
+    Args:
+        value: A key value read from the database.
+
+    Returns:
+        A JSON compatible value.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    return value
+
+
+# How `key_from_state` reads back key values saved by `key_to_state`, by the
+# Python type of their column: the JSON types saved, and their conversion.
+# MySQL TIME values are read as timedeltas.
+KEY_STATE_READERS: dict[type, tuple[tuple[type, ...], Callable[[Any], Any]]] = {
+    bytes: ((str,), bytes.fromhex),
+    datetime.datetime: ((str,), datetime.datetime.fromisoformat),
+    datetime.date: ((str,), datetime.date.fromisoformat),
+    decimal.Decimal: ((str, int, float), lambda value: decimal.Decimal(str(value))),
+    datetime.time: ((int, float), lambda value: datetime.timedelta(seconds=value)),
+}
+
+
+def key_from_state(value: Any, sql_type: sqlalchemy.types.TypeEngine) -> Any:  # noqa: ANN401
+    """Return a key value saved by `key_to_state`, as the database returned it.
+
+    Args:
+        value: The value from state.
+        sql_type: The type of the key's column.
 
     Returns:
-        The appropriate json compatible type.
+        The value to compare the column with.
     """
-    if isinstance(elem, datetime.date):
-        return elem.isoformat()
-    return unpatched_conform(elem=elem, property_schema=property_schema)
+    try:
+        saved_types, read = KEY_STATE_READERS[sql_type.python_type]
+    except (KeyError, NotImplementedError):
+        return value
+    return read(value) if isinstance(value, saved_types) else value
 
 
-singer_sdk.helpers._typing._conform_primitive_property = patched_conform  # noqa: SLF001
+def _is_decimal_type(sql_type: Any) -> bool:  # noqa: ANN401
+    if isinstance(sql_type, str):
+        return sql_type.split("(")[0].strip().lower() in {"decimal", "numeric"}
+    return isinstance(sql_type, sqlalchemy.types.Numeric) and not isinstance(
+        sql_type,
+        sqlalchemy.types.Float,
+    )
 
 
 class MySQLConnector(SQLConnector):
@@ -61,9 +236,48 @@ class MySQLConnector(SQLConnector):
         """
         super().__init__(*args, **kwargs)
         self.is_vitess = self.config.get("is_vitess")
+        # Set by the tap while a `consistent_snapshot` sync runs.
+        self.snapshot: ConsistentSnapshot | None = None
         self._table_cols_cache: dict[str, dict[str, sqlalchemy.Column]] = {}
+        # Vitess column lists by schema then table, see `_vitess_table_columns`.
+        self._vitess_columns: dict[str, dict[str, list[dict]]] = {}
 
         if self.is_vitess is None:
+            self.is_vitess = self._detect_vitess()
+
+    def _server_key(self) -> str:
+        """Return the `host:port` of the server, as configured.
+
+        Unlike `sqlalchemy_url`, stays the same when connecting through an SSH
+        tunnel, on a different local port each run.
+        """
+        if sqlalchemy_url := self.config.get("sqlalchemy_url"):
+            url = sqlalchemy.engine.make_url(sqlalchemy_url)
+            return f"{url.host}:{url.port or 3306}"
+        return f"{self.config.get('host')}:{self.config.get('port', 3306)}"
+
+    def _detect_vitess(self) -> bool:
+        """Check whether the server is a Vitess (PlanetScale) instance.
+
+        With `vitess_detection_cache_path` set, the answer is cached per server
+        for `vitess_detection_cache_ttl` seconds, rather than asking the
+        server on every run.
+
+        Returns:
+            True if the server is a Vitess instance.
+        """
+        cache = None
+        key = f"is_vitess:{self._server_key()}"
+        if cache_path := self.config.get("vitess_detection_cache_path"):
+            cache = ProbeCache(
+                cache_path,
+                ttl=self.config.get("vitess_detection_cache_ttl", 86400),
+            )
+            is_vitess = cache.get(key)
+        else:
+            is_vitess = None
+
+        if is_vitess is None:
             self.logger.info(
                 "No is_vitess configuration provided, dynamically checking if "
                 "we are using a Vitess instance."
@@ -77,19 +291,67 @@ class MySQLConnector(SQLConnector):
                 )
                 output = conn.execute(query)
                 rows = output.fetchall()
-                if len(rows) > 0:
-                    self.logger.info(
-                        "Instance has been detected to be a "
-                        "Vitess (PlanetScale) instance, using Vitess "
-                        "configuration."
-                    )
-                    self.is_vitess = True
+                is_vitess = len(rows) > 0
+            if cache is not None:
+                cache.set(key, is_vitess)
+
+        if is_vitess:
+            self.logger.info(
+                "Instance has been detected to be a "
+                "Vitess (PlanetScale) instance, using Vitess "
+                "configuration."
+            )
+        else:
             self.logger.info(
                 "Instance is not a Vitess instance, using standard configuration."
             )
+        return bool(is_vitess)
+
+    def create_engine(self) -> Engine:
+        """Create the engine, with a pool large enough for concurrent reads.
+
+        Each of the `max_concurrent_streams` streams synced at once may read
+        up to `partition_workers` partitions at once. Connections decode zero
+        dates, BIT and DECIMAL values with `driver_conversions`, and compress
+        the protocol if `compression` is set.
+
+        Returns:
+            A new SQLAlchemy Engine.
+        """
+        streams = max(1, int(self.config.get("max_concurrent_streams") or 1))
+        workers = max(1, int(self.config.get("partition_workers") or 1))
+        pool_size = max(5, streams * workers)
+        url = sqlalchemy.engine.make_url(self.sqlalchemy_url)
+        conv = driver_conversions(
+            url.get_driver_name(),
+            decimal_as=self.config.get("decimal_as", "decimal"),
+        )
+        connect_args = compression_connect_args(
+            url.get_driver_name(),
+            self.config.get("compression"),
+            self.config.get("zstd_compression_level"),
+            url.query.get("read_default_file"),  # type: ignore[arg-type]
+        )
+        if conv is not None:
+            connect_args["conv"] = conv
+        return sqlalchemy.create_engine(
+            url,
+            echo=False,
+            pool_pre_ping=True,
+            pool_size=pool_size,
+            json_serializer=self.serialize_json,
+            json_deserializer=self.deserialize_json,
+            connect_args=connect_args,
+        )
+
+    @property
+    def decodes_bit(self) -> bool:
+        """Whether connections read BIT values as ints, see `driver_conversions`."""
+        url = sqlalchemy.engine.make_url(self.sqlalchemy_url)
+        return url.get_driver_name() in DRIVER_MODULES
 
-    @staticmethod
     def to_jsonschema_type(
+        self,
         sql_type: str  # noqa: ANN401
         | sqlalchemy.types.TypeEngine
         | type[sqlalchemy.types.TypeEngine]
@@ -123,6 +385,9 @@ class MySQLConnector(SQLConnector):
         if type_name is not None and type_name in ("JSONB", "JSON"):
             return th.ObjectType().type_dict
 
+        if self.config.get("decimal_as") == "string" and _is_decimal_type(sql_type):
+            return th.StringType().type_dict
+
         # if (
         #     type_name is not None
         #     and isinstance(sql_type, sqlalchemy.dialects.mysql)
@@ -156,33 +421,6 @@ class MySQLConnector(SQLConnector):
             A compatible JSON Schema type definition.
 
         """
-        sqltype_lookup: dict[
-            str,
-            th.DateTimeType
-            | th.NumberType
-            | th.IntegerType
-            | th.DateType
-            | th.StringType
-            | th.BooleanType,
-        ] = {
-            # NOTE: This is an ordered mapping, with earlier mappings taking
-            # precedence. If the SQL-provided type contains the type name on
-            #  the left, the mapping will return the respective singer type.
-            "timestamp": th.DateTimeType(),
-            "datetime": th.DateTimeType(),
-            "date": th.DateType(),
-            "int": th.IntegerType(),
-            "numeric": th.NumberType(),
-            "decimal": th.NumberType(),
-            "double": th.NumberType(),
-            "float": th.NumberType(),
-            "string": th.StringType(),
-            "text": th.StringType(),
-            "char": th.StringType(),
-            "bool": th.BooleanType(),
-            "variant": th.StringType(),
-            "bit": th.IntegerType(),
-        }
         if isinstance(from_type, str):
             type_name = from_type
         elif isinstance(from_type, sqlalchemy.types.TypeEngine):
@@ -199,11 +437,7 @@ class MySQLConnector(SQLConnector):
             )
 
         # Look for the type name within the known SQL type names:
-        for sqltype, jsonschema_type in sqltype_lookup.items():
-            if sqltype.lower() in type_name.lower():
-                return jsonschema_type
-
-        return sqltype_lookup["string"]  # safe failover to str
+        return sdk_type_for_name(type_name)
 
     def get_schema_names(self, engine: Engine, inspected: Inspector) -> list[str]:
         """Return a list of schema names in DB, or overrides with user-provided values.
@@ -219,6 +453,292 @@ class MySQLConnector(SQLConnector):
             return self.config["filter_schemas"]
         return super().get_schema_names(engine, inspected)
 
+    def discover_catalog_entries(
+        self,
+        *,
+        exclude_schemas: Sequence[str] = (),
+        reflect_indices: bool = True,
+    ) -> list[dict]:
+        """Return a list of catalog entries from discovery.
+
+        Tables are reflected in bulk from information_schema, see
+        `reflect_tables`, except on Vitess. With `discovery_cache_path` set,
+        only tables whose definition changed since the last discovery are
+        reflected, see `DiscoveryCache`.
+
+        Each entry's `row_count` is the table's estimated row count, see
+        `get_table_estimates`. It changes with the data, so is not cached.
+        Nor are the types of JSON columns with a LOB policy other than
+        `inline`, which are strings.
+
+        Args:
+            exclude_schemas: A list of schema names to exclude from discovery.
+            reflect_indices: Whether to reflect indices to detect potential primary
+                keys.
+
+        Returns:
+            The discovered catalog entries as a list.
+        """
+        entries = self._discover_catalog_entries(
+            exclude_schemas=exclude_schemas,
+            reflect_indices=reflect_indices,
+        )
+        schema_names = {
+            schema_name
+            for entry in entries
+            if (schema_name := self._entry_schema_name(entry)) is not None
+        }
+        estimates = self.get_table_estimates(sorted(schema_names))
+        for entry in entries:
+            key = (self._entry_schema_name(entry), entry["table_name"])
+            if key in estimates:
+                entry["row_count"], _ = estimates[key]
+            for name, schema in entry["schema"].get("properties", {}).items():
+                if (
+                    is_json_schema(schema)
+                    and column_policy(self.config, entry["tap_stream_id"], name)
+                    != INLINE
+                ):
+                    # Truncated, hashed or stored JSON values are strings.
+                    schema.clear()
+                    schema["type"] = ["string", "null"]
+        return entries
+
+    @staticmethod
+    def _entry_schema_name(entry: dict) -> str | None:
+        return next(
+            (
+                metadata["metadata"].get("schema-name")
+                for metadata in entry.get("metadata", [])
+                if not metadata["breadcrumb"]
+            ),
+            None,
+        )
+
+    def _discover_catalog_entries(
+        self,
+        *,
+        exclude_schemas: Sequence[str],
+        reflect_indices: bool,
+    ) -> list[dict]:
+        cache_path = self.config.get("discovery_cache_path")
+        if self.is_vitess and not cache_path:
+            return super().discover_catalog_entries(
+                exclude_schemas=exclude_schemas,
+                reflect_indices=reflect_indices,
+            )
+
+        engine = self._engine
+        inspected = sqlalchemy.inspect(engine)
+        schema_names = [
+            schema_name
+            for schema_name in self.get_schema_names(engine, inspected)
+            if schema_name not in exclude_schemas
+        ]
+        if not cache_path:
+            return list(
+                self._reflect_catalog_entries(
+                    engine,
+                    inspected,
+                    schema_names,
+                    reflect_indices=reflect_indices,
+                ).values()
+            )
+
+        cache = DiscoveryCache(
+            cache_path,
+            {
+                "decimal_as": self.config.get("decimal_as", "decimal"),
+                "is_vitess": self.is_vitess,
+                "reflect_indices": reflect_indices,
+            },
+        )
+        with self._connect() as conn:
+            fingerprints = table_fingerprints(
+                conn,
+                schema_names,
+                per_schema=bool(self.is_vitess),
+            )
+        cached = {
+            key: entry
+            for key, fingerprint in fingerprints.items()
+            if (entry := cache.get(*key, fingerprint)) is not None
+        }
+        changed = [key for key in fingerprints if key not in cached]
+        reflected = (
+            self._reflect_catalog_entries(
+                engine,
+                inspected,
+                schema_names,
+                # Whole schemas rather than a long list of tables on first runs.
+                changed if len(changed) < len(fingerprints) else None,
+                reflect_indices=reflect_indices,
+            )
+            if changed
+            else {}
+        )
+
+        result: list[dict] = []
+        for key, fingerprint in fingerprints.items():
+            entry = cached.get(key) or reflected.get(key)
+            if entry is None:
+                continue  # Dropped since it was fingerprinted.
+            cache.put(*key, fingerprint, entry)
+            result.append(entry)
+        cache.save()
+        self.logger.info(
+            "Discovered %d tables and views, %d reused from the discovery cache.",
+            len(result),
+            len(cached),
+        )
+        return result
+
+    def get_table_estimates(
+        self,
+        schema_names: Collection[str],
+        table_names: Collection[tuple[str, str]] | None = None,
+    ) -> dict[tuple[str, str], tuple[int | None, int | None]]:
+        """Return the estimated size of tables, from information_schema.
+
+        See `table_estimates`. A server that will not tell gets a warning
+        rather than an error, the tap works without estimates.
+
+        Args:
+            schema_names: Schemas of the tables.
+            table_names: If set, only these `(schema_name, table_name)`.
+
+        Returns:
+            The estimated row count and data length in bytes, by
+            `(schema_name, table_name)`.
+        """
+        try:
+            with self._connect() as conn:
+                if not self.is_vitess:
+                    return table_estimates(conn, schema_names, table_names)
+                # One keyspace per query, as Vitess routes them.
+                estimates = {}
+                for schema_name in schema_names:
+                    estimates.update(table_estimates(conn, [schema_name]))
+        except sqlalchemy.exc.DBAPIError as e:
+            self.logger.warning("Could not estimate the size of tables: %s", e)
+            return {}
+        if table_names is None:
+            return estimates
+        return {key: estimates[key] for key in table_names if key in estimates}
+
+    def _reflect_catalog_entries(
+        self,
+        engine: Engine,
+        inspected: Inspector,
+        schema_names: list[str],
+        table_names: Collection[tuple[str, str]] | None = None,
+        *,
+        reflect_indices: bool,
+    ) -> dict[tuple[str, str], dict]:
+        """Reflect tables and views, and build their catalog entries.
+
+        Args:
+            engine: SQLAlchemy engine
+            inspected: SQLAlchemy inspector instance for engine
+            schema_names: Schemas to reflect.
+            table_names: If set, only reflect these `(schema_name, table_name)`.
+            reflect_indices: Whether to reflect indices to detect potential primary
+                keys.
+
+        Returns:
+            Catalog entries by `(schema_name, table_name)`.
+        """
+        if self.is_vitess:
+            return self._inspect_catalog_entries(
+                engine,
+                inspected,
+                schema_names,
+                table_names,
+                reflect_indices=reflect_indices,
+            )
+        with self._connect() as conn:
+            tables = reflect_tables(
+                conn,
+                schema_names,
+                table_names,
+                reflect_indices=reflect_indices,
+            )
+        return {
+            (schema_name, table_name): self.discover_catalog_entry(
+                engine,
+                inspected,
+                schema_name,
+                table_name,
+                table.is_view,
+                reflected_columns=table.columns,  # type: ignore[arg-type]
+                reflected_pk=table.primary_key,  # type: ignore[arg-type]
+                reflected_indices=table.indexes,  # type: ignore[arg-type]
+            ).to_dict()
+            for (schema_name, table_name), table in tables.items()
+        }
+
+    def _inspect_catalog_entries(
+        self,
+        engine: Engine,
+        inspected: Inspector,
+        schema_names: list[str],
+        table_names: Collection[tuple[str, str]] | None,
+        *,
+        reflect_indices: bool,
+    ) -> dict[tuple[str, str], dict]:
+        """Reflect tables and views with the inspector, a schema at a time.
+
+        Returns:
+            Catalog entries by `(schema_name, table_name)`.
+        """
+        entries: dict[tuple[str, str], dict] = {}
+        for schema_name in schema_names:
+            filter_names = (
+                None
+                if table_names is None
+                else [table for schema, table in table_names if schema == schema_name]
+            )
+            if filter_names == []:
+                continue
+            primary_keys = inspected.get_multi_pk_constraint(
+                schema=schema_name,
+                filter_names=filter_names,
+            )
+            indices = (
+                inspected.get_multi_indexes(
+                    schema=schema_name,
+                    filter_names=filter_names,
+                )
+                if reflect_indices
+                else {}
+            )
+            for kind, is_view in (
+                (ObjectKind.TABLE, False),
+                (ObjectKind.ANY_VIEW, True),
+            ):
+                columns = inspected.get_multi_columns(
+                    schema=schema_name,
+                    kind=kind,
+                    filter_names=filter_names,
+                )
+                entries.update(
+                    (
+                        (schema_name, table),
+                        self.discover_catalog_entry(
+                            engine,
+                            inspected,
+                            schema_name,
+                            table,
+                            is_view,
+                            reflected_columns=columns[schema, table],
+                            reflected_pk=primary_keys.get((schema, table)),
+                            reflected_indices=indices.get((schema, table), []),
+                        ).to_dict(),
+                    )
+                    for schema, table in columns
+                )
+        return entries
+
     def discover_catalog_entry(  # noqa: PLR0913
         self,
         engine: Engine,
@@ -270,22 +790,17 @@ class MySQLConnector(SQLConnector):
 
         # Initialize columns list
         table_schema = th.PropertiesList()
-        with self._connect() as conn:
-            result = conn.execute(
-                text(f"SHOW columns from `{schema_name}`.`{table_name}`")
+        for column in self._vitess_table_columns(schema_name, table_name):
+            column_name = column["Field"]
+            is_nullable = column["Null"] == "YES"
+            jsonschema_type: dict = self.to_jsonschema_type(column["Type"])
+            table_schema.append(
+                th.Property(
+                    name=column_name,
+                    wrapped=th.CustomType(jsonschema_type),
+                    required=not is_nullable,
+                ),
             )
-            columns = result.mappings()
-            for column in columns:
-                column_name = column["Field"]
-                is_nullable = column["Null"] == "YES"
-                jsonschema_type: dict = self.to_jsonschema_type(column["Type"])
-                table_schema.append(
-                    th.Property(
-                        name=column_name,
-                        wrapped=th.CustomType(jsonschema_type),
-                        required=not is_nullable,
-                    ),
-                )
         schema = table_schema.to_dict()
 
         # Initialize available replication methods
@@ -319,43 +834,21 @@ class MySQLConnector(SQLConnector):
             replication_key=None,  # Must be defined by user
         )
 
-    def get_sqlalchemy_type(self, col_meta_type: str) -> sqlalchemy.Column:
+    def get_sqlalchemy_type(self, col_meta_type: str) -> sqlalchemy.types.TypeEngine:
         """Return a SQLAlchemy type object for the given SQL type.
 
-        Used ischema_names so we don't have to manually map all types.
+        Parsed as the MySQL dialect reflects column types, see
+        `parse_column_type`, so we don't have to manually map all types.
         """
-        dialect = sqlalchemy.dialects.mysql.base.dialect()  # type: ignore[attr-defined]
-        ischema_names = dialect.ischema_names
-        # Example varchar(97)
-        type_info = col_meta_type.split("(")
-        base_type_name = type_info[0].split(" ")[0]  # bigint unsigned
-        type_args = (
-            type_info[1].split(" ")[0].rstrip(")") if len(type_info) > 1 else None
-        )  # decimal(25,4) unsigned should work
-
-        if base_type_name in {"enum", "set"}:
+        base_type_name = col_meta_type.split("(", 1)[0].split(" ", 1)[0]
+        if base_type_name.lower() in {"enum", "set"}:
             self.logger.warning(
                 "Enum and Set types not supported for col_meta_type=%s. "
                 "Using varchar instead.",
                 col_meta_type,
             )
-            base_type_name = "varchar"
-            type_args = None
-
-        type_class = ischema_names.get(base_type_name.lower())
-
-        try:
-            # Create an instance of the type class with parameters if they exist
-            if type_args:
-                return type_class(
-                    *map(int, type_args.split(","))
-                )  # Want to create a varchar(97) if asked for
-            return type_class()
-        except Exception:
-            self.logger.exception(
-                "Error creating sqlalchemy type for col_meta_type=%s", col_meta_type
-            )
-            raise
+            return sqlalchemy.types.VARCHAR()
+        return parse_column_type(col_meta_type)
 
     def get_table_columns(
         self,
@@ -379,24 +872,63 @@ class MySQLConnector(SQLConnector):
         # for views so we do below
         if full_table_name not in self._table_cols_cache:
             _, schema_name, table_name = self.parse_full_table_name(full_table_name)
+            self._table_cols_cache[full_table_name] = {
+                col_meta["Field"]: sqlalchemy.Column(
+                    col_meta["Field"],
+                    self.get_sqlalchemy_type(col_meta["Type"]),
+                    nullable=col_meta["Null"] == "YES",
+                )
+                for col_meta in self._vitess_table_columns(
+                    cast("str", schema_name),
+                    table_name,
+                )
+            }
+
+        columns = self._table_cols_cache[full_table_name]
+        if not column_names:
+            return columns
+        selected = {col.casefold() for col in column_names}
+        return {
+            name: column
+            for name, column in columns.items()
+            if name.casefold() in selected
+        }
+
+    def _vitess_table_columns(self, schema_name: str, table_name: str) -> list[dict]:
+        """Return the columns of a table or view, as SHOW COLUMNS lists them.
+
+        The columns of every table and view of a schema are read at once from
+        information_schema, on first use by discovery or `get_table_columns`.
+        Views not listed there are described on their own.
+
+        Args:
+            schema_name: The table's schema, or Vitess keyspace.
+            table_name: The table or view.
+
+        Returns:
+            Dicts of the column's `Field`, `Type` and `Null`.
+        """
+        if schema_name not in self._vitess_columns:
+            try:
+                with self._connect() as conn:
+                    columns = schema_columns(conn, schema_name)
+            except sqlalchemy.exc.DBAPIError:
+                self.logger.warning(
+                    "Could not read the columns of schema %s from "
+                    "information_schema, describing its tables one by one.",
+                    schema_name,
+                    exc_info=True,
+                )
+                columns = {}
+            self._vitess_columns[schema_name] = columns
+        tables = self._vitess_columns[schema_name]
+        if table_name not in tables:
             with self._connect() as conn:
                 result = conn.execute(
                     text(f"SHOW columns from `{schema_name}`.`{table_name}`")
                 )
-                columns = result.mappings()
-                self._table_cols_cache[full_table_name] = {
-                    col_meta["Field"]: sqlalchemy.Column(
-                        col_meta["Field"],
-                        self.get_sqlalchemy_type(col_meta["Type"]),
-                        nullable=col_meta["Null"] == "YES",
-                    )
-                    for col_meta in columns
-                    if not column_names
-                    or col_meta["Field"].casefold()
-                    in {col.casefold() for col in column_names}
-                }
-
-        return self._table_cols_cache[full_table_name]
+                tables[table_name] = [dict(col_meta) for col_meta in result.mappings()]
+        return tables[table_name]
 
 
 class MySQLStream(SQLStream):
@@ -407,84 +939,1555 @@ class MySQLStream(SQLStream):
     # JSONB Objects won't be selected without type_confomance_level to ROOT_ONLY
     TYPE_CONFORMANCE_LEVEL = TypeConformanceLevel.ROOT_ONLY
 
-    def get_records(self, context: dict | None) -> Iterable[dict[str, Any]]:
-        """Return a generator of row-type dictionary objects.
+    _partition_plan: list[dict] | None = None
+    _partition_reader: PartitionReader | None = None
+    _record_conformer: RecordConformer | None = None
+    # Primary key columns saved in state with each replication key value,
+    # while an INCREMENTAL stream is read in pages.
+    _replication_key_pk: list[str] | None = None
+    _read_progress: ReadProgress | None = None
+    _lob_store: LobStore | None = None
+    _stage_metrics: StageMetrics | None = None
+    _profiler: SamplingProfiler | None = None
+    # State updates held until the next BATCH message, see `_checkpoint`.
+    _pending_checkpoints: list[Callable[[], None]] | None = None
+
+    # Rows in the stream's table, as MySQL estimates them, set by the tap.
+    row_count_estimate: int | None = None
 
-        If the stream has a replication_key value defined, records will be sorted by the
-        incremental key. If the stream also has an available starting bookmark, the
-        records will be filtered for values greater than or equal to the bookmark value.
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the stream.
 
         Args:
-            context: If partition context is provided, will read specifically from this
-                data slice.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+        """
+        super().__init__(*args, **kwargs)
+        if self.partition_key is not None:
+            # Partition progress is tracked in the stream's own bookmark.
+            self.state_partitioning_keys = []
 
-        Yields:
-            One dict per record.
+    def get_stream_option(self, key: str, default: Any = None) -> Any:  # noqa: ANN401
+        """Return a setting for this stream.
 
-        Raises:
-            NotImplementedError: If partition is passed in context and the stream does
-                not support partitioning.
+        Values in `stream_options.<tap_stream_id>` take precedence over the
+        top level tap setting of the same name.
+
+        Args:
+            key: The setting name.
+            default: Value returned if the setting is not set anywhere.
 
+        Returns:
+            The per-stream value, else the tap-wide value, else `default`.
         """
-        if context:
-            msg = f"Stream '{self.name}' does not support partitioning."
-            raise NotImplementedError(msg)
+        stream_options = self.config.get("stream_options") or {}
+        overrides = stream_options.get(self.tap_stream_id) or {}
+        if overrides.get(key) is not None:
+            return overrides[key]
+        if self.config.get(key) is not None:
+            return self.config[key]
+        return default
+
+    def _rows_to_read(self) -> int | None:
+        """Return the rows this sync should read, if the whole table is read."""
+        if self.replication_method == "INCREMENTAL":
+            whole_table = self.stream_state.get("replication_key_value") is None
+        elif self.replication_method == "LOG_BASED":
+            whole_table = "log_file" not in self.stream_state
+        else:
+            whole_table = True
+        return self.row_count_estimate if whole_table else None
 
-        # pulling rows with only selected columns from stream
-        selected_column_names = list(self.get_selected_schema()["properties"])
-        table = self.connector.get_table(
-            self.fully_qualified_name,
-            column_names=selected_column_names,
+    @contextmanager
+    def _syncing(self) -> Iterator[None]:
+        """Log the rows read, rows/s and time left, while the stream syncs.
+
+        The time left is against `row_count_estimate`, when the whole table
+        is read: a FULL_TABLE sync, or the first INCREMENTAL or LOG_BASED one.
+
+        A partitioned stream plans the ranges it reads, see
+        `_plan_sync_partitions`.
+
+        During a consistent snapshot, the binlog position of the snapshot,
+        which the rows read are as of, is saved in the stream's state as
+        `snapshot_position`.
+
+        Side files of large objects, see `_offload_lobs`, are written to a
+        `LobStore` open while the stream syncs.
+
+        With `stage_metrics`, the time spent in each stage of the sync is
+        logged, see `StageMetrics`. The stream named by `profile_stream` is
+        profiled, see `_stop_profiler`.
+
+        It is entered once per sync: `_sync_batches` wraps the
+        `_sync_records` the SDK's `get_batches` reads from.
+        """
+        if self._read_progress is not None:
+            yield
+            return
+        snapshot = self.connector.snapshot  # type: ignore[attr-defined]
+        if snapshot is not None and snapshot.position is not None:
+            with self._state_lock:
+                self.stream_state["snapshot_position"] = dict(snapshot.position)
+        if (key := self.partition_key) is not None and self._partition_plan is None:
+            self._plan_sync_partitions(key)
+        if self._lob_files:
+            self._lob_store = LobStore(
+                self.config["lob_storage_root"],
+                self.tap_stream_id,
+            )
+        self._read_progress = ReadProgress(
+            self.logger,
+            self.name,
+            self._rows_to_read(),
+        )
+        sync_metrics = getattr(self._tap, "sync_metrics", None)
+        if sync_metrics is not None:
+            self._stage_metrics = sync_metrics.stream(self.name)
+        if self.config.get("profile_stream") == self.tap_stream_id:
+            self._profiler = SamplingProfiler(
+                float(self.config.get("profile_interval") or 0)
+                or DEFAULT_PROFILE_INTERVAL
+            )
+            self._profiler.start()
+        try:
+            with self._profiler.track() if self._profiler else nullcontext():
+                yield
+        finally:
+            progress, self._read_progress = self._read_progress, None
+            store, self._lob_store = self._lob_store, None
+            if store is not None:
+                store.close()
+            stage_metrics, self._stage_metrics = self._stage_metrics, None
+            if stage_metrics is not None:
+                stage_metrics.report()
+            self._stop_profiler()
+        progress.finish()
+
+    def _stop_profiler(self) -> None:
+        """Write the profile of the stream's sync, if it was profiled.
+
+        It goes to `profile_path`, by default `<tap_stream_id>.folded` in the
+        working directory, in the folded stacks format that flamegraph.pl and
+        speedscope read.
+        """
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return
+        profiler.stop()
+        path = self.config.get("profile_path") or f"{self.tap_stream_id}.folded"
+        samples = profiler.write(path)
+        self.logger.info(
+            "Wrote %d profile samples of '%s' to %s.",
+            samples,
+            self.name,
+            path,
         )
 
-        # Apply TypeDecorators to Date and  DateTime columns
-        for column in table.columns:
-            if isinstance(column.type, DateTime):
-                column.type = ZeroDateTimeToNull()
-            elif isinstance(column.type, Date):
-                column.type = ZeroDateToNull()
+    def _sync_records(
+        self,
+        context: Mapping[str, Any] | None = None,
+        *,
+        write_messages: bool = True,
+    ) -> Generator[dict, Any, Any]:
+        with self._syncing():
+            yield from super()._sync_records(context, write_messages=write_messages)
 
+    def _sync_batches(
+        self,
+        batch_config: BatchConfig,
+        context: Mapping[str, Any] | None = None,
+    ) -> None:
+        with self._syncing():
+            self._pending_checkpoints = []
+            try:
+                super()._sync_batches(batch_config, context)
+                # Every batch has been written.
+                self._apply_checkpoints()
+            finally:
+                self._pending_checkpoints = None
+            self._write_state_message()
+
+    def _write_batch_message(
+        self,
+        encoding: BaseBatchFileEncoding,
+        manifest: list[str],
+    ) -> None:
+        """Write out a BATCH message, then the checkpoints its records allow.
 
-        query = table.select()
-        if self.replication_key:
-            replication_key_col = table.columns[self.replication_key]
-            query = query.order_by(replication_key_col)
+        Args:
+            encoding: The encoding of the batch files.
+            manifest: The batch files.
+        """
+        super()._write_batch_message(encoding=encoding, manifest=manifest)
+        self._apply_checkpoints()
 
-            start_val = self.get_starting_replication_key_value(context)
-            if start_val:
-                query = query.filter(replication_key_col >= start_val)
+    def _checkpoint(self, update: Callable[[], None]) -> None:
+        """Update the stream's state past the records yielded, and write it out.
 
-        with self.connector._connect() as conn:  # noqa: SLF001
-            if self.connector.is_vitess:  # type: ignore[attr-defined]
-                conn.exec_driver_sql(
-                    "set workload=olap"
-                )  # See https://github.com/planetscale/discussion/discussions/190
-            result = conn.execute(query)
-            for row in result.mappings():
-                yield dict(row)
+        Records fed to the SDK's `Batcher` are only written out with the
+        BATCH message of their file. While batching, the update is held until
+        the next BATCH message, which carries every record yielded before it,
+        so STATE never gets ahead of the records targets have received.
+
+        Args:
+            update: Changes the stream's state, called holding `_state_lock`.
+        """
+        if self._pending_checkpoints is not None:
+            self._pending_checkpoints.append(update)
+            return
+        with self._state_lock:
+            update()
+            self._write_state_message()
+
+    def _apply_checkpoints(self) -> None:
+        """Apply the state updates held by `_checkpoint`, oldest first."""
+        if not self._pending_checkpoints:
+            return
+        updates = list(self._pending_checkpoints)
+        self._pending_checkpoints.clear()
+        with self._state_lock:
+            for update in updates:
+                update()
+
+    def _count_read(self, rows: int) -> None:
+        if self._read_progress is not None:
+            self._read_progress.add(rows)
+
+    def _warn_unmapped_properties(self, property_names: tuple[str, ...]) -> None:
+        self.logger.warning(
+            "Properties %s were present in the '%s' stream but "
+            "not found in catalog schema. Ignoring.",
+            property_names,
+            self.name,
+        )
 
-class ZeroDateTimeToNull(TypeDecorator):
-    impl = DateTime
-    cache_ok = True
+    def _generate_record_messages(
+        self,
+        record: dict[str, Any],
+    ) -> Generator[RecordMessage, None, None]:
+        """Write out a RECORD message.
 
-    def process_bind_param(self, value, dialect):
-        return value  # normal binding for insert/update
+        Records are conformed to the selected schema by a `RecordConformer`
+        compiled on first use, in place of the SDK's per-value conformance.
 
-    def process_result_value(self, value, dialect):
-        if value is not None and str(value) == '0000-00-00 00:00:00':
-            return None
+        Args:
+            record: A single stream record.
+
+        Yields:
+            Record message objects.
+        """
+        if self._record_conformer is None:
+            self._record_conformer = RecordConformer(
+                self.schema,
+                self.mask,
+                self._warn_unmapped_properties,
+            )
+        if (stage_metrics := self._stage_metrics) is not None:
+            started = time.perf_counter()
+            record = self._record_conformer(record)
+            stage_metrics.add(CONFORM, time.perf_counter() - started)
         else:
-            return value
+            record = self._record_conformer(record)
+        for stream_map in self.stream_maps:
+            mapped_record = stream_map.transform(record)
+            # Emit record if not filtered
+            if mapped_record is not None:
+                yield RecordMessage(
+                    stream=stream_map.stream_alias,
+                    record=mapped_record,
+                    version=None,
+                    time_extracted=utc_now(),
+                )
 
-class ZeroDateToNull(TypeDecorator):
-    impl = Date
-    cache_ok = True
+    def _write_record_message(self, record: dict) -> None:
+        """Write out a record's RECORD messages.
 
-    def process_bind_param(self, value, dialect):
-        return value  # normal binding for insert/update
+        With `stage_metrics`, encoding the messages and writing them out are
+        timed apart.
 
-    def process_result_value(self, value, dialect):
-        if value is not None and str(value) == '0000-00-00':
-            return None
-        else:
-            return value
+        Args:
+            record: A single stream record.
+        """
+        stage_metrics = self._stage_metrics
+        if stage_metrics is None:
+            super()._write_record_message(record)
+            return
+        tap = cast("TapMySQL", self._tap)
+        for record_message in self._generate_record_messages(record):
+            started = time.perf_counter()
+            line = tap.encode_message(record_message)
+            formatted = time.perf_counter()
+            tap.write_line(line)
+            stage_metrics.add(SERIALIZE, formatted - started)
+            stage_metrics.add(WRITE, time.perf_counter() - formatted)
+        self._is_state_flushed = False
+
+    @property
+    def _state_lock(self) -> AbstractContextManager:
+        """The tap's lock around output and state, when it has one.
+
+        Streams can be synced concurrently, and every STATE message carries
+        the whole tap state, so this stream's state is only changed while
+        holding the lock that is also held to write a message.
+        """
+        return getattr(self._tap, "sync_lock", None) or nullcontext()
+
+    def _write_state_message(self) -> None:
+        """Write out a STATE message with the latest state."""
+        with self._state_lock:
+            super()._write_state_message()
+
+    def _write_starting_replication_value(
+        self,
+        context: Mapping[str, Any] | None,
+    ) -> None:
+        """Write the starting replication value, if available.
+
+        Args:
+            context: Stream partition or context dictionary.
+        """
+        with self._state_lock:
+            super()._write_starting_replication_value(context)
+
+    def _write_replication_key_signpost(
+        self,
+        context: Mapping[str, Any] | None,
+        value: datetime.datetime | str | float,
+    ) -> None:
+        """Write the signpost value, if available.
+
+        Args:
+            context: Stream partition or context dictionary.
+            value: The signpost value.
+        """
+        with self._state_lock:
+            super()._write_replication_key_signpost(context, value)
+
+    def _increment_stream_state(
+        self,
+        latest_record: dict[str, Any],
+        *,
+        context: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Update state of stream or partition with data from the provided record.
+
+        In `incremental_chunk_size` pages, records with a NULL replication key,
+        read first on a first sync, leave the state as it is.
+
+        Args:
+            latest_record: The record just written.
+            context: Stream partition or context dictionary.
+        """
+        if (
+            self._replication_key_pk is not None
+            and latest_record.get(self.replication_key) is None  # type: ignore[arg-type]
+        ):
+            return
+        with self._state_lock:
+            super()._increment_stream_state(latest_record, context=context)
+            if self._replication_key_pk is not None:
+                self.get_context_state(context)["replication_key_pk"] = {
+                    name: key_to_state(latest_record[name])
+                    for name in self._replication_key_pk
+                }
+
+    def finalize_state_progress_markers(self, state: dict | None = None) -> None:
+        """Reset progress markers and emit state message if necessary.
+
+        Args:
+            state: State object to promote progress markers with.
+        """
+        with self._state_lock:
+            super().finalize_state_progress_markers(state)
+
+    @property
+    def fetch_size(self) -> int:
+        """Number of rows read from the cursor per `fetchmany` call."""
+        return int(self.get_stream_option("fetch_size", DEFAULT_FETCH_SIZE))
+
+    @contextmanager
+    def _connect_for_extraction(self) -> Iterator[Connection]:
+        """Open a connection set up to extract rows for this stream.
+
+        With `stream_results` enabled rows are read through an unbuffered
+        server-side cursor (`SSCursor` for both pymysql and mysqlclient) in
+        `fetch_size` batches, so memory use does not grow with the size of the
+        table. Otherwise, by default, the whole result set is buffered on the
+        client before the first row is returned.
+
+        During a consistent snapshot, the connection is one of the snapshot's.
+
+        Yields:
+            A SQLAlchemy connection.
+        """
+        stream_results = self.get_stream_option("stream_results", False)  # noqa: FBT003
+        snapshot = self.connector.snapshot  # type: ignore[attr-defined]
+        connect = (
+            snapshot.connection() if snapshot is not None else self.connector._connect()  # noqa: SLF001
+        )
+        with connect as conn:
+            if self.connector.is_vitess:  # type: ignore[attr-defined]
+                conn.exec_driver_sql(
+                    "set workload=olap"
+                )  # See https://github.com/planetscale/discussion/discussions/190
+            if stream_results:
+                yield conn.execution_options(
+                    stream_results=True,
+                    yield_per=self.fetch_size,
+                )
+            else:
+                yield conn.execution_options(stream_results=False)
+
+    def get_selected_table(self) -> sqlalchemy.Table:
+        """Return the stream's table, limited to the selected columns.
+
+        BIT columns are typed `DecodedBit` when the driver reads their values
+        as ints.
+
+        Returns:
+            A SQLAlchemy table.
+        """
+        # pulling rows with only selected columns from stream
+        selected_column_names = list(self.get_selected_schema()["properties"])
+        table = self.connector.get_table(
+            self.fully_qualified_name,
+            column_names=selected_column_names,
+        )
+        if self.connector.decodes_bit:  # type: ignore[attr-defined]
+            for column in table.columns:
+                if type(column.type) is mysql.BIT:
+                    column.type = DecodedBit(column.type.length)
+        return table
+
+    def _lob_policies(self, table: sqlalchemy.Table) -> dict[str, str]:
+        """Return the policies of the table's large object columns, but `inline`.
+
+        Args:
+            table: The table returned by `get_selected_table`.
+
+        Returns:
+            Policies of `tap_mysql.lobs` by column name.
+        """
+        policies = {
+            column.name: column_policy(self.config, self.tap_stream_id, column.name)
+            for column in table.columns
+            if is_lob(column)
+        }
+        return {name: policy for name, policy in policies.items() if policy != INLINE}
+
+    def _select(self, table: sqlalchemy.Table) -> sqlalchemy.Select:
+        """Select the table's columns, with large objects under their policy.
+
+        Args:
+            table: The table returned by `get_selected_table`.
+
+        Returns:
+            The select statement, with every column labeled with its name.
+        """
+        policies = self._lob_policies(table)
+        if not policies:
+            return table.select()
+        max_length = int(self.get_stream_option("lob_max_length", DEFAULT_LOB_LENGTH))
+        return sqlalchemy.select(
+            *[
+                select_column(column, policies[column.name], max_length=max_length)
+                if column.name in policies
+                else column
+                for column in table.columns
+            ]
+        )
+
+    @cached_property
+    def _lob_files(self) -> list[str]:
+        """Large object columns written to side files, see `LobStore`.
+
+        Raises:
+            ValueError: If the stream has no primary key to read values by, or
+                `lob_storage_root` is not set.
+        """
+        table = self.get_selected_table()
+        columns = [
+            name for name, policy in self._lob_policies(table).items() if policy == FILE
+        ]
+        if columns and not self.primary_keys:
+            msg = (
+                f"Stream '{self.name}' has no primary key to read the large "
+                f"objects of {columns} by, for the `file` LOB policy."
+            )
+            raise ValueError(msg)
+        if columns and not self.config.get("lob_storage_root"):
+            msg = "The `file` LOB policy needs `lob_storage_root` set."
+            raise ValueError(msg)
+        return columns
+
+    def _open_lob_store(self) -> LobStore:
+        """Return the store of `_lob_files` values, opened by `_syncing`.
+
+        Returns:
+            The stream's `LobStore`, opened here if read outside of a sync.
+        """
+        if self._lob_store is None:
+            self._lob_store = LobStore(
+                self.config["lob_storage_root"],
+                self.tap_stream_id,
+            )
+        return self._lob_store
+
+    @contextmanager
+    def _connect_for_lobs(self) -> Iterator[Connection | None]:
+        """Open the connection `_offload_lobs` reads values on, if it needs one.
+
+        During a consistent snapshot, the connection is one of the snapshot's,
+        so values are read as of the rows they belong to.
+
+        Yields:
+            A SQLAlchemy connection, or None if no value goes to a side file.
+        """
+        if not self._lob_files:
+            yield None
+            return
+        snapshot = self.connector.snapshot  # type: ignore[attr-defined]
+        connect = (
+            snapshot.connection() if snapshot is not None else self.connector._connect()  # noqa: SLF001
+        )
+        with connect as conn:
+            yield conn
+
+    @staticmethod
+    def _read_lob_chunk(
+        conn: Connection,
+        query: sqlalchemy.Select,
+        first_chunk: bytes | str | None,
+        offset: int,
+        size: int,
+    ) -> bytes | str | None:
+        if offset == 1 and size == CHUNK_SIZE:
+            return first_chunk
+        value = query.selected_columns[0]
+        return conn.execute(
+            query.with_only_columns(sqlalchemy.func.substring(value, offset, size))
+        ).scalar()
+
+    def _offload_lobs(self, batch: list[dict[str, Any]], conn: Connection) -> None:
+        """Write the batch's `_lob_files` values to side files.
+
+        The first `lobs.CHUNK_SIZE` of the values not stored yet are read by
+        primary key in one query per column, the rest of longer values a
+        chunk at a time. Values are replaced by the side file's URL, or None
+        if their row was deleted since it was read.
+
+        Args:
+            batch: Records with the SHA-256 of their values, from `_select`.
+            conn: Connection from `_connect_for_lobs`.
+        """
+        store = self._open_lob_store()
+        table = self.get_selected_table()
+        key_cols = [table.columns[name] for name in self.primary_keys or ()]
+        for name in self._lob_files:
+            pending = []
+            for record in batch:
+                if (digest := record[name]) is None:
+                    continue
+                if (url := store.stored(name, digest)) is not None:
+                    record[name] = url
+                else:
+                    pending.append(record)
+            if not pending:
+                continue
+
+            value = as_utf8(table.columns[name])
+            keys = [tuple(record[col.name] for col in key_cols) for record in pending]
+            first_chunks = {
+                tuple(row[:-1]): row[-1]
+                for row in conn.execute(
+                    sqlalchemy.select(
+                        *key_cols,
+                        sqlalchemy.func.substring(value, 1, CHUNK_SIZE),
+                    ).where(sqlalchemy.tuple_(*key_cols).in_(keys))
+                )
+            }
+            for key, record in zip(keys, pending):
+                query = sqlalchemy.select(value).where(
+                    *[col == key_value for col, key_value in zip(key_cols, key)]
+                )
+                record[name] = store.put(
+                    name,
+                    record[name],
+                    partial(self._read_lob_chunk, conn, query, first_chunks.get(key)),
+                )
+
+    def build_query(
+        self,
+        table: sqlalchemy.Table,
+        context: dict | None,
+    ) -> sqlalchemy.Select:
+        """Build the single-scan query for this stream.
+
+        Args:
+            table: The table returned by `get_selected_table`.
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The select statement.
+        """
+        query = self._select(table)
+        if self.replication_key:
+            replication_key_col = table.columns[self.replication_key]
+            query = query.order_by(replication_key_col)
+
+            start_val = self.get_starting_replication_key_value(context)
+            if start_val:
+                query = query.filter(replication_key_col >= start_val)
+        return query
+
+    def _iter_query_records(
+        self,
+        conn: Connection,
+        query: sqlalchemy.Select,
+    ) -> Iterator[dict[str, Any]]:
+        """Execute a query and yield its rows as dicts, `fetch_size` at a time.
+
+        Args:
+            conn: Connection from `_connect_for_extraction`.
+            query: The select statement to run.
+
+        Yields:
+            One dict per row.
+        """
+        for batch in self._iter_query_batches(conn, query):
+            yield from batch
+
+    def _iter_query_batches(
+        self,
+        conn: Connection,
+        query: sqlalchemy.Select,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Execute a query and yield its rows as lists of up to `fetch_size` dicts.
+
+        Args:
+            conn: Connection from `_connect_for_extraction`.
+            query: The select statement to run.
+
+        Yields:
+            One list of dicts per fetched batch.
+        """
+        stage_metrics = self._stage_metrics
+        if stage_metrics is None:
+            batches = record_batches(conn.execute(query), self.fetch_size)
+        else:
+            sent = bytes_sent(conn)
+            executed = time.perf_counter()
+            batches = stage_metrics.timed_batches(
+                executed,
+                record_batches(conn.execute(query), self.fetch_size),
+            )
+        profiling = self._profiler.track() if self._profiler else nullcontext()
+        with profiling, self._connect_for_lobs() as lob_conn:
+            for batch in batches:
+                self._count_read(len(batch))
+                if lob_conn is not None:
+                    self._offload_lobs(batch, lob_conn)
+                yield batch
+        if (
+            stage_metrics is not None
+            and sent is not None
+            and (received := bytes_sent(conn)) is not None
+        ):
+            stage_metrics.add_bytes(received - sent)
+
+    @property
+    def full_table_chunk_size(self) -> int | None:
+        """Rows per keyset chunk for FULL_TABLE syncs, or None to disable."""
+        if self.replication_method != "FULL_TABLE" or not self.primary_keys:
+            return None
+        chunk_size = self.get_stream_option("full_table_chunk_size")
+        return int(chunk_size) if chunk_size else None
+
+    def _get_records_in_pk_chunks(
+        self,
+        table: sqlalchemy.Table,
+        chunk_size: int,
+    ) -> Iterator[dict[str, Any]]:
+        """Walk the table in primary key order, one keyset chunk at a time.
+
+        Each chunk is `WHERE (pk...) > (last...) ORDER BY pk... LIMIT n`. The
+        largest key at the start of the sync is stored as `max_pk_values` so
+        rows inserted during the sync do not keep it going, and the last key of
+        every completed chunk is stored as `last_pk_fetched`, see `_checkpoint`.
+        An interrupted sync resumes after that key. Both are removed once the
+        table is done. Key values are saved by `key_to_state`, and read back by
+        `key_from_state`.
+
+        Args:
+            table: The table returned by `get_selected_table`.
+            chunk_size: Maximum number of rows per chunk.
+
+        Yields:
+            One dict per row.
+        """
+        key_names = list(self.primary_keys or [])
+        key_cols = [table.columns[name] for name in key_names]
+        key_tuple = sqlalchemy.tuple_(*key_cols)
+        state = self.stream_state
+
+        if set(state.get("last_pk_fetched") or {}) != set(key_names):
+            with self._state_lock:
+                state.pop("last_pk_fetched", None)
+                state.pop("max_pk_values", None)
+
+        with self._connect_for_extraction() as conn:
+            if "max_pk_values" not in state:
+                max_row = conn.execute(
+                    sqlalchemy.select(*key_cols)
+                    .order_by(*[col.desc() for col in key_cols])
+                    .limit(1)
+                ).first()
+                if max_row is None:
+                    return
+                with self._state_lock:
+                    state["max_pk_values"] = {
+                        name: key_to_state(value)
+                        for name, value in zip(key_names, max_row)
+                    }
+            max_values = state["max_pk_values"]
+            upper_bound = key_tuple <= sqlalchemy.tuple_(
+                *[key_from_state(max_values[col.name], col.type) for col in key_cols]
+            )
+
+            while True:
+                query = self._select(table).where(upper_bound)
+                if last_values := state.get("last_pk_fetched"):
+                    query = query.where(
+                        key_tuple
+                        > sqlalchemy.tuple_(
+                            *[
+                                key_from_state(last_values[col.name], col.type)
+                                for col in key_cols
+                            ]
+                        )
+                    )
+                query = query.order_by(*key_cols).limit(chunk_size)
+
+                row_count = 0
+                record: dict[str, Any] = {}
+                for record in self._iter_query_records(conn, query):
+                    row_count += 1
+                    yield record
+                if row_count:
+                    self._checkpoint(
+                        partial(
+                            state.__setitem__,
+                            "last_pk_fetched",
+                            {name: key_to_state(record[name]) for name in key_names},
+                        )
+                    )
+                if row_count < chunk_size:
+                    break
+
+        def done() -> None:
+            state.pop("last_pk_fetched", None)
+            state.pop("max_pk_values", None)
+
+        self._checkpoint(done)
+
+    @property
+    def incremental_chunk_size(self) -> int | None:
+        """Rows per keyset page for INCREMENTAL syncs, or None to disable."""
+        if (
+            self.replication_method != "INCREMENTAL"
+            or not self.replication_key
+            or not self.primary_keys
+        ):
+            return None
+        chunk_size = self.get_stream_option("incremental_chunk_size")
+        return int(chunk_size) if chunk_size else None
+
+    def _iter_pages(
+        self,
+        conn: Connection,
+        query: sqlalchemy.Select,
+        order_by: list[sqlalchemy.Column],
+        chunk_size: int,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield the rows of a query in `order_by` order, one keyset page at a time.
+
+        Args:
+            conn: Connection from `_connect_for_extraction`.
+            query: The select statement, without ORDER BY or LIMIT.
+            order_by: Columns that order the rows, unique together.
+            chunk_size: Maximum number of rows per page.
+
+        Yields:
+            One dict per row.
+        """
+        page = query
+        while True:
+            row_count = 0
+            record: dict[str, Any] = {}
+            for record in self._iter_query_records(
+                conn, page.order_by(*order_by).limit(chunk_size)
+            ):
+                row_count += 1
+                yield record
+            if row_count < chunk_size:
+                return
+            page = query.where(
+                rows_after(order_by, [record[col.name] for col in order_by])
+            )
+
+    def _replication_key_pages(
+        self,
+        table: sqlalchemy.Table,
+    ) -> tuple[sqlalchemy.Select, list[sqlalchemy.Column]]:
+        """Return the query of `incremental_chunk_size` pages, and their order.
+
+        Args:
+            table: The table returned by `get_selected_table`.
+
+        Returns:
+            The select of rows with a replication key, after the state's
+            bookmark, without ORDER BY or LIMIT. And the replication key and
+            primary key columns, the order of the pages.
+        """
+        replication_key = str(self.replication_key)
+        key_names = [
+            name for name in self.primary_keys or [] if name != replication_key
+        ]
+        replication_key_col = table.columns[replication_key]
+        order_by = [replication_key_col, *[table.columns[k] for k in key_names]]
+
+        state = self.stream_state
+        start_val = self.get_starting_replication_key_value(None)
+        last_pk = state.get("replication_key_pk")
+        query = self._select(table).where(replication_key_col.is_not(None))
+        if start_val and (
+            state.get("replication_key_value") == start_val
+            and isinstance(last_pk, dict)
+            and set(last_pk) == set(key_names)
+        ):
+            last_values = [
+                key_from_state(last_pk[k], table.columns[k].type) for k in key_names
+            ]
+            query = query.where(rows_after(order_by, [start_val, *last_values]))
+        elif start_val:
+            query = query.where(replication_key_col >= start_val)
+        return query, order_by
+
+    def _get_records_in_replication_key_pages(
+        self,
+        table: sqlalchemy.Table,
+        chunk_size: int,
+    ) -> Iterator[dict[str, Any]]:
+        """Read an INCREMENTAL stream in (replication key, primary key) pages.
+
+        Each page is `WHERE (rk, pk...) > (last...) ORDER BY rk, pk... LIMIT n`,
+        with the comparison spelled out so MySQL reads it as ranges of an
+        index on the replication key, whose entries are in primary key order
+        within each key value. The primary key of every record is saved in
+        state as `replication_key_pk`, next to its `replication_key_value`, so
+        rows that share the last replication key value are not read again by
+        the next sync, nor after an interruption. Its values are saved by
+        `key_to_state`, and read back by `key_from_state`.
+
+        On a first sync, rows with a NULL replication key are read first, in
+        primary key pages. They do not move the state, see
+        `_increment_stream_state`, so an interrupted sync reads them again.
+
+        Args:
+            table: The table returned by `get_selected_table`.
+            chunk_size: Maximum number of rows per page.
+
+        Yields:
+            One dict per row.
+        """
+        query, order_by = self._replication_key_pages(table)
+        key_cols = order_by[1:]
+        start_val = self.get_starting_replication_key_value(None)
+
+        self._replication_key_pk = [col.name for col in key_cols]
+        try:
+            with self._connect_for_extraction() as conn:
+                if not start_val and key_cols:
+                    yield from self._iter_pages(
+                        conn,
+                        self._select(table).where(order_by[0].is_(None)),
+                        key_cols,
+                        chunk_size,
+                    )
+                yield from self._iter_pages(conn, query, order_by, chunk_size)
+        finally:
+            self._replication_key_pk = None
+
+    @property
+    def partition_key(self) -> str | None:
+        """Column used to split a FULL_TABLE stream into ranges read in parallel.
+
+        This is `_partitionable_key`. Partitioning is off unless
+        `partition_count` is 2 or more.
+        """
+        if self.replication_method != "FULL_TABLE":
+            return None
+        if int(self.get_stream_option("partition_count", 1)) < 2:  # noqa: PLR2004
+            return None
+        return self._partitionable_key
+
+    @property
+    def _partitionable_key(self) -> str | None:
+        """Column the stream could be split into ranges by.
+
+        This is `partition_key` if set, else a single-column primary key of
+        integer, date or datetime type.
+        """
+        if key := self.get_stream_option("partition_key"):
+            return str(key)
+        if len(self.primary_keys or []) != 1:
+            return None
+        key = self.primary_keys[0]  # type: ignore[index]
+        property_schema = self.schema["properties"].get(key, {})
+        if "integer" in property_schema.get("type", []) or property_schema.get(
+            "format"
+        ) in {"date", "date-time"}:
+            return key
+        return None
+
+    @property
+    def partitions(self) -> list[dict] | None:
+        """Get the partition key ranges still to be read in this sync.
+
+        The ranges are planned when the sync starts, see `_plan_sync_partitions`.
+
+        Returns:
+            A list of partition contexts, or None if the stream is not partitioned.
+        """
+        if self.partition_key is None:
+            return super().partitions
+        return self._partition_plan
+
+    def _plan_sync_partitions(self, key: str) -> None:
+        """Plan the partition key ranges to read in this sync.
+
+        The range plan is kept in stream state together with the partitions
+        already completed, so an interrupted sync reuses the same ranges and
+        skips the finished ones.
+
+        Args:
+            key: The partition column.
+        """
+        plan = self.stream_state.get("partition_plan") or {}
+        if plan.get("partition_key") != key or len(plan["completed"]) == len(
+            plan["partitions"]
+        ):
+            plan = {
+                "partition_key": key,
+                "partitions": self._plan_partitions(key),
+                "completed": [],
+            }
+            with self._state_lock:
+                self.stream_state["partition_plan"] = plan
+        self._partition_plan = [
+            partition
+            for partition in plan["partitions"]
+            if partition["partition_index"] not in plan["completed"]
+        ]
+
+    def _plan_partitions(self, key: str) -> list[dict]:
+        """Split the range of `key` into `partition_count` partition contexts.
+
+        Cut points come from the column's histogram when MySQL has one, else
+        from an even split between MIN and MAX.
+
+        Args:
+            key: The partition column.
+
+        Returns:
+            Partition contexts with `partition_index`, and inclusive
+            `partition_lower` and exclusive `partition_upper` bounds. The first
+            range also covers NULLs; open ends are None.
+        """
+        count = int(self.get_stream_option("partition_count"))
+        table = self.get_selected_table()
+        column = table.columns[key] if key in table.columns else sqlalchemy.column(key)
+        histogram = None
+        try:
+            with self.connector._connect() as conn:  # noqa: SLF001
+                raw_histogram = conn.execute(
+                    text(
+                        "select histogram from information_schema.column_statistics "
+                        "where schema_name = :schema and table_name = :table "
+                        "and column_name = :column"
+                    ),
+                    {"schema": table.schema, "table": table.name, "column": key},
+                ).scalar()
+            if raw_histogram:
+                histogram = (
+                    json.loads(raw_histogram)
+                    if isinstance(raw_histogram, str)
+                    else raw_histogram
+                )
+        except sqlalchemy.exc.DBAPIError:
+            self.logger.debug("No column statistics available for %s", key)
+
+        with self.connector._connect() as conn:  # noqa: SLF001
+            lower, upper = conn.execute(
+                sqlalchemy.select(
+                    sqlalchemy.func.min(column), sqlalchemy.func.max(column)
+                ).select_from(table)
+            ).one()
+        if lower is None:
+            return []
+
+        cuts = (histogram_bounds(histogram, count) if histogram else []) or (
+            linear_bounds(lower, upper, count)
+        )
+        edges = [None, *[to_bound(cut) for cut in cuts], None]
+        self.logger.info(
+            "Reading '%s' in %d partitions on '%s'", self.name, len(edges) - 1, key
+        )
+        return [
+            {
+                "partition_index": index,
+                "partition_lower": edges[index],
+                "partition_upper": edges[index + 1],
+            }
+            for index in range(len(edges) - 1)
+        ]
+
+    def _read_partition_batches(
+        self,
+        table: sqlalchemy.Table,
+        key: str,
+        partition: dict,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Read one partition's rows on its own connection.
+
+        Args:
+            table: The table returned by `get_selected_table`.
+            key: The partition column.
+            partition: The partition context.
+
+        Yields:
+            One list of dicts per fetched batch.
+        """
+        query = self._partition_query(table, key, partition)
+        with self._connect_for_extraction() as conn:
+            yield from self._iter_query_batches(conn, query)
+
+    def _partition_query(
+        self,
+        table: sqlalchemy.Table,
+        key: str,
+        partition: dict,
+    ) -> sqlalchemy.Select:
+        """Return the query of one partition's rows.
+
+        Args:
+            table: The table returned by `get_selected_table`.
+            key: The partition column.
+            partition: The partition context.
+
+        Returns:
+            The select statement.
+        """
+        column = table.columns[key] if key in table.columns else sqlalchemy.column(key)
+        # Bounds come back from state as JSON values, so bind them as such.
+        lower = partition["partition_lower"]
+        upper = partition["partition_upper"]
+        query = self._select(table)
+        if lower is None:
+            if upper is not None:
+                query = query.where(
+                    sqlalchemy.or_(column.is_(None), column < sqlalchemy.literal(upper))
+                )
+        else:
+            query = query.where(column >= sqlalchemy.literal(lower))
+            if upper is not None:
+                query = query.where(column < sqlalchemy.literal(upper))
+        return query
+
+    def _close_partition_reader(self) -> None:
+        if self._partition_reader is not None:
+            self._partition_reader.close()
+            self._partition_reader = None
+
+    def _get_partition_records(
+        self,
+        table: sqlalchemy.Table,
+        context: dict,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield one partition's records, reading later partitions ahead.
+
+        The first call starts a pool of `partition_workers` threads, each with
+        its own connection from the connector's engine, that read the pending
+        partitions concurrently. Completed partitions are checkpointed in
+        state, see `_checkpoint`.
+
+        Args:
+            table: The table returned by `get_selected_table`.
+            context: The partition context.
+
+        Yields:
+            One dict per record.
+        """
+        key = str(self.partition_key)
+        if self._partition_reader is None:
+            self._partition_reader = PartitionReader(
+                lambda partition: self._read_partition_batches(table, key, partition),
+                self.partitions or [],
+                max_workers=int(
+                    self.get_stream_option(
+                        "partition_workers", DEFAULT_PARTITION_WORKERS
+                    )
+                ),
+            )
+
+        completed = False
+        try:
+            yield from self._partition_reader.read(context)
+            completed = True
+        finally:
+            if not completed:
+                self._close_partition_reader()
+
+        plan = self.stream_state["partition_plan"]
+
+        def completed_partition() -> None:
+            plan["completed"].append(context["partition_index"])
+            if len(plan["completed"]) == len(plan["partitions"]):
+                self.stream_state.pop("partition_plan", None)
+
+        self._checkpoint(completed_partition)
+        pending = self.partitions or []
+        if pending and context["partition_index"] == pending[-1]["partition_index"]:
+            self._close_partition_reader()
+
+    def get_records(self, context: dict | None) -> Iterable[dict[str, Any]]:
+        """Return a generator of row-type dictionary objects.
+
+        If the stream has a replication_key value defined, records will be sorted by the
+        incremental key. If the stream also has an available starting bookmark, the
+        records will be filtered for values greater than or equal to the bookmark value.
+
+        FULL_TABLE streams with a primary key are read in keyset chunks when
+        `full_table_chunk_size` is set, and in concurrently read key ranges
+        (one per partition context) when `partition_count` is set.
+        INCREMENTAL streams with a primary key are read in keyset pages of
+        (replication key, primary key) when `incremental_chunk_size` is set.
+
+        Args:
+            context: If partition context is provided, will read specifically from this
+                data slice.
+
+        Yields:
+            One dict per record.
+
+        Raises:
+            NotImplementedError: If partition is passed in context and the stream does
+                not support partitioning.
+
+        """
+        table = self.get_selected_table()
+
+        if context:
+            if self.partition_key is None:
+                msg = f"Stream '{self.name}' does not support partitioning."
+                raise NotImplementedError(msg)
+            yield from self._get_partition_records(table, context)
+            return
+
+        if chunk_size := self.full_table_chunk_size:
+            yield from self._get_records_in_pk_chunks(table, chunk_size)
+            return
+
+        if chunk_size := self.incremental_chunk_size:
+            yield from self._get_records_in_replication_key_pages(table, chunk_size)
+            return
+
+        with self._connect_for_extraction() as conn:
+            yield from self._iter_query_records(conn, self.build_query(table, context))
+
+    @property
+    def extraction_strategy(self) -> str:
+        """How `get_records` reads the stream, a strategy of `tap_mysql.planner`."""
+        if self.partition_key is not None:
+            return PARALLEL_RANGES
+        if self.full_table_chunk_size or self.incremental_chunk_size:
+            return KEYSET_CHUNKS
+        return SINGLE_SCAN
+
+    def _planned_queries(
+        self,
+        table: sqlalchemy.Table,
+        indexes: dict[str, str],
+    ) -> list[sqlalchemy.Select]:
+        """Return the queries `get_records` runs, the first page of keyset chunks.
+
+        Args:
+            table: The table returned by `get_selected_table`.
+            indexes: Index names by first column, from `leading_index_columns`.
+
+        Returns:
+            The select statements.
+        """
+        strategy = self.extraction_strategy
+        if strategy == PARALLEL_RANGES:
+            key = str(self.partition_key)
+            if key not in indexes:
+                # Finding the ranges would read the whole table.
+                return [self._select(table)]
+            plan = self.stream_state.get("partition_plan") or {}
+            if plan.get("partition_key") == key:
+                partitions = plan["partitions"]
+            else:
+                partitions = self._plan_partitions(key)
+            return [self._partition_query(table, key, p) for p in partitions]
+        if strategy == KEYSET_CHUNKS:
+            if chunk_size := self.incremental_chunk_size:
+                query, order_by = self._replication_key_pages(table)
+            else:
+                chunk_size = int(self.full_table_chunk_size or 0)
+                query = self._select(table)
+                order_by = [table.columns[name] for name in self.primary_keys or []]
+            return [query.order_by(*order_by).limit(chunk_size)]
+        return [self.build_query(table, None)]
+
+    def extraction_plan(self) -> dict[str, Any]:
+        """Plan how `get_records` reads the stream, without reading it.
+
+        EXPLAINs the queries of the stream's extraction strategy, and checks
+        that indexes start with its replication and partition keys.
+
+        The strategy recommended for the stream is that of
+        `tap_mysql.planner.recommend_strategy`, for the table's
+        `row_count_estimate`, else the rows MySQL expects to read.
+
+        Returns:
+            The stream's `tap_stream_id` and `replication_method`, with the
+            summary of `tap_mysql.planner.summarize_plan`, the
+            `recommended_strategy` and the `recommendation`, its reason.
+        """
+        table = self.get_selected_table()
+        with self.connector._connect() as conn:  # noqa: SLF001
+            indexes = leading_index_columns(conn, str(table.schema), table.name)
+        queries = self._planned_queries(table, indexes)
+        explained = []
+        warnings = []
+        with self.connector._connect() as conn:  # noqa: SLF001
+            for query in queries:
+                try:
+                    explained.append(explain(conn, query))
+                except sqlalchemy.exc.DBAPIError as e:  # noqa: PERF203
+                    warnings.append(f"Could not EXPLAIN the query: {e.orig}")
+        plan = summarize_plan(
+            strategy=self.extraction_strategy,
+            explained=explained,
+            indexes=indexes,
+            replication_key=self.replication_key,
+            partition_key=self.partition_key,
+        )
+        plan["warnings"] += warnings
+        estimated_rows = self.row_count_estimate
+        if estimated_rows is None and self.extraction_strategy != KEYSET_CHUNKS:
+            # Keyset chunks are planned by their first chunk only.
+            estimated_rows = plan["expected_rows"]
+        recommended, reason = recommend_strategy(
+            replication_method=self.replication_method,
+            estimated_rows=estimated_rows,
+            indexes=indexes,
+            primary_keys=self.primary_keys or (),
+            replication_key=self.replication_key,
+            partition_key=self._partitionable_key,
+        )
+        return {
+            "tap_stream_id": self.tap_stream_id,
+            "replication_method": self.replication_method,
+            **plan,
+            "recommended_strategy": recommended,
+            "recommendation": reason,
+        }
+
+    @property
+    def _reads_in_one_query(self) -> bool:
+        """Whether `get_records` reads the stream with a single query."""
+        return (
+            self.replication_method in {"FULL_TABLE", "INCREMENTAL"}
+            and not self.full_table_chunk_size
+            and not self.incremental_chunk_size
+            and self.partition_key is None
+        )
+
+    @property
+    def _batches_from_cursor(self) -> bool:
+        """Whether BATCH files can be written straight from one query's cursor.
+
+        Keyset chunks, partitions and LOG_BASED syncs checkpoint as they go,
+        so those are batched by the SDK from `get_records`, and their
+        checkpoints are held until the batch files with the rows are written,
+        see `_checkpoint`. So are streams with large objects written to side
+        files, by `_offload_lobs`.
+        """
+        return (
+            self.selected
+            and self.ABORT_AT_RECORD_COUNT is None
+            and self._reads_in_one_query
+            and not self._lob_files
+        )
+
+    def _arrow_builder(self, table: sqlalchemy.Table) -> ArrowBatchBuilder:
+        """Return a builder of record batches of the stream's selected properties.
+
+        Args:
+            table: The table returned by `get_selected_table`.
+
+        Returns:
+            The builder, with columns in the order of the selected schema.
+        """
+        selected = self._select(table).selected_columns
+        columns = [
+            sqlalchemy.Column(name, selected[name].type)
+            if name in selected
+            else sqlalchemy.Column(name, sqlalchemy.String())
+            for name in self.get_selected_schema()["properties"]
+        ]
+        return ArrowBatchBuilder(
+            columns,
+            decimal_as=self.config.get("decimal_as", "decimal"),
+        )
+
+    def get_record_batches(
+        self,
+        context: dict | None = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """Return the stream's records as Arrow record batches.
+
+        The columnar counterpart of `get_records`, for consumers that work on
+        whole columns. Streams read with a single query are built straight
+        from the cursor's row tuples, `fetch_size` rows per batch. Others are
+        built from `get_records`, so chunks, partitions and LOG_BASED syncs
+        behave the same way. Needs the `arrow` extra.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            Record batches, with the selected properties as columns.
+        """
+        table = self.get_selected_table()
+        builder = self._arrow_builder(table)
+        if context or not self._reads_in_one_query or self._lob_files:
+            for records in lazy_chunked_generator(
+                self.get_records(context),
+                self.fetch_size,
+            ):
+                yield builder.build(
+                    [[record.get(name) for name in builder.names] for record in records]
+                )
+            return
+
+        with self._connect_for_extraction() as conn:
+            query = self.build_query(table, context)
+            result = conn.execute(
+                query.with_only_columns(
+                    *[query.selected_columns[name] for name in builder.names]
+                )
+            )
+            for rows in result.partitions(self.fetch_size):
+                self._count_read(len(rows))
+                yield builder.build(rows)
+
+    def get_batches(
+        self,
+        batch_config: BatchConfig,
+        context: Mapping[str, Any] | None = None,
+    ) -> Iterator[tuple[BaseBatchFileEncoding, list[str]]]:
+        """Write the stream's rows to batch files as they are fetched.
+
+        Each `batch_size` rows fetched from the cursor are written to one file
+        by a `BatchFileWriter`, without building or conforming records, and
+        the bookmark moves to the last row of each file once it is written.
+
+        Args:
+            batch_config: Batch config for this stream.
+            context: Stream partition or context dictionary.
+
+        Yields:
+            A tuple of (encoding, manifest) for each batch.
+        """
+        if context or not self._batches_from_cursor:
+            yield from super().get_batches(batch_config, context)
+            return
+
+        table = self.get_selected_table()
+        writer = BatchFileWriter(
+            batch_config,
+            tap_name=self.tap_name,
+            stream_name=self.name,
+            arrow_builder=(
+                ArrowBatchBuilder(
+                    [
+                        sqlalchemy.Column(column.name, column.type)
+                        for column in self._select(table).selected_columns
+                    ],
+                    decimal_as=self.config.get("decimal_as", "decimal"),
+                )
+                if batch_config.encoding.format == "parquet"
+                else None
+            ),
+        )
+        self._write_starting_replication_value(None)
+        record_counter = metrics.record_counter(self.name)
+        with record_counter, self._connect_for_extraction() as conn:
+            result = conn.execute(self.build_query(table, None))
+            keys = tuple(result.keys())
+            for rows in result.partitions(batch_config.batch_size):
+                manifest = writer.write(keys, rows)
+                record_counter.increment(len(rows))
+                self._count_read(len(rows))
+                self._increment_stream_state(
+                    dict(zip(keys, rows[-1])),
+                    context=None,
+                )
+                yield batch_config.encoding, manifest
+        with self._state_lock:
+            self._finalize_state(self.stream_state)
+
+
+class MySQLLogBasedStream(MySQLStream):
+    """Stream class for MySQL LOG_BASED (binlog) streams.
+
+    The first sync records the current binlog position and copies the whole
+    table. Later syncs read the table's row events from the binlog since the
+    stored position, so deletes are seen too and are marked with
+    `_sdc_deleted_at`.
+    """
+
+    @property
+    def binlog_server_id(self) -> int:
+        """Server id to read the binlog with, unique among the server's replicas.
+
+        `binlog_server_id` if set, else one derived from the connection and
+        the stream, see `derive_server_id`.
+        """
+        if server_id := self.config.get("binlog_server_id"):
+            return int(server_id)
+        return derive_server_id(
+            sqlalchemy.engine.make_url(self.connector.sqlalchemy_url),
+            self.tap_stream_id,
+        )
+
+    def _binlog_position(self) -> dict[str, Any]:
+        """Return the server's current binlog position.
+
+        During a consistent snapshot, this is the position of the snapshot,
+        so the first sync's copy of the table ends exactly where reading the
+        binlog starts.
+
+        Returns:
+            `log_file` and `log_pos`, and `gtid_set` when GTIDs are used.
+
+        Raises:
+            RuntimeError: If binary logging is not enabled.
+        """
+        snapshot = self.connector.snapshot  # type: ignore[attr-defined]
+        if snapshot is not None:
+            position = snapshot.position
+        else:
+            with self.connector._connect() as conn:  # noqa: SLF001
+                position = binlog_position(conn)
+        if position is None:
+            msg = "LOG_BASED replication needs binary logging (log_bin) enabled."
+            raise RuntimeError(msg)
+
+        position = dict(position)
+        if not self.config.get("binlog_use_gtid"):
+            position.pop("gtid_set")
+        return position
+
+    @property
+    def extraction_strategy(self) -> str:
+        """How `get_records` reads the stream, a strategy of `tap_mysql.planner`."""
+        return BINLOG
+
+    def _planned_queries(
+        self,
+        table: sqlalchemy.Table,
+        indexes: dict[str, str],  # noqa: ARG002
+    ) -> list[sqlalchemy.Select]:
+        """Return the copy of the table on the first sync, no query later.
+
+        Args:
+            table: The table returned by `get_selected_table`.
+            indexes: Index names by first column, from `leading_index_columns`.
+
+        Returns:
+            The select statements.
+        """
+        if "log_file" in self.stream_state:
+            return []
+        return [self._select(table)]
+
+    def _write_binlog_position(self, position: dict[str, Any]) -> None:
+        self._checkpoint(partial(self.stream_state.update, position))
+
+    def get_records(self, context: dict | None) -> Iterable[dict[str, Any]]:  # type: ignore[override]
+        """Return the table's changes since the stored binlog position.
+
+        Large objects are emitted under their LOB policies, as when the table
+        is copied.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            One dict per inserted, updated or deleted row.
+
+        Raises:
+            NotImplementedError: For Vitess, which has no MySQL binlog.
+        """
+        if self.connector.is_vitess:  # type: ignore[attr-defined]
+            msg = "LOG_BASED replication is not supported for Vitess."
+            raise NotImplementedError(msg)
+
+        if "log_file" not in self.stream_state:
+            # Take the position before copying the table, so changes made
+            # during the copy are read from the binlog next time.
+            position = self._binlog_position()
+            yield from super().get_records(context)
+            self._write_binlog_position(position)
+            return
+
+        start_position = {
+            key: self.stream_state[key]
+            for key in ("log_file", "log_pos", "gtid_set")
+            if key in self.stream_state
+        }
+        end_position = self._binlog_position()
+        _, schema_name, table_name = self.connector.parse_full_table_name(
+            self.fully_qualified_name
+        )
+        table = self.connector.get_table(self.fully_qualified_name)
+        decoder = BinlogDecoder(
+            table,
+            decimal_as=self.config.get("decimal_as", "decimal"),
+            lob_policies=self._lob_policies(self.get_selected_table()),
+            lob_max_length=int(
+                self.get_stream_option("lob_max_length", DEFAULT_LOB_LENGTH)
+            ),
+            lob_store=self._open_lob_store() if self._lob_files else None,
+        )
+        events = read_events(
+            self.connector._engine.url,  # noqa: SLF001
+            server_id=self.binlog_server_id,
+            schema_name=str(schema_name),
+            table_name=table_name,
+            position=start_position,
+            use_gtid=bool(self.config.get("binlog_use_gtid")),
+        )
+        with closing(events):
+            for records, resume_position in iter_changes(
+                events, decoder, start_position, end_position
+            ):
+                self._count_read(len(records))
+                yield from records
+                if resume_position is not None:
+                    self._write_binlog_position(resume_position)
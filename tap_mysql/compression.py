@@ -0,0 +1,90 @@
+"""Compression of the MySQL client/server protocol."""
+
+from __future__ import annotations
+
+import atexit
+import tempfile
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+COMPRESSION = ("zlib", "zstd")
+DRIVERS = ("pymysql", "mysqldb")
+ZSTD_LEVELS = range(1, 23)
+DEFAULT_ZSTD_LEVEL = 3
+
+
+@cache
+def _zstd_option_file(level: int, default_file: str | None = None) -> Path:
+    # mysqlclient has no connect argument for the compression algorithm, but
+    # libmysqlclient reads it from an option file. zlib and no compression
+    # are kept as fallbacks, for servers without zstd (before MySQL 8.0.18).
+    # An option file of the user's own is included first, so its options are
+    # still read, and these follow it.
+    include = (
+        f"!include {Path(default_file).expanduser().resolve()}\n"
+        if default_file
+        else ""
+    )
+    with tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        prefix="tap-mysql-zstd-",
+        suffix=".cnf",
+        delete=False,
+    ) as f:
+        f.write(
+            f"{include}"
+            "[client]\n"
+            "compression-algorithms=zstd,zlib,uncompressed\n"
+            f"zstd-compression-level={level}\n"
+        )
+    path = Path(f.name)
+    atexit.register(path.unlink, missing_ok=True)
+    return path
+
+
+def compression_connect_args(
+    driver: str,
+    compression: str | None,
+    zstd_level: int | None = None,
+    default_file: str | None = None,
+) -> dict[str, Any]:
+    """Return the DBAPI connect arguments that compress the protocol.
+
+    Only mysqlclient (`mysql+mysqldb`) can compress, PyMySQL does not
+    implement protocol compression.
+
+    Args:
+        driver: The SQLAlchemy driver name, as in `URL.get_driver_name()`.
+        compression: One of `COMPRESSION`, or None for no compression.
+        zstd_level: The zstd level, 1 to 22, `DEFAULT_ZSTD_LEVEL` if None.
+        default_file: The `read_default_file` of the connection URL, if any.
+            zstd settings are passed in an option file that includes it.
+
+    Returns:
+        The connect arguments, empty if `compression` is None.
+
+    Raises:
+        ValueError: If `compression` or `zstd_level` is not valid, or the
+            driver cannot compress.
+    """
+    if not compression:
+        return {}
+    if compression not in COMPRESSION:
+        msg = f"compression must be one of {COMPRESSION}, got {compression!r}."
+        raise ValueError(msg)
+    if driver != "mysqldb":
+        msg = (
+            f"The {driver} driver does not support protocol compression. Set "
+            "`driver` to `mysqldb`, with mysqlclient installed, to compress."
+        )
+        raise ValueError(msg)
+    if compression == "zlib":
+        return {"compress": True}
+
+    level = DEFAULT_ZSTD_LEVEL if zstd_level is None else zstd_level
+    if level not in ZSTD_LEVELS:
+        msg = f"zstd_compression_level must be from 1 to 22, got {level}."
+        raise ValueError(msg)
+    return {"read_default_file": str(_zstd_option_file(level, default_file))}
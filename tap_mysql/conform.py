@@ -0,0 +1,199 @@
+"""Record conformance compiled once per stream."""
+
+from __future__ import annotations
+
+import datetime
+import decimal
+from typing import TYPE_CHECKING, Any
+
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import is_boolean_type
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from singer_sdk._singerlib import SelectionMask
+
+EPOCH = datetime.datetime.fromtimestamp(0, datetime.timezone.utc)
+
+
+def _timedelta_to_str(value: datetime.timedelta) -> str:
+    return (EPOCH + value).isoformat()
+
+
+def _bytes_to_bool(value: bytes) -> bool:
+    # For BIT values, treat 0 as False and anything else as True
+    return value != b"\x00"
+
+
+# Conversions by Python type, applied to values of columns whose JSON type
+# does not already tell what the driver returns. Dates and datetimes keep
+# their own precision and timezone (or lack of one).
+BY_TYPE: dict[type, Callable[[Any], Any]] = {
+    datetime.datetime: datetime.datetime.isoformat,
+    datetime.date: datetime.date.isoformat,
+    datetime.time: str,
+    datetime.timedelta: _timedelta_to_str,
+    bytes: bytes.hex,
+}
+
+
+# Types written as they are, so they skip the subclass checks below.
+PLAIN_TYPES = frozenset({str, int, float, bool, decimal.Decimal, dict, list})
+
+
+def convert_by_type(value: Any) -> Any:  # noqa: ANN401
+    """Convert a value JSON has no type for, by its Python type.
+
+    Args:
+        value: A value read from the database.
+
+    Returns:
+        The JSON compatible value, or `value` if it already is one.
+    """
+    value_type = type(value)
+    if value_type in PLAIN_TYPES:
+        return value
+    if (convert := BY_TYPE.get(value_type)) is not None:
+        return convert(value)
+    for kind, convert in BY_TYPE.items():
+        if isinstance(value, kind):
+            return convert(value)
+    return value
+
+
+def _by_type_or_bool(value: Any) -> Any:  # noqa: ANN401
+    if type(value) is bytes:
+        return _bytes_to_bool(value)
+    return convert_by_type(value)
+
+
+def _to_bool(value: Any) -> Any:  # noqa: ANN401
+    if value is None:
+        return None
+    if type(value) is bytes:
+        return _bytes_to_bool(value)
+    return value != 0
+
+
+def _datetime_to_str(value: Any) -> Any:  # noqa: ANN401
+    if type(value) is datetime.datetime:
+        return value.isoformat()
+    return convert_by_type(value)
+
+
+def _date_to_str(value: Any) -> Any:  # noqa: ANN401
+    if type(value) is datetime.date:
+        return value.isoformat()
+    return convert_by_type(value)
+
+
+def _json_types(property_schema: dict) -> set[str]:
+    types = property_schema.get("type", [])
+    return {types} if isinstance(types, str) else set(types)
+
+
+def compile_converter(property_schema: dict) -> Callable[[Any], Any] | None:
+    """Pick the conversion to JSON compatible values for one property.
+
+    Args:
+        property_schema: The property's JSON schema.
+
+    Returns:
+        The converter, or None if values need no conversion.
+    """
+    types = _json_types(property_schema) - {"null"}
+    if types == {"boolean"}:
+        return _to_bool
+    if types & {"object", "array"} or (types and types <= {"integer", "number"}):
+        # Numbers (Decimal included) are written as JSON numbers as they
+        # are, and JSON values are decoded by the column type.
+        return None
+    if property_schema.get("format") == "date-time":
+        return _datetime_to_str
+    if property_schema.get("format") == "date":
+        return _date_to_str
+    if is_boolean_type(property_schema):
+        return _by_type_or_bool
+    return convert_by_type
+
+
+class RecordConformer:
+    """Make records match a stream's selected schema, in a single pass.
+
+    Converters are chosen once per property from the schema, rather than
+    re-reading the schema for every value. Deselected properties are
+    dropped, and properties not in the schema are dropped with a warning.
+    """
+
+    def __init__(
+        self,
+        schema: dict,
+        mask: SelectionMask,
+        on_unmapped: Callable[[tuple[str, ...]], None],
+    ) -> None:
+        """Compile the converters.
+
+        Args:
+            schema: The stream's JSON schema.
+            mask: The stream's selection mask.
+            on_unmapped: Called once with the names of properties found in
+                records but not in the schema.
+        """
+        properties = schema.get("properties", {})
+        self._schema = schema
+        self._mask = mask
+        self._keep_unmapped = bool(schema.get("additionalProperties"))
+        self._on_unmapped = on_unmapped
+        self._warned = False
+        self._deselected = {
+            name for name in properties if not mask[("properties", name)]
+        }
+        self._converters = {
+            name: compile_converter(property_schema)
+            for name, property_schema in properties.items()
+            if name not in self._deselected
+        }
+        # Properties with selection metadata below them, to prune as the SDK does.
+        self._nested = {
+            breadcrumb[1]
+            for breadcrumb in mask
+            if len(breadcrumb) > 2 and breadcrumb[1] in self._converters  # noqa: PLR2004
+        }
+
+    def __call__(self, record: dict[str, Any]) -> dict[str, Any]:
+        """Return the conformed record.
+
+        Args:
+            record: A record from `get_records`.
+
+        Returns:
+            A new record with JSON compatible values.
+        """
+        converters = self._converters
+        nested = self._nested
+        conformed = {}
+        unmapped = []
+        for name, value in record.items():
+            try:
+                convert = converters[name]
+            except KeyError:
+                if name not in self._deselected:
+                    unmapped.append(name)
+                    if self._keep_unmapped:
+                        conformed[name] = value
+                continue
+            if nested and name in nested and isinstance(value, dict):
+                pop_deselected_record_properties(
+                    value,
+                    self._schema,
+                    self._mask,
+                    ("properties", name),
+                )
+            conformed[name] = (
+                value if convert is None or value is None else convert(value)
+            )
+        if unmapped and not self._warned:
+            self._warned = True
+            self._on_unmapped(tuple(unmapped))
+        return conformed
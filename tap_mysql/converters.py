@@ -0,0 +1,118 @@
+"""Driver value converters, applied as rows are read off the wire."""
+
+from __future__ import annotations
+
+import copy
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy.dialects import mysql
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sqlalchemy.engine import Dialect
+
+DECIMAL_AS = ("decimal", "float", "string")
+
+# DBAPI modules of the SQLAlchemy drivers that take a `conv` map.
+DRIVER_MODULES = {"pymysql": "pymysql", "mysqldb": "MySQLdb"}
+
+# FIELD_TYPE names of the column types converted here.
+_DATE_FIELDS = ("DATE", "NEWDATE")
+_DATETIME_FIELDS = ("DATETIME", "TIMESTAMP")
+_DECIMAL_FIELDS = ("DECIMAL", "NEWDECIMAL")
+
+# Zero dates ("0000-00-00" and "0000-00-00 00:00:00[.ffffff]") are not valid
+# Python dates, the drivers return them as the raw text.
+_ZERO_DATES = frozenset({"0000-00-00", b"0000-00-00"})
+
+
+def _zero_date_to_none(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def convert_date(value: Any) -> Any:  # noqa: ANN401
+        if value[:10] in _ZERO_DATES:
+            return None
+        return convert(value)
+
+    return convert_date
+
+
+def _bit_to_int(value: bytes) -> int:
+    return int.from_bytes(value, "big")
+
+
+def _decimal_to_str(value: str | bytes) -> str:
+    return value.decode("ascii") if isinstance(value, bytes) else value
+
+
+class DecodedBit(mysql.BIT):
+    """BIT column type of connections with `driver_conversions`.
+
+    The driver already returns the values as ints, so SQLAlchemy's per-value
+    bytes loop is skipped.
+    """
+
+    def result_processor(self, dialect: Dialect, coltype: object) -> None:  # noqa: ARG002
+        """Return no processor, values are ints as read.
+
+        Args:
+            dialect: The dialect in use.
+            coltype: The DBAPI column type.
+        """
+        return
+
+
+def decimal_converter(decimal_as: str) -> Callable[[Any], Any] | None:
+    """Return the conversion of DECIMAL text for a `decimal_as` setting.
+
+    Args:
+        decimal_as: One of `DECIMAL_AS`.
+
+    Returns:
+        The converter, or None to keep the driver's `Decimal`.
+
+    Raises:
+        ValueError: If `decimal_as` is not one of `DECIMAL_AS`.
+    """
+    if decimal_as == "decimal":
+        return None
+    if decimal_as == "float":
+        return float
+    if decimal_as == "string":
+        return _decimal_to_str
+    msg = f"decimal_as must be one of {', '.join(DECIMAL_AS)}, got {decimal_as!r}."
+    raise ValueError(msg)
+
+
+def driver_conversions(driver: str, *, decimal_as: str = "decimal") -> dict | None:
+    """Build the `conv` map to connect with.
+
+    Starts from the driver's own map and replaces the decoders of:
+
+    - DATE, DATETIME and TIMESTAMP, to return None for zero dates,
+    - BIT, to return an int rather than bytes,
+    - DECIMAL, to return a float or str if `decimal_as` asks for it.
+
+    Args:
+        driver: SQLAlchemy driver name, such as `pymysql`.
+        decimal_as: One of `DECIMAL_AS`.
+
+    Returns:
+        A copy of the driver's conversions with the decoders replaced, or None
+        if the driver does not take a `conv` map.
+    """
+    if (module := DRIVER_MODULES.get(driver)) is None:
+        return None
+    converters = importlib.import_module(f"{module}.converters")
+    field_type = importlib.import_module(f"{module}.constants.FIELD_TYPE")
+    conv = copy.copy(converters.conversions)
+
+    for name in (*_DATE_FIELDS, *_DATETIME_FIELDS):
+        code = getattr(field_type, name)
+        if (convert := conv.get(code)) is not None:
+            conv[code] = _zero_date_to_none(convert)
+    conv[field_type.BIT] = _bit_to_int
+    if (convert_decimal := decimal_converter(decimal_as)) is not None:
+        for name in _DECIMAL_FIELDS:
+            conv[getattr(field_type, name)] = convert_decimal
+    return conv
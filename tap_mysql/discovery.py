@@ -0,0 +1,474 @@
+"""Catalog discovery in bulk from information_schema, and its on-disk cache."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from importlib import metadata
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import sqlalchemy
+from sqlalchemy import bindparam, text
+
+from tap_mysql.local_cache import read_json, write_json
+from tap_mysql.sql_types import parse_column_type
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Collection, Iterable
+
+    from sqlalchemy.engine import Connection
+    from sqlalchemy.sql.elements import ColumnElement
+
+# Bump when discovery produces different catalog entries for the same tables,
+# so caches written by older versions are not reused.
+CACHE_FORMAT_VERSION = 1
+
+# Packages whose upgrades may change discovered catalog entries.
+CACHE_PACKAGES = ("meltanolabs-tap-mysql", "singer-sdk", "sqlalchemy")
+
+# One row per table: a fingerprint of everything discovery reads about it, its
+# columns and their types, nullability, keys and comments, and its indexes.
+# Computed by the server from information_schema, without reflecting tables.
+FINGERPRINT_QUERY = text(
+    """
+    SELECT t.TABLE_SCHEMA, t.TABLE_NAME,
+        CONCAT_WS(
+            '/', t.TABLE_TYPE, c.column_count, c.column_checksum,
+            s.index_column_count, s.index_checksum
+        ) AS fingerprint
+    FROM information_schema.TABLES t
+    LEFT JOIN (
+        SELECT TABLE_SCHEMA, TABLE_NAME,
+            COUNT(*) AS column_count,
+            BIT_XOR(CRC32(CONCAT_WS(
+                '|', ORDINAL_POSITION, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE,
+                COLUMN_KEY, COLUMN_COMMENT
+            ))) AS column_checksum
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA IN :schema_names
+        GROUP BY TABLE_SCHEMA, TABLE_NAME
+    ) c ON c.TABLE_SCHEMA = t.TABLE_SCHEMA AND c.TABLE_NAME = t.TABLE_NAME
+    LEFT JOIN (
+        SELECT TABLE_SCHEMA, TABLE_NAME,
+            COUNT(*) AS index_column_count,
+            BIT_XOR(CRC32(CONCAT_WS(
+                '|', INDEX_NAME, NON_UNIQUE, SEQ_IN_INDEX, COLUMN_NAME
+            ))) AS index_checksum
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA IN :schema_names
+        GROUP BY TABLE_SCHEMA, TABLE_NAME
+    ) s ON s.TABLE_SCHEMA = t.TABLE_SCHEMA AND s.TABLE_NAME = t.TABLE_NAME
+    WHERE t.TABLE_SCHEMA IN :schema_names
+    ORDER BY t.TABLE_SCHEMA, t.TABLE_NAME
+    """
+).bindparams(bindparam("schema_names", expanding=True))
+
+
+def table_fingerprints(
+    conn: Connection,
+    schema_names: Iterable[str],
+    *,
+    per_schema: bool = False,
+) -> dict[tuple[str, str], str]:
+    """Return the fingerprint of every table and view in the given schemas.
+
+    Args:
+        conn: An open connection.
+        schema_names: Schemas to fingerprint.
+        per_schema: Query one schema at a time, as Vitess routes queries of
+            information_schema to a single keyspace.
+
+    Returns:
+        Fingerprints by `(schema_name, table_name)`.
+    """
+    schema_names = list(schema_names)
+    if not schema_names:
+        return {}
+    queried = [[name] for name in schema_names] if per_schema else [schema_names]
+    fingerprints = {}
+    for names in queried:
+        rows = conn.execute(FINGERPRINT_QUERY, {"schema_names": names})
+        fingerprints.update(
+            {(schema, table): fingerprint for schema, table, fingerprint in rows}
+        )
+    return fingerprints
+
+
+def _information_schema(name: str, *columns: str) -> sqlalchemy.TableClause:
+    return sqlalchemy.table(
+        name,
+        *(sqlalchemy.column(column) for column in columns),
+        schema="information_schema",
+    )
+
+
+_TABLES = _information_schema(
+    "TABLES",
+    "TABLE_SCHEMA",
+    "TABLE_NAME",
+    "TABLE_TYPE",
+    "TABLE_ROWS",
+    "DATA_LENGTH",
+)
+_COLUMNS = _information_schema(
+    "COLUMNS",
+    "TABLE_SCHEMA",
+    "TABLE_NAME",
+    "COLUMN_NAME",
+    "ORDINAL_POSITION",
+    "COLUMN_TYPE",
+    "IS_NULLABLE",
+    "COLUMN_DEFAULT",
+    "EXTRA",
+    "COLUMN_COMMENT",
+)
+_STATISTICS = _information_schema(
+    "STATISTICS",
+    "TABLE_SCHEMA",
+    "TABLE_NAME",
+    "INDEX_NAME",
+    "NON_UNIQUE",
+    "SEQ_IN_INDEX",
+    "COLUMN_NAME",
+)
+
+# `TABLE_TYPE`s listed by `Inspector.get_view_names`, the others are tables.
+VIEW_TYPES = frozenset({"VIEW", "SYSTEM VIEW"})
+
+
+@dataclass
+class ReflectedTable:
+    """What discovery needs of a table, as the SQLAlchemy `Inspector` returns it.
+
+    Views have no primary key nor indexes, as with `get_multi_pk_constraint`
+    and `get_multi_indexes`, which only reflect tables.
+    """
+
+    is_view: bool
+    columns: list[dict[str, Any]] = field(default_factory=list)
+    primary_key: dict[str, Any] | None = None
+    indexes: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _tables_filter(
+    information_schema_table: sqlalchemy.TableClause,
+    schema_names: Collection[str],
+    table_names: Collection[tuple[str, str]] | None,
+) -> ColumnElement[bool]:
+    columns = information_schema_table.c
+    if table_names is None:
+        return columns.TABLE_SCHEMA.in_(schema_names)
+    return sqlalchemy.tuple_(columns.TABLE_SCHEMA, columns.TABLE_NAME).in_(table_names)
+
+
+def reflect_tables(
+    conn: Connection,
+    schema_names: Collection[str],
+    table_names: Collection[tuple[str, str]] | None = None,
+    *,
+    reflect_indices: bool = True,
+) -> dict[tuple[str, str], ReflectedTable]:
+    """Reflect every table and view of some schemas in three queries.
+
+    Reads information_schema TABLES, COLUMNS and STATISTICS once for all the
+    schemas, rather than asking the server about each table in turn. Column
+    types are parsed by the MySQL dialect, see `parse_column_type`.
+
+    Args:
+        conn: An open connection to a MySQL server.
+        schema_names: Schemas to reflect.
+        table_names: If set, only reflect these `(schema_name, table_name)`.
+        reflect_indices: Whether to reflect indexes besides the primary key.
+
+    Returns:
+        The tables and views by `(schema_name, table_name)`, ordered by schema
+        then name.
+    """
+    if not schema_names or (table_names is not None and not table_names):
+        return {}
+
+    tables: dict[tuple[str, str], ReflectedTable] = {}
+    rows = conn.execute(
+        sqlalchemy.select(
+            _TABLES.c.TABLE_SCHEMA, _TABLES.c.TABLE_NAME, _TABLES.c.TABLE_TYPE
+        )
+        .where(_tables_filter(_TABLES, schema_names, table_names))
+        .order_by(_TABLES.c.TABLE_SCHEMA, _TABLES.c.TABLE_NAME)
+    )
+    for schema_name, table_name, table_type in rows:
+        is_view = table_type in VIEW_TYPES
+        tables[schema_name, table_name] = ReflectedTable(
+            is_view=is_view,
+            primary_key=None if is_view else {"constrained_columns": [], "name": None},
+        )
+    _reflect_columns(
+        conn,
+        tables,
+        _tables_filter(_COLUMNS, schema_names, table_names),
+    )
+    _reflect_indexes(
+        conn,
+        tables,
+        _tables_filter(_STATISTICS, schema_names, table_names),
+        reflect_indices=reflect_indices,
+    )
+    return tables
+
+
+def table_estimates(
+    conn: Connection,
+    schema_names: Collection[str],
+    table_names: Collection[tuple[str, str]] | None = None,
+) -> dict[tuple[str, str], tuple[int | None, int | None]]:
+    """Return the estimated size of every table of some schemas, in one query.
+
+    These are the statistics MySQL keeps for the optimizer: InnoDB samples
+    pages to estimate `TABLE_ROWS`, which can be off by half, and MySQL 8
+    caches both for `information_schema_stats_expiry` seconds. Views have none.
+
+    Args:
+        conn: An open connection to a MySQL server.
+        schema_names: Schemas of the tables.
+        table_names: If set, only these `(schema_name, table_name)`.
+
+    Returns:
+        The estimated row count and data length in bytes, by
+        `(schema_name, table_name)`.
+    """
+    if not schema_names or (table_names is not None and not table_names):
+        return {}
+    rows = conn.execute(
+        sqlalchemy.select(
+            _TABLES.c.TABLE_SCHEMA,
+            _TABLES.c.TABLE_NAME,
+            _TABLES.c.TABLE_ROWS,
+            _TABLES.c.DATA_LENGTH,
+        ).where(_tables_filter(_TABLES, schema_names, table_names))
+    )
+    return {
+        (schema_name, table_name): (
+            None if table_rows is None else int(table_rows),
+            None if data_length is None else int(data_length),
+        )
+        for schema_name, table_name, table_rows, data_length in rows
+    }
+
+
+def _reflect_columns(
+    conn: Connection,
+    tables: dict[tuple[str, str], ReflectedTable],
+    where: ColumnElement[bool],
+) -> None:
+    rows = conn.execute(
+        sqlalchemy.select(_COLUMNS)
+        .where(where)
+        .order_by(
+            _COLUMNS.c.TABLE_SCHEMA,
+            _COLUMNS.c.TABLE_NAME,
+            _COLUMNS.c.ORDINAL_POSITION,
+        )
+    )
+    for row in rows:
+        if (table := tables.get((row.TABLE_SCHEMA, row.TABLE_NAME))) is None:
+            continue
+        table.columns.append(
+            {
+                "name": row.COLUMN_NAME,
+                "type": parse_column_type(row.COLUMN_TYPE),
+                "nullable": row.IS_NULLABLE == "YES",
+                "default": row.COLUMN_DEFAULT,
+                "autoincrement": "auto_increment" in (row.EXTRA or "").lower(),
+                "comment": row.COLUMN_COMMENT or None,
+            }
+        )
+
+
+def _reflect_indexes(
+    conn: Connection,
+    tables: dict[tuple[str, str], ReflectedTable],
+    where: ColumnElement[bool],
+    *,
+    reflect_indices: bool,
+) -> None:
+    # Columns of each index, with their position in it. Indexes stay in the
+    # order the server lists them, as SHOW CREATE TABLE does.
+    index_columns: dict[tuple[str, str, str], list[tuple[int, str]]] = {}
+    unique: dict[tuple[str, str, str], bool] = {}
+    for row in conn.execute(sqlalchemy.select(_STATISTICS).where(where)):
+        if (row.TABLE_SCHEMA, row.TABLE_NAME) not in tables or (
+            not reflect_indices and row.INDEX_NAME != "PRIMARY"
+        ):
+            continue
+        key = (row.TABLE_SCHEMA, row.TABLE_NAME, row.INDEX_NAME)
+        index_columns.setdefault(key, []).append((row.SEQ_IN_INDEX, row.COLUMN_NAME))
+        unique[key] = not int(row.NON_UNIQUE)
+
+    for (schema_name, table_name, index_name), columns in index_columns.items():
+        table = tables[schema_name, table_name]
+        column_names = [name for _, name in sorted(columns)]
+        if index_name == "PRIMARY":
+            table.primary_key = {"constrained_columns": column_names, "name": None}
+        elif not table.is_view:
+            table.indexes.append(
+                {
+                    "name": index_name,
+                    "column_names": column_names,
+                    "unique": unique[schema_name, table_name, index_name],
+                }
+            )
+
+
+def schema_columns(conn: Connection, schema_name: str) -> dict[str, list[dict]]:
+    """Return the columns of every table and view of a schema, in one query.
+
+    Filters on a single schema, so Vitess routes the query to its keyspace.
+
+    Args:
+        conn: An open connection.
+        schema_name: The schema, or Vitess keyspace.
+
+    Returns:
+        Columns by table name, in order, as SHOW COLUMNS lists them: dicts of
+        `Field`, `Type` and `Null`.
+    """
+    columns: dict[str, list[dict]] = {}
+    rows = conn.execute(
+        sqlalchemy.select(
+            _COLUMNS.c.TABLE_NAME,
+            _COLUMNS.c.COLUMN_NAME,
+            _COLUMNS.c.COLUMN_TYPE,
+            _COLUMNS.c.IS_NULLABLE,
+        )
+        .where(_COLUMNS.c.TABLE_SCHEMA == schema_name)  # noqa: SIM300
+        .order_by(_COLUMNS.c.TABLE_NAME, _COLUMNS.c.ORDINAL_POSITION)
+    )
+    for table_name, column_name, column_type, is_nullable in rows:
+        columns.setdefault(table_name, []).append(
+            {"Field": column_name, "Type": column_type, "Null": is_nullable}
+        )
+    return columns
+
+
+def _package_version(name: str) -> str | None:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+class DiscoveryCache:
+    """Catalog entries from an earlier discovery, with their table fingerprints.
+
+    Entries depend only on a table's definition, which its fingerprint covers,
+    and on the settings discovery ran with. The whole cache is discarded if it
+    was written with different settings, cache format or package versions.
+    """
+
+    def __init__(self, path: str | os.PathLike, settings: dict[str, Any]) -> None:
+        """Load the cache file, if there is a usable one.
+
+        Args:
+            path: The cache file.
+            settings: Tap settings that change discovered catalog entries.
+        """
+        self.path = Path(path)
+        self.settings = {
+            "format": CACHE_FORMAT_VERSION,
+            "packages": {name: _package_version(name) for name in CACHE_PACKAGES},
+            **settings,
+        }
+        self._cached: dict[str, dict] = {}
+        self._current: dict[str, dict] = {}
+        data = read_json(self.path)
+        if isinstance(data, dict) and data.get("settings") == self.settings:
+            self._cached = data.get("tables") or {}
+
+    @staticmethod
+    def _key(schema_name: str, table_name: str) -> str:
+        return f"{schema_name}.{table_name}"
+
+    def get(
+        self,
+        schema_name: str,
+        table_name: str,
+        fingerprint: str | None,
+    ) -> dict | None:
+        """Return the cached catalog entry of a table, if it is still current.
+
+        Args:
+            schema_name: The table's schema.
+            table_name: The table.
+            fingerprint: The table's fingerprint now, or None if unknown.
+
+        Returns:
+            The catalog entry, or None if the table must be discovered again.
+        """
+        if fingerprint is None:
+            return None
+        cached = self._cached.get(self._key(schema_name, table_name))
+        if cached is None or cached.get("fingerprint") != fingerprint:
+            return None
+        return cached["entry"]
+
+    def put(
+        self,
+        schema_name: str,
+        table_name: str,
+        fingerprint: str | None,
+        entry: dict,
+    ) -> None:
+        """Keep a table's catalog entry for the next discovery.
+
+        Args:
+            schema_name: The table's schema.
+            table_name: The table.
+            fingerprint: The table's fingerprint, or None to not cache it.
+            entry: The table's catalog entry.
+        """
+        if fingerprint is not None:
+            self._current[self._key(schema_name, table_name)] = {
+                "fingerprint": fingerprint,
+                "entry": entry,
+            }
+
+    def save(self) -> None:
+        """Replace the cache file with the entries kept by `put`.
+
+        Tables not discovered this time (dropped, or in schemas no longer
+        discovered) are left out.
+        """
+        write_json(self.path, {"settings": self.settings, "tables": self._current})
+
+
+def leading_index_columns(
+    conn: Connection,
+    schema_name: str,
+    table_name: str,
+) -> dict[str, str]:
+    """Return the columns that an index of a table starts with.
+
+    These are the columns MySQL can range scan, and read in order, without
+    a full table scan or a filesort.
+
+    Args:
+        conn: An open connection.
+        schema_name: The table's schema.
+        table_name: The table.
+
+    Returns:
+        The name of an index by its first column, the primary key if it is one.
+    """
+    rows = conn.execute(
+        sqlalchemy.select(_STATISTICS.c.COLUMN_NAME, _STATISTICS.c.INDEX_NAME)
+        .where(
+            _STATISTICS.c.TABLE_SCHEMA == schema_name,  # noqa: SIM300
+            _STATISTICS.c.TABLE_NAME == table_name,  # noqa: SIM300
+            _STATISTICS.c.SEQ_IN_INDEX == 1,
+        )
+        .order_by(_STATISTICS.c.INDEX_NAME != "PRIMARY", _STATISTICS.c.INDEX_NAME)
+    )
+    indexes: dict[str, str] = {}
+    for column_name, index_name in rows:
+        indexes.setdefault(column_name, index_name)
+    return indexes
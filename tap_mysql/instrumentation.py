@@ -0,0 +1,463 @@
+"""Where a sync spends its time: stage timers, counters and a sampling profiler."""
+
+from __future__ import annotations
+
+import collections
+import enum
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+from singer_sdk import metrics
+from sqlalchemy.exc import DBAPIError
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable, Iterable, Iterator
+    from types import FrameType
+
+    from sqlalchemy.engine import Connection
+
+# Stages of reading a stream, timed by `StageMetrics`.
+QUERY = "query"  # executing a query, until its result set starts
+FIRST_ROW = "first_row"  # from executing a query to its first rows
+FETCH = "fetch"  # reading rows off the cursor, with type conversion
+CONFORM = "conform"  # conforming records to the schema, and stream maps
+SERIALIZE = "serialize"  # formatting RECORD messages
+WRITE = "write"  # writing them to stdout
+STAGES = (QUERY, FIRST_ROW, FETCH, CONFORM, SERIALIZE, WRITE)
+
+# Seconds between samples of `SamplingProfiler`.
+DEFAULT_PROFILE_INTERVAL = 0.005
+
+# `ru_maxrss` is in kilobytes, but in bytes on macOS.
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+class StageMetric(str, enum.Enum):
+    """Metrics of `StageMetrics`, logged as the SDK logs its own."""
+
+    STAGE_DURATION = "stage_duration"
+    QUERY_COUNT = "query_count"
+    RECORD_COUNT = "rows_read"
+    BYTES_READ = "bytes_read"
+    ROWS_PER_SECOND = "rows_per_second"
+    PEAK_RSS = "peak_rss"
+
+
+def peak_rss() -> int | None:
+    """Return the most memory the process has had resident, in bytes.
+
+    Returns:
+        The peak resident set size, None where the platform does not tell.
+    """
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT
+
+
+def bytes_sent(conn: Connection) -> int | None:
+    """Return the bytes the server has sent on a connection so far.
+
+    The server counts them, so they are the bytes on the wire, compressed
+    or not. Reads by the connection are the difference of two calls.
+
+    Args:
+        conn: An open connection, with no result being read.
+
+    Returns:
+        The session's `Bytes_sent`, None if the server will not tell.
+    """
+    try:
+        row = conn.exec_driver_sql("SHOW SESSION STATUS LIKE 'Bytes_sent'").first()
+    except DBAPIError:
+        return None
+    return int(row[1]) if row is not None else None
+
+
+class StageMetrics:
+    """Timers and counters of one stream's sync, by stage.
+
+    Stages are timed in seconds summed over the sync, along with the queries
+    run, rows and bytes read. They are logged as METRIC lines every
+    `interval` seconds while rows are read, and once more at the end of the
+    sync. Stages may be timed from several threads, as partitions are read.
+    """
+
+    def __init__(
+        self,
+        stream_name: str,
+        *,
+        interval: float = metrics.DEFAULT_LOG_INTERVAL,
+        on_report: Callable[[], None] | None = None,
+    ) -> None:
+        """Start the sync's clock.
+
+        Args:
+            stream_name: The stream being synced.
+            interval: Seconds between METRIC logs.
+            on_report: Called after the metrics are logged.
+        """
+        self.stream_name = stream_name
+        self.interval = interval
+        self.on_report = on_report
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.queries = 0
+        self.rows = 0
+        self.bytes_read: int | None = None
+        self._start = self._reported = time.monotonic()
+        self._lock = threading.Lock()
+        self.logger = metrics.get_metrics_logger()
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add time spent in a stage.
+
+        Args:
+            stage: One of `STAGES`.
+            seconds: The time spent.
+        """
+        with self._lock:
+            self.seconds[stage] += seconds
+
+    def add_bytes(self, count: int) -> None:
+        """Count bytes read from the server.
+
+        Args:
+            count: Number of bytes.
+        """
+        with self._lock:
+            self.bytes_read = (self.bytes_read or 0) + count
+
+    def timed_batches(
+        self,
+        executed: float,
+        batches: Iterable[list[dict[str, Any]]],
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Time the fetching of a query's batches of rows.
+
+        Args:
+            executed: The `time.perf_counter` time the query was executed at.
+            batches: The query's batches, see `record_batches`.
+
+        Yields:
+            The batches, as they are.
+        """
+        self.add(QUERY, time.perf_counter() - executed)
+        with self._lock:
+            self.queries += 1
+        iterator = iter(batches)
+        first = True
+        while True:
+            started = time.perf_counter()
+            batch = next(iterator, None)
+            if batch is None:
+                return
+            fetched = time.perf_counter()
+            with self._lock:
+                self.seconds[FETCH] += fetched - started
+                if first:
+                    self.seconds[FIRST_ROW] += fetched - executed
+                self.rows += len(batch)
+            first = False
+            if time.monotonic() - self._reported >= self.interval:
+                self.report()
+            yield batch
+
+    def points(self) -> list[metrics.Point]:
+        """Return the metrics so far.
+
+        Returns:
+            A timer per stage, counters of queries, rows and bytes read, and
+            gauges of rows per second and the process's peak RSS in bytes.
+        """
+        with self._lock:
+            seconds = dict(self.seconds)
+            queries, rows, bytes_read = self.queries, self.rows, self.bytes_read
+        elapsed = time.monotonic() - self._start
+        tags = {metrics.Tag.STREAM.value: self.stream_name}
+        values: list[tuple[str, StageMetric, Any, dict]] = [
+            ("timer", StageMetric.STAGE_DURATION, value, {**tags, "stage": stage})
+            for stage, value in seconds.items()
+        ]
+        values += [
+            ("counter", StageMetric.QUERY_COUNT, queries, tags),
+            ("counter", StageMetric.RECORD_COUNT, rows, tags),
+            (
+                "gauge",
+                StageMetric.ROWS_PER_SECOND,
+                rows / elapsed if elapsed else 0,
+                tags,
+            ),
+        ]
+        if bytes_read is not None:
+            values.append(("counter", StageMetric.BYTES_READ, bytes_read, tags))
+        if (rss := peak_rss()) is not None:
+            values.append(("gauge", StageMetric.PEAK_RSS, rss, tags))
+        return [
+            # Point only reads the metric's `value`, as it does the SDK's own.
+            metrics.Point(metric_type, cast("metrics.Metric", metric), value, tags)
+            for metric_type, metric, value, tags in values
+        ]
+
+    def report(self) -> None:
+        """Log the metrics so far as METRIC lines."""
+        self._reported = time.monotonic()
+        for point in self.points():
+            metrics.log(self.logger, point)
+        if self.on_report is not None:
+            self.on_report()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Families of the OpenMetrics exposition: name, type, unit, help, and the
+# `StageMetric` each is made from.
+_FAMILIES = (
+    (
+        "tap_mysql_stage_seconds",
+        "counter",
+        "seconds",
+        "Time spent in each stage of reading a stream.",
+        StageMetric.STAGE_DURATION,
+    ),
+    (
+        "tap_mysql_queries",
+        "counter",
+        "",
+        "Queries run to read a stream.",
+        StageMetric.QUERY_COUNT,
+    ),
+    (
+        "tap_mysql_rows_read",
+        "counter",
+        "",
+        "Rows read of a stream.",
+        StageMetric.RECORD_COUNT,
+    ),
+    (
+        "tap_mysql_read_bytes",
+        "counter",
+        "bytes",
+        "Bytes the server sent while a stream was read.",
+        StageMetric.BYTES_READ,
+    ),
+    (
+        "tap_mysql_rows_per_second",
+        "gauge",
+        "",
+        "Rows read per second of a stream, since its sync started.",
+        StageMetric.ROWS_PER_SECOND,
+    ),
+    (
+        "tap_mysql_peak_rss_bytes",
+        "gauge",
+        "bytes",
+        "Peak resident set size of the tap's process.",
+        StageMetric.PEAK_RSS,
+    ),
+)
+
+
+def openmetrics_text(stage_metrics: Iterable[StageMetrics]) -> str:
+    """Return streams' metrics in the OpenMetrics text format.
+
+    Args:
+        stage_metrics: The streams' metrics.
+
+    Returns:
+        The exposition, ending with `# EOF`.
+    """
+    points = [point for stream in stage_metrics for point in stream.points()]
+    lines = []
+    peak = None
+    for name, metric_type, unit, help_text, metric in _FAMILIES:
+        lines += [f"# TYPE {name} {metric_type}", f"# HELP {name} {help_text}"]
+        if unit:
+            lines.append(f"# UNIT {name} {unit}")
+        sample = f"{name}_total" if metric_type == "counter" else name
+        for point in points:
+            if point.metric is not metric:
+                continue
+            if metric is StageMetric.PEAK_RSS:
+                # The process's, logged with every stream.
+                peak = point.value
+                continue
+            labels = ",".join(
+                f'{key}="{_escape(str(value))}"' for key, value in point.tags.items()
+            )
+            lines.append(f"{sample}{{{labels}}} {point.value}")
+        if metric is StageMetric.PEAK_RSS and peak is not None:
+            lines.append(f"{sample} {peak}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class SyncMetrics:
+    """The `StageMetrics` of all the streams of a sync.
+
+    With `openmetrics_path`, they are all written to that file in the
+    OpenMetrics text format whenever a stream logs its metrics, for a
+    node_exporter textfile collector or similar to pick up.
+    """
+
+    def __init__(
+        self,
+        *,
+        openmetrics_path: str | None = None,
+        interval: float = metrics.DEFAULT_LOG_INTERVAL,
+    ) -> None:
+        """Start with no streams.
+
+        Args:
+            openmetrics_path: File to write the metrics to, if any.
+            interval: Seconds between each stream's METRIC logs.
+        """
+        self.openmetrics_path = openmetrics_path
+        self.interval = interval
+        self.streams: dict[str, StageMetrics] = {}
+        self._lock = threading.Lock()
+
+    def stream(self, stream_name: str) -> StageMetrics:
+        """Start the metrics of a stream's sync.
+
+        Args:
+            stream_name: The stream.
+
+        Returns:
+            Its metrics, replacing those of an earlier sync of it.
+        """
+        stage_metrics = StageMetrics(
+            stream_name,
+            interval=self.interval,
+            on_report=self.export,
+        )
+        with self._lock:
+            self.streams[stream_name] = stage_metrics
+        return stage_metrics
+
+    def export(self) -> None:
+        """Write the metrics to `openmetrics_path`, replacing it whole."""
+        if not self.openmetrics_path:
+            return
+        with self._lock:
+            text = openmetrics_text(list(self.streams.values()))
+            path = Path(self.openmetrics_path)
+            # Written aside and renamed, so readers never see half a file.
+            with tempfile.NamedTemporaryFile(
+                "w",
+                dir=path.parent,
+                prefix=f".{path.name}.",
+                delete=False,
+            ) as f:
+                f.write(text)
+            Path(f.name).replace(path)
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def folded_stack(frame: FrameType | None) -> str:
+    """Return a stack as a line of Brendan Gregg's folded stacks format.
+
+    Args:
+        frame: The innermost frame.
+
+    Returns:
+        The frames from the outermost, as `module:function`, joined by `;`.
+    """
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """Samples the stacks of some threads, for a flame graph.
+
+    A background thread looks at the stack of every thread being `track`ed
+    each `interval` seconds. `write` saves how often each stack was seen in
+    the folded format read by flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, interval: float = DEFAULT_PROFILE_INTERVAL) -> None:
+        """Set up the profiler, `start` starts sampling.
+
+        Args:
+            interval: Seconds between samples.
+        """
+        self.interval = interval
+        self.stacks: collections.Counter[str] = collections.Counter()
+        self._threads: collections.Counter[int] = collections.Counter()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Sample the current thread while in the context."""
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._threads[ident] -= 1
+                if not self._threads[ident]:
+                    del self._threads[ident]
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._stopped.clear()
+        self._sampler = threading.Thread(
+            target=self._sample,
+            name="tap-mysql-profiler",
+            daemon=True,
+        )
+        self._sampler.start()
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                idents = list(self._threads)
+            frames = sys._current_frames()  # noqa: SLF001
+            for ident in idents:
+                if (frame := frames.get(ident)) is not None:
+                    self.stacks[folded_stack(frame)] += 1
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stopped.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def write(self, path: str | os.PathLike) -> int:
+        """Write the samples in the folded stacks format.
+
+        Args:
+            path: File to write.
+
+        Returns:
+            The number of samples written.
+        """
+        with Path(path).open("w") as f:
+            f.writelines(
+                f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+            )
+        return sum(self.stacks.values())
@@ -0,0 +1,325 @@
+"""Policies for large BLOB, TEXT and JSON values, and their side files."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import posixpath
+import threading
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, Any, cast
+
+import sqlalchemy
+from singer_sdk.helpers._batch import StorageTarget
+from sqlalchemy.dialects import mysql
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    from sqlalchemy.sql.elements import ColumnElement
+
+# What is emitted for a large value.
+INLINE = "inline"  # the value itself
+TRUNCATE = "truncate"  # its first `lob_max_length` characters, or bytes
+HASH = "hash"  # its SHA-256, computed by the server
+FILE = "file"  # the URL of a side file holding it
+LOB_POLICIES = (INLINE, TRUNCATE, HASH, FILE)
+
+# Type names of the columns policies apply to.
+LOB_TYPES = frozenset(
+    {
+        "TINYBLOB",
+        "BLOB",
+        "MEDIUMBLOB",
+        "LONGBLOB",
+        "LARGEBINARY",
+        "TINYTEXT",
+        "TEXT",
+        "MEDIUMTEXT",
+        "LONGTEXT",
+        "JSON",
+    }
+)
+
+# Characters, or bytes, of a value read per query when writing side files.
+CHUNK_SIZE = 2**20
+
+
+def is_lob(column: sqlalchemy.Column) -> bool:
+    """Check whether a column holds large objects.
+
+    Args:
+        column: A table column.
+
+    Returns:
+        True for BLOB, TEXT and JSON columns, of any size.
+    """
+    return type(column.type).__name__.upper() in LOB_TYPES
+
+
+def column_policy(config: Mapping[str, Any], tap_stream_id: str, column: str) -> str:
+    """Return the policy for a large object column.
+
+    The column's entry in `lob_columns` comes first, from the stream's
+    `stream_options`, then tap-wide. Then the stream's `lob_policy`, then the
+    tap-wide one.
+
+    Args:
+        config: The tap's config.
+        tap_stream_id: The stream.
+        column: The column.
+
+    Returns:
+        One of `LOB_POLICIES`.
+
+    Raises:
+        ValueError: For an unknown policy.
+    """
+    overrides = (config.get("stream_options") or {}).get(tap_stream_id) or {}
+    policy = (
+        (overrides.get("lob_columns") or {}).get(column)
+        or (config.get("lob_columns") or {}).get(column)
+        or overrides.get("lob_policy")
+        or config.get("lob_policy")
+        or INLINE
+    )
+    if policy not in LOB_POLICIES:
+        msg = f"LOB policy must be one of {LOB_POLICIES}, not {policy!r}."
+        raise ValueError(msg)
+    return policy
+
+
+def is_json_schema(schema: Mapping[str, Any]) -> bool:
+    """Check whether a property's JSON schema is that of a JSON column.
+
+    Args:
+        schema: The property's JSON schema, as a dict.
+
+    Returns:
+        True if the property is typed as an object.
+    """
+    types = schema.get("type") or []
+    return "object" in ([types] if isinstance(types, str) else types)
+
+
+def as_utf8(column: sqlalchemy.Column) -> ColumnElement:
+    """Return a column's values as the bytes written to side files.
+
+    Args:
+        column: A large object column.
+
+    Returns:
+        BLOB columns as they are, TEXT and JSON columns as utf8mb4 text.
+    """
+    if "BLOB" in type(column.type).__name__.upper() or isinstance(
+        column.type, sqlalchemy.LargeBinary
+    ):
+        return column
+    return sqlalchemy.cast(column, mysql.CHAR(charset="utf8mb4"))
+
+
+def select_column(
+    column: sqlalchemy.Column,
+    policy: str,
+    *,
+    max_length: int,
+) -> ColumnElement:
+    """Return what to select of a large object column, under a policy.
+
+    Values are truncated and hashed by the server, so only what is emitted
+    crosses the network. Side files are named by a hash of the value, the
+    value itself is read by `LobStore`.
+
+    Args:
+        column: A large object column.
+        policy: One of `LOB_POLICIES`.
+        max_length: Characters, or bytes, kept by `TRUNCATE`.
+
+    Returns:
+        A column expression labeled with the column's name.
+    """
+    if policy == TRUNCATE:
+        # Truncated JSON is no longer JSON, it is kept as text.
+        type_ = (
+            sqlalchemy.String()
+            if isinstance(column.type, sqlalchemy.JSON)
+            else column.type
+        )
+        return sqlalchemy.func.substring(column, 1, max_length, type_=type_).label(
+            column.name
+        )
+    if policy == HASH:
+        return sqlalchemy.func.sha2(column, 256, type_=sqlalchemy.String()).label(
+            column.name
+        )
+    if policy == FILE:
+        return sqlalchemy.func.sha2(
+            as_utf8(column), 256, type_=sqlalchemy.String()
+        ).label(column.name)
+    return column
+
+
+def as_text(value: Any, *, is_json: bool) -> Any:  # noqa: ANN401
+    """Return a value read whole as the server would have it as text.
+
+    Args:
+        value: A large object, as decoded from the binlog.
+        is_json: Whether the value is that of a JSON column.
+
+    Returns:
+        JSON documents as MySQL writes them, other values as they are.
+    """
+    if is_json:
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def apply_policy(value: str | bytes, policy: str, *, max_length: int) -> str | bytes:
+    """Apply `TRUNCATE` or `HASH` to a value read whole.
+
+    The same as `select_column` has the server do, for values read from the
+    binlog.
+
+    Args:
+        value: The value, text as in `as_text`, or bytes.
+        policy: One of `LOB_POLICIES`, but `FILE`.
+        max_length: Characters, or bytes, kept by `TRUNCATE`.
+
+    Returns:
+        The value to emit.
+    """
+    if policy == TRUNCATE:
+        return value[:max_length]
+    if policy == HASH:
+        return hashlib.sha256(
+            value.encode() if isinstance(value, str) else value
+        ).hexdigest()
+    return value
+
+
+class LobStore:
+    """Writes large values to side files, named by their SHA-256.
+
+    Files are `<root>/<tap_stream_id>/<column>/<sha256>`, in any storage the
+    SDK's batch files can be written to. A value already stored, by an
+    earlier sync or another row, is not read again. Values are read and
+    written `CHUNK_SIZE` at a time, so a value is never held whole.
+
+    Safe to share between the threads reading a stream's partitions: a value
+    is written by one of them at a time.
+    """
+
+    def __init__(self, root: str, tap_stream_id: str) -> None:
+        """Open the storage.
+
+        Args:
+            root: Storage URL or directory, such as `s3://bucket/lobs`.
+            tap_stream_id: The stream whose values are stored.
+        """
+        self.tap_stream_id = tap_stream_id
+        self._exit_stack = ExitStack()
+        self._fs = self._exit_stack.enter_context(
+            StorageTarget.from_url(root).fs(create=True)
+        )
+        # URLs of the files known to be stored, by path.
+        self._stored: dict[str, str] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _path(self, column: str, digest: str) -> str:
+        return posixpath.join(self.tap_stream_id, column, digest)
+
+    def stored(self, column: str, digest: str) -> str | None:
+        """Return the URL of a value's side file, if it is already stored.
+
+        Args:
+            column: The value's column.
+            digest: The value's SHA-256.
+
+        Returns:
+            The URL, or None if the value is not stored.
+        """
+        path = self._path(column, digest)
+        if path not in self._stored and self._fs.exists(path):
+            self._stored[path] = self._fs.geturl(path)
+        return self._stored.get(path)
+
+    def put(
+        self,
+        column: str,
+        digest: str,
+        read_chunk: Callable[[int, int], bytes | str | None],
+    ) -> str | None:
+        """Store a value, unless it is already stored.
+
+        Args:
+            column: The value's column.
+            digest: The value's SHA-256, as selected by `select_column`.
+            read_chunk: Returns `size` characters, or bytes, of the value from
+                1-based `offset`, None if the row is gone.
+
+        Returns:
+            The URL of the side file, or None if the row is gone.
+        """
+        path = self._path(column, digest)
+        with self._locks_lock:
+            lock = self._locks.setdefault(path, threading.Lock())
+        with lock:
+            if (url := self.stored(column, digest)) is not None:
+                return url
+            return self._write(column, digest, read_chunk)
+
+    def put_value(self, column: str, value: str | bytes) -> str:
+        """Store a value read whole, unless it is already stored.
+
+        Args:
+            column: The value's column.
+            value: The value, text as in `as_text`, or bytes.
+
+        Returns:
+            The URL of the side file.
+        """
+        data = value.encode() if isinstance(value, str) else value
+        url = self.put(
+            column,
+            hashlib.sha256(data).hexdigest(),
+            lambda offset, size: data[offset - 1 : offset - 1 + size],
+        )
+        return cast("str", url)
+
+    def _write(
+        self,
+        column: str,
+        digest: str,
+        read_chunk: Callable[[int, int], bytes | str | None],
+    ) -> str | None:
+        chunk = read_chunk(1, CHUNK_SIZE)
+        if chunk is None:
+            return None
+        directory = posixpath.join(self.tap_stream_id, column)
+        path = posixpath.join(directory, digest)
+        self._fs.makedirs(directory, recreate=True)
+        written = hashlib.sha256()
+        offset = 1
+        with self._fs.open(path, "wb") as f:
+            while chunk:
+                data = chunk.encode() if isinstance(chunk, str) else chunk
+                f.write(data)
+                written.update(data)
+                if len(chunk) < CHUNK_SIZE:
+                    break
+                offset += CHUNK_SIZE
+                chunk = read_chunk(offset, CHUNK_SIZE)
+
+        if written.hexdigest() != digest:
+            # The value changed since its row was read: name it by what was
+            # written.
+            actual = posixpath.join(directory, written.hexdigest())
+            self._fs.move(path, actual, overwrite=True)
+            path = actual
+        self._stored[path] = self._fs.geturl(path)
+        return self._stored[path]
+
+    def close(self) -> None:
+        """Close the storage."""
+        self._exit_stack.close()
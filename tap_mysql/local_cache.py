@@ -0,0 +1,99 @@
+"""Small JSON files kept between runs of the tap."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import os
+
+
+def read_json(path: str | os.PathLike) -> Any:  # noqa: ANN401
+    """Read a JSON file.
+
+    Args:
+        path: The file.
+
+    Returns:
+        The file's content, or None if it is missing or not valid JSON.
+    """
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: str | os.PathLike, data: Any) -> None:  # noqa: ANN401
+    """Replace a JSON file in one step, so readers never see a partial file.
+
+    Args:
+        path: The file, created with its parent directories if missing.
+        data: The content.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        dir=path.parent,
+        prefix=f".{path.name}.",
+        delete=False,
+    ) as f:
+        json.dump(data, f)
+    Path(f.name).replace(path)
+
+
+class ProbeCache:
+    """Results of probing servers, kept in a JSON file for a while.
+
+    Saves a query to the server on every start of the tap, for facts about it
+    that seldom change.
+    """
+
+    def __init__(self, path: str | os.PathLike, ttl: float) -> None:
+        """Set the cache's file and lifetime.
+
+        Args:
+            path: The cache file.
+            ttl: Seconds a result is used for before probing again.
+        """
+        self.path = path
+        self.ttl = ttl
+
+    def _entries(self, now: float) -> dict[str, dict]:
+        data = read_json(self.path)
+        if not isinstance(data, dict):
+            return {}
+        return {
+            key: entry
+            for key, entry in data.items()
+            if isinstance(entry, dict) and now - entry.get("probed_at", 0) < self.ttl
+        }
+
+    def get(self, key: str) -> Any:  # noqa: ANN401
+        """Return the cached result of a probe, if it has not expired.
+
+        Args:
+            key: The probe and server, for example `is_vitess:db.example.com:3306`.
+
+        Returns:
+            The result, or None if there is none or it expired.
+        """
+        entry = self._entries(time.time()).get(key)
+        return None if entry is None else entry.get("value")
+
+    def set(self, key: str, value: Any) -> None:  # noqa: ANN401
+        """Cache the result of a probe, and drop expired results.
+
+        Args:
+            key: The probe and server.
+            value: The result, JSON serializable.
+        """
+        now = time.time()
+        entries = self._entries(now)
+        entries[key] = {"value": value, "probed_at": now}
+        write_json(self.path, entries)
@@ -0,0 +1,205 @@
+"""Fast JSON encoding of Singer messages, and a buffered stdout sink."""
+
+from __future__ import annotations
+
+import datetime
+import decimal
+import importlib
+import sys
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Libraries messages can be encoded with.
+SIMPLEJSON = "simplejson"  # the Singer SDK's own encoding
+ORJSON = "orjson"
+MSGSPEC = "msgspec"
+JSON_ENCODERS = (SIMPLEJSON, ORJSON, MSGSPEC)
+
+
+def encode_default(value: Any) -> Any:  # noqa: ANN401
+    """Return what to encode for a value the encoders have no JSON for.
+
+    The same as the Singer SDK's encoding, but for bytes, which are written as
+    hex like binary columns are when records are conformed.
+
+    Args:
+        value: The value.
+
+    Returns:
+        A JSON-able value.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep="T")
+    return str(value)
+
+
+def _orjson_encoder() -> Callable[[Any], bytes]:
+    orjson = importlib.import_module("orjson")
+    # Decimals are written as numbers, as they are, by orjson 3.9 and later.
+    fragment = getattr(orjson, "Fragment", None)
+
+    def default(value: Any) -> Any:  # noqa: ANN401
+        if isinstance(value, decimal.Decimal):
+            if fragment is None:
+                msg = "Decimals need orjson 3.9 or later."
+                raise TypeError(msg)
+            return fragment(str(value))
+        return encode_default(value)
+
+    def encode(obj: Any) -> bytes:  # noqa: ANN401
+        return orjson.dumps(obj, default=default, option=orjson.OPT_APPEND_NEWLINE)
+
+    return encode
+
+
+def _msgspec_encoder() -> Callable[[Any], bytes]:
+    msgspec = importlib.import_module("msgspec")
+    try:
+        encoder = msgspec.json.Encoder(
+            enc_hook=encode_default,
+            decimal_format="number",
+        )
+    except TypeError as e:
+        msg = "The msgspec JSON encoder needs msgspec 0.18 or later."
+        raise ValueError(msg) from e
+
+    def encode(obj: Any) -> bytes:  # noqa: ANN401
+        try:
+            return encoder.encode(obj) + b"\n"
+        except (msgspec.EncodeError, OverflowError) as e:
+            raise TypeError(str(e)) from e
+
+    return encode
+
+
+def json_encoder(name: str) -> Callable[[Any], bytes] | None:
+    """Return a function encoding messages as JSON lines.
+
+    Encoded messages have the same keys, in the same order, and the same
+    values as the Singer SDK's: decimals are numbers, written as they are, and
+    dates, times and datetimes are ISO 8601 strings. Output may differ from
+    the SDK's byte for byte, but not as JSON: text is written as UTF-8 rather
+    than escaped to ASCII, and msgspec writes UTC datetimes with a `Z`.
+
+    The function raises TypeError for what it cannot encode, such as integers
+    over 64 bits or, with orjson before 3.9, decimals. Such messages are left
+    to the SDK.
+
+    Args:
+        name: One of `JSON_ENCODERS`.
+
+    Returns:
+        A function of a message's dict to its line, with the trailing newline.
+        None for `SIMPLEJSON`, messages are encoded by the Singer SDK.
+
+    Raises:
+        ValueError: For an unknown encoder, or one that is not installed.
+    """
+    if name == SIMPLEJSON:
+        return None
+    if name not in JSON_ENCODERS:
+        msg = f"JSON encoder must be one of {JSON_ENCODERS}, not {name!r}."
+        raise ValueError(msg)
+    try:
+        return _orjson_encoder() if name == ORJSON else _msgspec_encoder()
+    except ImportError as e:
+        msg = f"The {name} JSON encoder needs {name} (`pip install {name}`)."
+        raise ValueError(msg) from e
+
+
+def write_stdout(data: bytes) -> None:
+    """Write encoded lines to stdout, and flush it.
+
+    Args:
+        data: UTF-8 encoded lines.
+    """
+    stdout = sys.stdout
+    binary = getattr(stdout, "buffer", None)
+    if binary is None:
+        # Such as a StringIO, when stdout is captured.
+        stdout.write(data.decode())
+        stdout.flush()
+        return
+    # Whatever was written as text goes first.
+    stdout.flush()
+    binary.write(data)
+    binary.flush()
+
+
+class OutputSink:
+    """Writes messages to stdout, a buffer at a time.
+
+    Lines are held until `flush_bytes` of them, or `flush_records` of them, are
+    held, or `flush_seconds` have passed since the last flush, whichever comes
+    first. The time is checked as lines are written. Without any of these,
+    each line is written and flushed as it comes, as by the Singer SDK.
+
+    Not thread-safe: writers hold the tap's `sync_lock`.
+    """
+
+    def __init__(
+        self,
+        *,
+        flush_bytes: int | None = None,
+        flush_records: int | None = None,
+        flush_seconds: float | None = None,
+    ) -> None:
+        """Create a sink.
+
+        Args:
+            flush_bytes: Bytes held before they are written.
+            flush_records: Lines held before they are written.
+            flush_seconds: Seconds a line is held for, at most, if another is
+                written after it.
+        """
+        self.flush_bytes = flush_bytes
+        self.flush_records = flush_records
+        self.flush_seconds = flush_seconds
+        self._lines: list[bytes] = []
+        self._size = 0
+        self._flushed = time.monotonic()
+
+    @property
+    def buffered(self) -> bool:
+        """Whether lines are held before they are written."""
+        return (
+            self.flush_bytes is not None
+            or self.flush_records is not None
+            or self.flush_seconds is not None
+        )
+
+    def write(self, line: bytes) -> None:
+        """Write a line, or hold it until the next flush.
+
+        Args:
+            line: An encoded message, with its trailing newline.
+        """
+        if not self.buffered:
+            write_stdout(line)
+            return
+        self._lines.append(line)
+        self._size += len(line)
+        if (
+            (self.flush_bytes is not None and self._size >= self.flush_bytes)
+            or (
+                self.flush_records is not None
+                and len(self._lines) >= self.flush_records
+            )
+            or (
+                self.flush_seconds is not None
+                and time.monotonic() - self._flushed >= self.flush_seconds
+            )
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write out the lines held."""
+        lines, self._lines, self._size = self._lines, [], 0
+        self._flushed = time.monotonic()
+        if lines:
+            write_stdout(b"".join(lines))
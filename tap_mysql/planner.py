@@ -0,0 +1,163 @@
+"""Extraction planning: how each stream would be read, without reading it."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import sqlalchemy
+    from sqlalchemy.engine import Connection
+
+# How `MySQLStream.get_records` reads a stream.
+SINGLE_SCAN = "single_scan"  # one query
+KEYSET_CHUNKS = "keyset_chunks"  # `incremental_chunk_size` or `full_table_chunk_size`
+PARALLEL_RANGES = "parallel_ranges"  # `partition_count`
+BINLOG = "binlog"  # LOG_BASED
+
+# Tables of fewer estimated rows are recommended to be read in one query.
+SMALL_TABLE_ROWS = 1_000_000
+
+
+def explain(conn: Connection, query: sqlalchemy.Select) -> list[dict[str, Any]]:
+    """Return MySQL's plan of a query, without running it.
+
+    Args:
+        conn: An open connection.
+        query: The select statement.
+
+    Returns:
+        The rows of `EXPLAIN`, as dicts of `table`, `type`, `key`, `rows`,
+        `Extra` and so on.
+    """
+    compiled = query.compile(dialect=conn.dialect)
+    params: Any = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup or ())
+    result = conn.exec_driver_sql(f"EXPLAIN {compiled}", params)
+    return [dict(row) for row in result.mappings()]
+
+
+def summarize_plan(
+    *,
+    strategy: str,
+    explained: list[list[dict[str, Any]]],
+    indexes: dict[str, str],
+    replication_key: str | None = None,
+    partition_key: str | None = None,
+) -> dict[str, Any]:
+    """Sum up the plans of a stream's queries, and check its keys are indexed.
+
+    Args:
+        strategy: How the stream is read.
+        explained: The `explain` rows of each query the stream runs.
+        indexes: Index names by first column, from `leading_index_columns`.
+        replication_key: The stream's replication key, if it has one.
+        partition_key: The stream's partition key, if it is partitioned.
+
+    Returns:
+        The `strategy`, the `expected_rows` MySQL estimates it reads over all
+        the queries, the `index` and `access` type of the first query, the
+        indexes of the replication and partition keys, and `warnings`.
+    """
+    plans = [rows[0] for rows in explained if rows]
+    warnings = []
+    if replication_key and replication_key not in indexes:
+        warnings.append(
+            f"No index starts with the replication key `{replication_key}`: "
+            "every sync reads the whole table."
+        )
+    if partition_key and partition_key not in indexes:
+        warnings.append(
+            f"No index starts with the partition key `{partition_key}`: "
+            "every range reads the whole table."
+        )
+    if any("filesort" in (plan.get("Extra") or "") for plan in plans):
+        warnings.append("MySQL sorts the rows with a filesort.")
+    if strategy == KEYSET_CHUNKS and any(plan.get("type") == "ALL" for plan in plans):
+        warnings.append("Every chunk reads the whole table.")
+    return {
+        "strategy": strategy,
+        "expected_rows": sum(int(plan.get("rows") or 0) for plan in plans)
+        if plans
+        else None,
+        "index": plans[0].get("key") if plans else None,
+        "access": plans[0].get("type") if plans else None,
+        "replication_key_index": indexes.get(replication_key)
+        if replication_key
+        else None,
+        "partition_key_index": indexes.get(partition_key) if partition_key else None,
+        "warnings": warnings,
+    }
+
+
+def recommend_strategy(  # noqa: PLR0913
+    *,
+    replication_method: str | None,
+    estimated_rows: int | None,
+    indexes: dict[str, str],
+    primary_keys: Sequence[str] = (),
+    replication_key: str | None = None,
+    partition_key: str | None = None,
+) -> tuple[str, str]:
+    """Recommend how to read a stream, from the size and indexes of its table.
+
+    Tables under `SMALL_TABLE_ROWS` are read in one query. Larger FULL_TABLE
+    ones in ranges of an indexed partition key read in parallel, else in
+    keyset chunks of the primary key, and larger INCREMENTAL ones in pages of
+    an indexed replication key. A table without such an index is read in one
+    query, as chunks of it would each read the whole table.
+
+    Args:
+        replication_method: The stream's replication method.
+        estimated_rows: The table's estimated row count, None if unknown.
+        indexes: Index names by first column, from `leading_index_columns`.
+        primary_keys: The stream's primary key columns.
+        replication_key: The stream's replication key, if it has one.
+        partition_key: The column the stream can be partitioned by, an
+            integer, date or datetime key, if it has one.
+
+    Returns:
+        The recommended strategy, and the reason for it.
+    """
+    rows = f"About {estimated_rows} rows"
+    if replication_method == "LOG_BASED":
+        strategy = BINLOG
+        reason = "Changes are read from the binlog, after a first copy."
+    elif estimated_rows is None:
+        strategy = SINGLE_SCAN
+        reason = "The table's size is unknown, it is read in one query."
+    elif estimated_rows < SMALL_TABLE_ROWS:
+        strategy = SINGLE_SCAN
+        reason = f"{rows}, few enough to read in one query."
+    elif replication_method == "INCREMENTAL":
+        if replication_key and replication_key in indexes:
+            strategy = KEYSET_CHUNKS
+            reason = (
+                f"{rows}: read them in pages of the indexed replication key "
+                f"`{replication_key}` with `incremental_chunk_size`, so an "
+                "interrupted sync resumes."
+            )
+        else:
+            strategy = SINGLE_SCAN
+            reason = (
+                f"{rows}, but without an index starting with the replication "
+                f"key `{replication_key}` every page would read the whole table."
+            )
+    elif partition_key and partition_key in indexes:
+        strategy = PARALLEL_RANGES
+        reason = (
+            f"{rows}: read ranges of the indexed key `{partition_key}` in "
+            "parallel with `partition_count`."
+        )
+    elif primary_keys and primary_keys[0] in indexes:
+        strategy = KEYSET_CHUNKS
+        reason = (
+            f"{rows}: read them in chunks of the primary key with "
+            "`full_table_chunk_size`, so an interrupted sync resumes."
+        )
+    else:
+        strategy = SINGLE_SCAN
+        reason = f"{rows}, but no indexed key to split them by."
+    return strategy, reason
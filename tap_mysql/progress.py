@@ -0,0 +1,120 @@
+"""Progress of reading a stream: rows per second, and time left."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from singer_sdk.metrics import DEFAULT_LOG_INTERVAL
+
+if TYPE_CHECKING:
+    import logging
+
+
+def format_duration(seconds: float) -> str:
+    """Return a duration as `1h02m`, `3m04s` or `5s`.
+
+    Args:
+        seconds: The duration.
+
+    Returns:
+        The duration, to the second under an hour, to the minute above.
+    """
+    seconds = max(0, round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
+
+
+class ReadProgress:
+    """Counts the rows read of a stream, and logs how fast now and then.
+
+    With an estimate of the rows to read, the log also has the share read so
+    far, and the time left at the rate so far. Rows may be counted from
+    several threads, as partitions are read.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        stream_name: str,
+        estimated_rows: int | None = None,
+        *,
+        interval: float = DEFAULT_LOG_INTERVAL,
+    ) -> None:
+        """Start counting.
+
+        Args:
+            logger: Where to log progress.
+            stream_name: The stream being read.
+            estimated_rows: The rows the stream should have, if known.
+            interval: Seconds between progress logs.
+        """
+        self.logger = logger
+        self.stream_name = stream_name
+        self.estimated_rows = estimated_rows or None
+        self.interval = interval
+        self.rows = 0
+        self._start = self._logged = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, rows: int) -> None:
+        """Count rows read, and log progress if it is time to.
+
+        Args:
+            rows: Number of rows read.
+        """
+        with self._lock:
+            self.rows += rows
+            now = time.monotonic()
+            if now - self._logged < self.interval:
+                return
+            self._logged = now
+            message = self.message(now)
+        self.logger.info(message)
+
+    def message(self, now: float | None = None) -> str:
+        """Describe the progress so far.
+
+        Args:
+            now: The `time.monotonic` time, by default the current one.
+
+        Returns:
+            The rows read, the rate, and with an estimate the share read and
+            time left, as "Read 250,000 of ~1,000,000 rows of 'melty-orders'
+            (25.0%), 5,000 rows/s, ~2m30s left."
+        """
+        elapsed = (time.monotonic() if now is None else now) - self._start
+        rate = self.rows / elapsed if elapsed > 0 else 0.0
+        if self.estimated_rows is None:
+            return (
+                f"Read {self.rows:,} rows of '{self.stream_name}', {rate:,.0f} rows/s."
+            )
+        read = (
+            f"Read {self.rows:,} of ~{self.estimated_rows:,} rows of "
+            f"'{self.stream_name}' ({self.rows / self.estimated_rows:.1%}), "
+            f"{rate:,.0f} rows/s"
+        )
+        if self.rows >= self.estimated_rows:
+            return f"{read}, past the estimate."
+        if not rate:
+            return f"{read}."
+        left = (self.estimated_rows - self.rows) / rate
+        return f"{read}, ~{format_duration(left)} left."
+
+    def finish(self) -> None:
+        """Log the rows read in all, and how fast."""
+        elapsed = time.monotonic() - self._start
+        rate = self.rows / elapsed if elapsed > 0 else 0.0
+        self.logger.info(
+            "Read %s rows of '%s' in %s, %s rows/s.",
+            f"{self.rows:,}",
+            self.stream_name,
+            format_duration(elapsed),
+            f"{rate:,.0f}",
+        )
@@ -0,0 +1,201 @@
+"""Consistent snapshots shared by several connections, as mydumper takes them."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager, suppress
+from typing import TYPE_CHECKING, Any
+
+from tap_mysql.binlog import binlog_position
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from sqlalchemy.engine import Connection, Engine
+
+# How the snapshot's connections are made to start at the same point.
+FLUSH_TABLES = "flush_tables"  # under FLUSH TABLES WITH READ LOCK
+NO_LOCK = "none"  # at a moment the binlog position holds still
+SNAPSHOT_LOCKS = (FLUSH_TABLES, NO_LOCK)
+
+# Only REPEATABLE READ transactions keep reading from their snapshot.
+ISOLATION_LEVEL = "REPEATABLE READ"
+START_SNAPSHOT = "START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY"
+
+# Tries, and seconds between them, to find a moment without commits.
+ATTEMPTS = 10
+RETRY_DELAY = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+class ConsistentSnapshot:
+    """Connections that all read the database as of one point in time.
+
+    Each connection has a `START TRANSACTION WITH CONSISTENT SNAPSHOT` open
+    from `open` to `close`, all started at a moment when no transaction
+    commits, so they see the same data. `position` is the binlog position
+    of that moment, where change capture can start from.
+
+    With `FLUSH_TABLES`, writes are held off by `FLUSH TABLES WITH READ
+    LOCK` while the transactions start, which needs the RELOAD privilege.
+    With `NO_LOCK`, they are started again until the binlog position is the
+    same before and after. A commit in flight right then could still be
+    seen by some connections and not others.
+    """
+
+    def __init__(self, engine: Engine, size: int, *, lock: str = FLUSH_TABLES) -> None:
+        """Set up the snapshot, `open` takes it.
+
+        Args:
+            engine: Engine to connect with.
+            size: Number of connections, as many as read at the same time.
+            lock: `FLUSH_TABLES` or `NO_LOCK`.
+
+        Raises:
+            ValueError: If `lock` is not one of `SNAPSHOT_LOCKS`.
+        """
+        if lock not in SNAPSHOT_LOCKS:
+            msg = f"Snapshot lock must be one of {SNAPSHOT_LOCKS}, not {lock!r}."
+            raise ValueError(msg)
+        self.engine = engine
+        self.size = max(1, size)
+        self.lock = lock
+        self.position: dict[str, Any] | None = None
+        self._idle: list[Connection] = []
+        self._live = 0
+        self._closed = False
+        self._available = threading.Condition()
+
+    def _start(self) -> list[Connection]:
+        # Open every connection and start its snapshot, or none of them.
+        connections: list[Connection] = []
+        try:
+            for _ in range(self.size):
+                conn = self.engine.connect()
+                connections.append(conn)
+                conn.execution_options(isolation_level=ISOLATION_LEVEL)
+                conn.exec_driver_sql(START_SNAPSHOT)
+        except BaseException:
+            self._discard(connections)
+            raise
+        return connections
+
+    @staticmethod
+    def _discard(connections: list[Connection]) -> None:
+        for conn in connections:
+            # Invalidated rather than returned to the pool: a result may be
+            # left half read.
+            with suppress(Exception):
+                conn.invalidate()
+            conn.close()
+
+    def open(self) -> None:
+        """Start the snapshot on every connection, and record its position.
+
+        Raises:
+            RuntimeError: If the binlog position never held still.
+            ValueError: With `NO_LOCK` and several connections, if binary
+                logging is disabled, so the snapshots can not be checked.
+        """
+        with self.engine.connect() as control:
+            if self.lock == FLUSH_TABLES:
+                # Closes open tables first, so the lock waits less on them.
+                control.exec_driver_sql("FLUSH NO_WRITE_TO_BINLOG TABLES")
+                control.exec_driver_sql("FLUSH TABLES WITH READ LOCK")
+                try:
+                    connections = self._start()
+                    position = binlog_position(control)
+                finally:
+                    control.exec_driver_sql("UNLOCK TABLES")
+            else:
+                connections, position = self._start_without_lock(control)
+        self.position = position
+        with self._available:
+            self._idle = connections
+            self._live = len(connections)
+        logger.info(
+            "Opened a consistent snapshot on %d connections at %s.",
+            len(connections),
+            position or "no binlog position (binary logging is disabled)",
+        )
+
+    def _start_without_lock(
+        self,
+        control: Connection,
+    ) -> tuple[list[Connection], dict[str, Any] | None]:
+        for attempt in range(ATTEMPTS):
+            before = binlog_position(control)
+            if before is None and self.size > 1:
+                msg = (
+                    "A consistent snapshot without a lock needs binary logging "
+                    "enabled, or a single connection."
+                )
+                raise ValueError(msg)
+            connections = self._start()
+            after = binlog_position(control)
+            if before == after:
+                return connections, after
+            self._discard(connections)
+            logger.info(
+                "Transactions committed while the snapshot started, retrying "
+                "(attempt %d of %d).",
+                attempt + 1,
+                ATTEMPTS,
+            )
+            time.sleep(RETRY_DELAY)
+        msg = (
+            f"Could not start a consistent snapshot in {ATTEMPTS} attempts, "
+            "the server never stopped committing. Use the flush_tables lock."
+        )
+        raise RuntimeError(msg)
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        """Borrow one of the snapshot's connections, waiting for one if need be.
+
+        A connection given back by an exception, such as a generator closed
+        half way through a result, is closed: its snapshot can not be taken
+        again.
+
+        Yields:
+            A connection with the snapshot's transaction open.
+
+        Raises:
+            RuntimeError: If the snapshot lost all its connections.
+        """
+        with self._available:
+            while not self._idle:
+                if self._live == 0:
+                    msg = "The consistent snapshot has no connections left."
+                    raise RuntimeError(msg)
+                self._available.wait()
+            conn = self._idle.pop()
+        try:
+            yield conn
+        except BaseException:
+            self._discard([conn])
+            with self._available:
+                self._live = max(0, self._live - 1)
+                self._available.notify_all()
+            raise
+        with self._available:
+            if self._closed:
+                self._discard([conn])
+                return
+            self._idle.append(conn)
+            self._available.notify()
+
+    def close(self) -> None:
+        """End the snapshot's transactions, and close its connections."""
+        with self._available:
+            self._closed = True
+            connections, self._idle = self._idle, []
+            self._live = 0
+            self._available.notify_all()
+        for conn in connections:
+            with suppress(Exception):
+                conn.rollback()
+            conn.close()
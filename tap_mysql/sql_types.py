@@ -0,0 +1,93 @@
+"""Resolution of MySQL column types, memoized by type name.
+
+Discovery resolves the same few type names for every column of every table,
+so each distinct name is parsed and looked up once.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+import sqlalchemy
+from singer_sdk import typing as th
+from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects.mysql.reflection import ReflectedState
+
+if TYPE_CHECKING:
+    JSONSchemaType = (
+        th.DateTimeType
+        | th.NumberType
+        | th.IntegerType
+        | th.DateType
+        | th.StringType
+        | th.BooleanType
+    )
+
+# Distinct type names kept. Types with parameters (`varchar(97)`) make for a
+# few hundred in large schemas.
+CACHE_SIZE = 4096
+
+# NOTE: This is an ordered mapping, with earlier mappings taking precedence.
+# If the SQL-provided type contains the type name on the left, the mapping
+# will return the respective singer type.
+SQLTYPE_LOOKUP: tuple[tuple[str, JSONSchemaType], ...] = (
+    ("timestamp", th.DateTimeType()),
+    ("datetime", th.DateTimeType()),
+    ("date", th.DateType()),
+    ("int", th.IntegerType()),
+    ("numeric", th.NumberType()),
+    ("decimal", th.NumberType()),
+    ("double", th.NumberType()),
+    ("float", th.NumberType()),
+    ("string", th.StringType()),
+    ("text", th.StringType()),
+    ("char", th.StringType()),
+    ("bool", th.BooleanType()),
+    ("variant", th.StringType()),
+    ("bit", th.IntegerType()),
+)
+DEFAULT_TYPE = th.StringType()  # safe failover to str
+
+# Parses column definitions as the MySQL dialect reflects them.
+_PARSER = mysql.dialect()._tabledef_parser  # type: ignore[attr-defined]  # noqa: SLF001
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def sdk_type_for_name(type_name: str) -> JSONSchemaType:
+    """Return the singer type of a SQL type name.
+
+    The returned object is shared, its `type_dict` is a new dict on each call.
+
+    Args:
+        type_name: A SQL type, such as `decimal(25,4)`, or the name of a
+            SQLAlchemy type class, such as `DECIMAL`.
+
+    Returns:
+        The singer type of the first type name in `SQLTYPE_LOOKUP` found in
+        `type_name`, else a string type.
+    """
+    type_name = type_name.lower()
+    for sqltype, jsonschema_type in SQLTYPE_LOOKUP:
+        if sqltype in type_name:
+            return jsonschema_type
+    return DEFAULT_TYPE
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_column_type(column_type: str) -> sqlalchemy.types.TypeEngine:
+    """Return the SQLAlchemy type of a column type, as the MySQL dialect reflects it.
+
+    The returned type object is shared by all columns of the same type.
+
+    Args:
+        column_type: The column type, as in information_schema `COLUMN_TYPE`
+            or SHOW COLUMNS, for example `decimal(25,4) unsigned`.
+
+    Returns:
+        The SQLAlchemy type, `NullType` if it is not known.
+    """
+    # Parse the type as in a SHOW CREATE TABLE column definition.
+    state = ReflectedState()
+    _PARSER._parse_column(f"  `c` {column_type},", state)  # noqa: SLF001
+    return state.columns[0]["type"] if state.columns else sqlalchemy.types.NULLTYPE
@@ -0,0 +1,184 @@
+"""A local port forwarded through SSH, tuned for bulk transfers."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import socket
+import threading
+from contextlib import suppress
+from typing import TYPE_CHECKING
+
+import paramiko
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# Flow control window and largest SSH packet of each forwarded connection.
+# paramiko defaults to 2 MiB and 32 KiB, which caps a connection at one
+# window per round trip, about 20 MB/s with a 100 ms round trip.
+DEFAULT_WINDOW_SIZE = 2**24
+DEFAULT_MAX_PACKET_SIZE = 2**17
+
+# Bytes copied per read between the local socket and its SSH channel.
+BUFFER_SIZE = 2**18
+
+# Seconds to wait to connect, or to open a channel.
+TIMEOUT = 10.0
+
+logger = logging.getLogger(__name__)
+
+
+def _copy(
+    source: socket.socket | paramiko.Channel, sink: socket.socket | paramiko.Channel
+) -> None:
+    # Copy until end of file, then pass it on.
+    with suppress(OSError, EOFError):
+        while data := source.recv(BUFFER_SIZE):
+            sink.sendall(data)
+    with suppress(OSError, EOFError):
+        sink.shutdown(socket.SHUT_WR)
+
+
+def _forward(client: socket.socket, channel: paramiko.Channel) -> None:
+    downstream = threading.Thread(target=_copy, args=(channel, client), daemon=True)
+    downstream.start()
+    _copy(client, channel)
+    downstream.join()
+    channel.close()
+    client.close()
+
+
+class SSHTunnel:
+    """Forwards a local port to a remote address, through SSH.
+
+    Does what `sshtunnel.SSHTunnelForwarder` does, faster: each forwarded
+    connection is copied by two threads in large reads, rather than 1 KiB at a
+    time in a `select` loop, with a larger flow control window. Connections
+    are spread over several SSH connections, each with its own encryption
+    thread, so concurrent reads are not limited to one CPU core.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        ssh_address: tuple[str, int],
+        username: str,
+        remote_address: tuple[str, int],
+        *,
+        pkey: paramiko.PKey | None = None,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        max_packet_size: int = DEFAULT_MAX_PACKET_SIZE,
+        keepalive: int = 5,
+        ciphers: Sequence[str] = (),
+        connections: int = 1,
+    ) -> None:
+        """Set up the tunnel, `start` opens it.
+
+        Args:
+            ssh_address: Host and port of the SSH server.
+            username: User to log in as.
+            remote_address: Host and port to forward to, as seen by the SSH
+                server.
+            pkey: Private key to log in with.
+            window_size: Flow control window of each forwarded connection.
+            max_packet_size: Largest SSH packet the server may send.
+            keepalive: Seconds between keepalive messages, 0 for none.
+            ciphers: Ciphers to prefer, in order. Other ciphers both sides
+                support are used if the server supports none of these.
+            connections: Number of SSH connections to spread forwarded
+                connections over.
+        """
+        self.ssh_address = ssh_address
+        self.username = username
+        self.remote_address = remote_address
+        self.pkey = pkey
+        self.window_size = window_size
+        self.max_packet_size = max_packet_size
+        self.keepalive = keepalive
+        self.ciphers = tuple(ciphers)
+        self.connections = max(1, connections)
+        self.local_bind_host = "127.0.0.1"
+        self.local_bind_port = 0
+        self._transports: list[paramiko.Transport] = []
+        self._lock = threading.Lock()
+        self._next = itertools.cycle(range(self.connections))
+        self._listener: socket.socket | None = None
+
+    def _connect(self) -> paramiko.Transport:
+        sock = socket.create_connection(self.ssh_address, timeout=TIMEOUT)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        transport = paramiko.Transport(
+            sock,
+            default_window_size=self.window_size,
+            default_max_packet_size=self.max_packet_size,
+        )
+        if self.ciphers:
+            options = transport.get_security_options()
+            supported = options.ciphers
+            preferred = [cipher for cipher in self.ciphers if cipher in supported]
+            if not preferred:
+                transport.close()
+                msg = f"None of the ciphers {self.ciphers} is supported."
+                raise ValueError(msg)
+            options.ciphers = (
+                *preferred,
+                *(cipher for cipher in supported if cipher not in preferred),
+            )
+        transport.connect(username=self.username, pkey=self.pkey)
+        transport.set_keepalive(self.keepalive)
+        return transport
+
+    def _transport(self) -> paramiko.Transport:
+        # The next SSH connection in turn, reconnected if it dropped.
+        with self._lock:
+            index = next(self._next)
+            if not self._transports[index].is_active():
+                self._transports[index] = self._connect()
+            return self._transports[index]
+
+    def _serve(self, listener: socket.socket) -> None:
+        while True:
+            try:
+                client, peer = listener.accept()
+            except OSError:  # closed by `stop`
+                return
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            try:
+                channel = self._transport().open_channel(
+                    "direct-tcpip",
+                    self.remote_address,
+                    peer,
+                    timeout=TIMEOUT,
+                )
+            except (paramiko.SSHException, OSError, ValueError) as e:
+                logger.warning("Could not open an SSH channel: %s", e)
+                client.close()
+                continue
+            threading.Thread(
+                target=_forward,
+                args=(client, channel),
+                daemon=True,
+            ).start()
+
+    def start(self) -> None:
+        """Connect to the SSH server, and listen on `local_bind_port`."""
+        self._transports = [self._connect() for _ in range(self.connections)]
+        self._listener = socket.create_server((self.local_bind_host, 0))
+        self.local_bind_port = self._listener.getsockname()[1]
+        threading.Thread(
+            target=self._serve,
+            args=(self._listener,),
+            daemon=True,
+        ).start()
+
+    def stop(self) -> None:
+        """Stop listening, and close the SSH connections."""
+        if self._listener is not None:
+            # Wakes up the `accept` of `_serve`, closing alone does not.
+            with suppress(OSError):
+                self._listener.shutdown(socket.SHUT_RDWR)
+            self._listener.close()
+            self._listener = None
+        for transport in self._transports:
+            transport.close()
+        self._transports = []
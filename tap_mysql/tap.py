@@ -3,23 +3,60 @@
 from __future__ import annotations
 
 import atexit
+import importlib
 import io
+import json
 import signal
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import cached_property
 from typing import TYPE_CHECKING, Any, cast
 
-import paramiko
+import click
 from singer_sdk import SQLTap, Stream
 from singer_sdk import typing as th  # JSON schema typing helpers
+from singer_sdk._singerlib import CatalogEntry, Message, Schema, StateMessage
+from singer_sdk.metrics import DEFAULT_LOG_INTERVAL
 from sqlalchemy.engine import URL
 from sqlalchemy.engine.url import make_url
-from sshtunnel import SSHTunnelForwarder
 
-from tap_mysql.client import MySQLConnector, MySQLStream
+from tap_mysql.batch import import_parquet
+from tap_mysql.client import MySQLConnector, MySQLLogBasedStream, MySQLStream
+from tap_mysql.instrumentation import DEFAULT_PROFILE_INTERVAL, SyncMetrics
+from tap_mysql.lobs import INLINE, LOB_POLICIES, column_policy, is_json_schema
+from tap_mysql.output import (
+    JSON_ENCODERS,
+    ORJSON,
+    SIMPLEJSON,
+    OutputSink,
+    json_encoder,
+)
+from tap_mysql.snapshot import FLUSH_TABLES, SNAPSHOT_LOCKS, ConsistentSnapshot
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Callable, Mapping
+
+    import paramiko
+    from sshtunnel import SSHTunnelForwarder
+
+    from tap_mysql.ssh import SSHTunnel
+
+
+def is_log_based(catalog_entry: CatalogEntry) -> bool:
+    """Check whether a catalog entry uses LOG_BASED replication.
+
+    Args:
+        catalog_entry: The stream's catalog entry.
+
+    Returns:
+        True if the stream should be read from the binlog.
+    """
+    replication_method = (
+        catalog_entry.replication_method
+        or catalog_entry.metadata.root.forced_replication_method
+    )
+    return replication_method == "LOG_BASED"
 
 
 class TapMySQL(SQLTap):
@@ -38,6 +75,9 @@ class TapMySQL(SQLTap):
         Should use JSON Schema instead
         See https://github.com/meltano/sdk/pull/1525
         """
+        # Held while writing a message or changing state, so streams synced
+        # concurrently never interleave output or emit a half-updated state.
+        self.sync_lock = threading.RLock()
         super().__init__(*args, **kwargs)
         sql_alchemy_url_exists = self.config.get("sqlalchemy_url") is not None
         individual_url_params_exist = all(
@@ -106,6 +146,35 @@ class TapMySQL(SQLTap):
                 "below. Note if sqlalchemy_url is set this will be ignored."
             ),
         ),
+        th.Property(
+            "driver",
+            th.StringType,
+            default="pymysql",
+            allowed_values=["pymysql", "mysqldb"],
+            description=(
+                "DBAPI driver: `pymysql`, or `mysqldb` for mysqlclient, which "
+                "needs the `binary` extra. Note if sqlalchemy_url is set this "
+                "will be ignored."
+            ),
+        ),
+        th.Property(
+            "compression",
+            th.StringType,
+            allowed_values=["zlib", "zstd"],
+            description=(
+                "Compress the client/server protocol with `zlib`, or with "
+                "`zstd` where the server supports it (MySQL 8.0.18 and "
+                "later), falling back to zlib otherwise. Saves bandwidth on "
+                "slow or tunnelled connections at the cost of CPU. Needs the "
+                "`mysqldb` driver, PyMySQL cannot compress."
+            ),
+        ),
+        th.Property(
+            "zstd_compression_level",
+            th.IntegerType,
+            default=3,
+            description="zstd level, from 1 to 22, when `compression` is `zstd`.",
+        ),
         th.Property(
             "sqlalchemy_url",
             th.StringType,
@@ -136,6 +205,349 @@ class TapMySQL(SQLTap):
                 "information."
             ),
         ),
+        th.Property(
+            "vitess_detection_cache_path",
+            th.StringType,
+            description=(
+                "File to cache whether each server is a Vitess instance in, "
+                "when `is_vitess` is not set, so the tap does not ask the "
+                "server on every run."
+            ),
+        ),
+        th.Property(
+            "vitess_detection_cache_ttl",
+            th.IntegerType,
+            default=86400,
+            description=(
+                "Seconds a cached Vitess detection is used for before asking "
+                "the server again."
+            ),
+        ),
+        th.Property(
+            "stream_results",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Read rows through an unbuffered server-side cursor so memory use "
+                "stays flat however large the table is. By default each result "
+                "set is buffered on the client. Set to `True` for tables too "
+                "large to buffer, the connection then stays busy until every row "
+                "is read, so a slow target can hit the server's "
+                "`net_write_timeout`. Can be overridden per stream in "
+                "`stream_options`."
+            ),
+        ),
+        th.Property(
+            "fetch_size",
+            th.IntegerType,
+            default=10000,
+            description=(
+                "Number of rows read from the cursor per `fetchmany` call. Can be "
+                "overridden per stream in `stream_options`."
+            ),
+        ),
+        th.Property(
+            "full_table_chunk_size",
+            th.IntegerType,
+            description=(
+                "If set, FULL_TABLE streams with a primary key are read in "
+                "primary key order, this many rows per query, and the last key "
+                "read is saved in state so an interrupted sync resumes where it "
+                "stopped. Can be overridden per stream in `stream_options`."
+            ),
+        ),
+        th.Property(
+            "incremental_chunk_size",
+            th.IntegerType,
+            description=(
+                "If set, INCREMENTAL streams with a primary key are read in "
+                "(replication key, primary key) order, this many rows per "
+                "query, and the primary key of the last row read is saved in "
+                "state next to the replication key value, so rows sharing that "
+                "value are not read again. Can be overridden per stream in "
+                "`stream_options`."
+            ),
+        ),
+        th.Property(
+            "partition_count",
+            th.IntegerType,
+            description=(
+                "If 2 or more, FULL_TABLE streams are split into this many ranges "
+                "of their partition key, read concurrently over separate "
+                "connections. The partition key is `partition_key` if set, else a "
+                "single-column integer, date or datetime primary key. Can be "
+                "overridden per stream in `stream_options`."
+            ),
+        ),
+        th.Property(
+            "partition_key",
+            th.StringType,
+            description=(
+                "Integer, date or datetime column to split partitioned streams on. "
+                "Usually set per stream in `stream_options`."
+            ),
+        ),
+        th.Property(
+            "partition_workers",
+            th.IntegerType,
+            default=4,
+            description=(
+                "Maximum number of partitions of one stream read at the same time."
+            ),
+        ),
+        th.Property(
+            "max_concurrent_streams",
+            th.IntegerType,
+            default=1,
+            description=(
+                "Maximum number of streams synced at the same time, each over its "
+                "own pooled connection."
+            ),
+        ),
+        th.Property(
+            "consistent_snapshot",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Read all streams from one consistent snapshot of the "
+                "database, shared by all the connections reading at once, "
+                "as mydumper does. The snapshot's binlog position is saved "
+                "in each stream's state as `snapshot_position`, and is where "
+                "LOG_BASED streams start reading the binlog after their "
+                "first sync."
+            ),
+        ),
+        th.Property(
+            "snapshot_lock",
+            th.StringType,
+            default="flush_tables",
+            allowed_values=list(SNAPSHOT_LOCKS),
+            description=(
+                "How `consistent_snapshot` starts its connections at the same "
+                "point: `flush_tables` holds off writes with a brief FLUSH "
+                "TABLES WITH READ LOCK, which needs the RELOAD privilege. "
+                "`none` takes no lock, and retries until no transaction "
+                "commits while the connections start. A commit in flight "
+                "right then can still be seen by some connections only."
+            ),
+        ),
+        th.Property(
+            "lob_policy",
+            th.StringType,
+            default="inline",
+            allowed_values=list(LOB_POLICIES),
+            description=(
+                "What is read of BLOB, TEXT and JSON columns: `inline` reads "
+                "their values, `truncate` their first `lob_max_length` "
+                "characters or bytes, `hash` their SHA-256, computed by the "
+                "server. `file` writes each value to a side file under "
+                "`lob_storage_root`, named by its SHA-256, and emits the "
+                "file's URL. JSON columns are strings under all but `inline`. "
+                "Can be overridden per stream in `stream_options`."
+            ),
+        ),
+        th.Property(
+            "lob_columns",
+            th.ObjectType(additional_properties=th.StringType),
+            description=(
+                "LOB policies of single columns, by column name, over "
+                '`lob_policy`, for example `{"body": "hash"}`. Can be '
+                "overridden per stream in `stream_options`."
+            ),
+        ),
+        th.Property(
+            "lob_max_length",
+            th.IntegerType,
+            default=65535,
+            description=(
+                "Characters, or bytes for BLOBs, kept of values under the "
+                "`truncate` LOB policy. Can be overridden per stream in "
+                "`stream_options`."
+            ),
+        ),
+        th.Property(
+            "lob_storage_root",
+            th.StringType,
+            description=(
+                "Directory or object store URL, such as `s3://bucket/lobs`, "
+                "that the `file` LOB policy writes side files to, as "
+                "`<tap_stream_id>/<column>/<sha256>`. Values are read and "
+                "written a chunk at a time, a file already there is not "
+                "written again. Needs a primary key on the stream."
+            ),
+        ),
+        th.Property(
+            "stream_order",
+            th.StringType,
+            default="catalog",
+            allowed_values=["catalog", "largest_first", "smallest_first"],
+            description=(
+                "Order streams are synced in: as in the catalog, or by the "
+                "size of their tables as MySQL estimates it. `largest_first` "
+                "keeps the longest stream from starting last when "
+                "`max_concurrent_streams` is above 1, `smallest_first` gets "
+                "the most streams done early."
+            ),
+        ),
+        th.Property(
+            "stage_metrics",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Time each stage of reading a stream: executing queries, "
+                "waiting for their first rows, fetching rows, conforming "
+                "records, formatting and writing messages. These times, and "
+                "the queries run, rows and bytes read, rows/s and the peak "
+                "RSS, are logged as METRIC lines every "
+                "`stage_metrics_interval` seconds and when a stream ends."
+            ),
+        ),
+        th.Property(
+            "stage_metrics_interval",
+            th.NumberType,
+            default=DEFAULT_LOG_INTERVAL,
+            description="Seconds between a stream's `stage_metrics` logs.",
+        ),
+        th.Property(
+            "openmetrics_path",
+            th.StringType,
+            description=(
+                "File to write the `stage_metrics` of all streams to, in the "
+                "OpenMetrics text format, each time they are logged. Turns "
+                "`stage_metrics` on."
+            ),
+        ),
+        th.Property(
+            "profile_stream",
+            th.StringType,
+            description=(
+                "tap_stream_id of a stream to profile: its threads' stacks are "
+                "sampled while it syncs, and written to `profile_path` in the "
+                "folded stacks format read by flamegraph.pl and speedscope."
+            ),
+        ),
+        th.Property(
+            "profile_path",
+            th.StringType,
+            description=(
+                "File to write the profile of `profile_stream` to, by default "
+                "`<tap_stream_id>.folded` in the working directory."
+            ),
+        ),
+        th.Property(
+            "profile_interval",
+            th.NumberType,
+            default=DEFAULT_PROFILE_INTERVAL,
+            description="Seconds between samples of `profile_stream`'s stacks.",
+        ),
+        th.Property(
+            "json_encoder",
+            th.StringType,
+            default=SIMPLEJSON,
+            allowed_values=list(JSON_ENCODERS),
+            description=(
+                "Library to encode messages as JSON with. `simplejson` is the "
+                "Singer SDK's own encoding. `orjson` (3.9 or later) and "
+                "`msgspec` (0.18 or later) are faster, and must be installed."
+            ),
+        ),
+        th.Property(
+            "output_flush_bytes",
+            th.IntegerType,
+            description=(
+                "Hold messages until this many bytes of them are held, then "
+                "write them to stdout at once. By default each message is "
+                "written and flushed as it comes."
+            ),
+        ),
+        th.Property(
+            "output_flush_records",
+            th.IntegerType,
+            description=(
+                "Hold messages until this many of them are held, then write "
+                "them to stdout at once."
+            ),
+        ),
+        th.Property(
+            "output_flush_seconds",
+            th.NumberType,
+            description=(
+                "Hold messages for this many seconds at most, then write them "
+                "to stdout at once. Checked as messages are written, and all "
+                "are written when the sync ends."
+            ),
+        ),
+        th.Property(
+            "binlog_server_id",
+            th.IntegerType,
+            description=(
+                "Server id used to read the binlog for LOG_BASED streams. Must "
+                "be unique among the server's replicas, and streams synced "
+                "concurrently each need their own, so leave it unset then. If "
+                "not set, each stream uses an id from 65536 to 4294967295 "
+                "derived from the host, port, user and stream, the same on "
+                "every run."
+            ),
+        ),
+        th.Property(
+            "binlog_use_gtid",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Resume LOG_BASED streams from the GTID set in state rather "
+                "than from the binlog file and position. Needs `gtid_mode=ON`."
+            ),
+        ),
+        th.Property(
+            "decimal_as",
+            th.StringType,
+            default="decimal",
+            allowed_values=["decimal", "float", "string"],
+            description=(
+                "How DECIMAL and NUMERIC values are read: `decimal` keeps "
+                "their exact value, `float` is faster but may round, and "
+                "`string` keeps the exact digits as a string (the stream "
+                "schema then types these columns as strings)."
+            ),
+        ),
+        th.Property(
+            "discovery_cache_path",
+            th.StringType,
+            description=(
+                "File to cache discovered catalog entries in. Discovery then "
+                "only reflects tables whose columns or indexes changed since "
+                "the last run, and reuses the cached entries of the others."
+            ),
+        ),
+        th.Property(
+            "stream_options",
+            th.ObjectType(
+                additional_properties=th.ObjectType(
+                    th.Property("stream_results", th.BooleanType),
+                    th.Property("fetch_size", th.IntegerType),
+                    th.Property("full_table_chunk_size", th.IntegerType),
+                    th.Property("incremental_chunk_size", th.IntegerType),
+                    th.Property("partition_count", th.IntegerType),
+                    th.Property("partition_key", th.StringType),
+                    th.Property("partition_workers", th.IntegerType),
+                    th.Property(
+                        "lob_policy",
+                        th.StringType,
+                        allowed_values=list(LOB_POLICIES),
+                    ),
+                    th.Property(
+                        "lob_columns",
+                        th.ObjectType(additional_properties=th.StringType),
+                    ),
+                    th.Property("lob_max_length", th.IntegerType),
+                ),
+            ),
+            description=(
+                "Per-stream overrides of extraction settings, keyed by "
+                "tap_stream_id, for example "
+                '`{"melty-orders": {"fetch_size": 50000}}`.'
+            ),
+        ),
         th.Property(
             "ssh_tunnel",
             th.ObjectType(
@@ -190,6 +602,58 @@ class TapMySQL(SQLTap):
                         "Private Key Password, leave None if no password is set"
                     ),
                 ),
+                th.Property(
+                    "keepalive",
+                    th.IntegerType,
+                    default=5,
+                    description=(
+                        "Seconds between keepalive messages to the bastion "
+                        "host, 0 for none"
+                    ),
+                ),
+                th.Property(
+                    "high_throughput",
+                    th.BooleanType,
+                    default=False,
+                    description=(
+                        "Forward connections with the tap's own tunnel, tuned "
+                        "for bulk transfers, rather than with sshtunnel. The "
+                        "window_size, max_packet_size, ciphers and connections "
+                        "settings apply to it only"
+                    ),
+                ),
+                th.Property(
+                    "window_size",
+                    th.IntegerType,
+                    default=2**24,
+                    description=(
+                        "Flow control window of each forwarded connection, in "
+                        "bytes. Throughput is at most one window per round trip"
+                    ),
+                ),
+                th.Property(
+                    "max_packet_size",
+                    th.IntegerType,
+                    default=2**17,
+                    description="Largest SSH packet the bastion host may send",
+                ),
+                th.Property(
+                    "ciphers",
+                    th.ArrayType(th.StringType),
+                    description=(
+                        "Ciphers to prefer, in order, for example "
+                        '`["aes128-gcm@openssh.com", "aes128-ctr"]`'
+                    ),
+                ),
+                th.Property(
+                    "connections",
+                    th.IntegerType,
+                    default=1,
+                    description=(
+                        "Number of SSH connections to spread database "
+                        "connections over, each encrypted on its own thread"
+                    ),
+                ),
             ),
             required=False,
             description="SSH Tunnel Configuration, this is a json object",
@@ -206,7 +670,7 @@ class TapMySQL(SQLTap):
             return cast(str, config["sqlalchemy_url"])
 
         sqlalchemy_url = URL.create(
-            drivername="mysql+pymysql",
+            drivername=f"mysql+{config.get('driver') or 'pymysql'}",
             username=config["user"],
             password=config["password"],
             host=config["host"],
@@ -235,6 +699,22 @@ class TapMySQL(SQLTap):
             sqlalchemy_url=url.render_as_string(hide_password=False),
         )
 
+    @cached_property
+    def sync_metrics(self) -> SyncMetrics | None:
+        """The stage timers and counters of the streams synced, if enabled.
+
+        Enabled by `stage_metrics`, or by `openmetrics_path`.
+        """
+        openmetrics_path = self.config.get("openmetrics_path")
+        if not (self.config.get("stage_metrics") or openmetrics_path):
+            return None
+        return SyncMetrics(
+            openmetrics_path=openmetrics_path,
+            interval=float(
+                self.config.get("stage_metrics_interval") or DEFAULT_LOG_INTERVAL
+            ),
+        )
+
     def guess_key_type(self, key_data: str) -> paramiko.PKey:
         """Guess the type of the private key.
 
@@ -250,6 +730,9 @@ class TapMySQL(SQLTap):
         Raises:
             ValueError: If the key type could not be determined.
         """
+        # Imported only when a tunnel is enabled, they are slow to import.
+        import paramiko  # noqa: PLC0415
+
         for key_class in (
             paramiko.RSAKey,
             paramiko.DSSKey,
@@ -281,13 +764,32 @@ class TapMySQL(SQLTap):
         else:
             private_key = None
 
-        self.ssh_tunnel: SSHTunnelForwarder = SSHTunnelForwarder(
-            ssh_address_or_host=(ssh_config["host"], ssh_config["port"]),
-            ssh_username=ssh_config["username"],
-            ssh_pkey=self.guess_key_type(ssh_config["private_key"]),
-            ssh_private_key_password=ssh_config.get("private_key_password"),
-            remote_bind_address=(url.host, url.port),
-        )
+        self.ssh_tunnel: SSHTunnel | SSHTunnelForwarder
+        if ssh_config.get("high_throughput", False):
+            from tap_mysql.ssh import SSHTunnel  # noqa: PLC0415
+
+            self.ssh_tunnel = SSHTunnel(
+                ssh_address=(ssh_config["host"], ssh_config["port"]),
+                username=ssh_config["username"],
+                remote_address=(cast("str", url.host), url.port or 3306),
+                pkey=private_key,
+                window_size=ssh_config.get("window_size", 2**24),
+                max_packet_size=ssh_config.get("max_packet_size", 2**17),
+                keepalive=ssh_config.get("keepalive", 5),
+                ciphers=ssh_config.get("ciphers") or (),
+                connections=ssh_config.get("connections", 1),
+            )
+        else:
+            from sshtunnel import SSHTunnelForwarder  # noqa: PLC0415
+
+            self.ssh_tunnel = SSHTunnelForwarder(
+                ssh_address_or_host=(ssh_config["host"], ssh_config["port"]),
+                ssh_username=ssh_config["username"],
+                ssh_pkey=private_key,
+                ssh_private_key_password=ssh_config.get("private_key_password"),
+                remote_bind_address=(url.host, url.port),
+                set_keepalive=ssh_config.get("keepalive", 5),
+            )
         self.ssh_tunnel.start()
         self.logger.info("SSH Tunnel started")
         # On program exit clean up, want to also catch signals
@@ -317,6 +819,31 @@ class TapMySQL(SQLTap):
         """
         sys.exit(1)  # Calling this to be sure atexit is called, so clean_up gets called
 
+    def setup_mapper(self) -> None:
+        """Initialize the plugin mapper for this tap.
+
+        LOG_BASED streams get a `_sdc_deleted_at` property first, so it is in
+        their SCHEMA messages. JSON properties with a LOB policy other than
+        `inline` are typed as strings, as they are in discovered catalogs.
+        """
+        for catalog_entry in (self.input_catalog or {}).values():
+            properties = catalog_entry.schema.properties
+            if properties is None:
+                continue
+            if is_log_based(catalog_entry):
+                properties["_sdc_deleted_at"] = Schema(
+                    type=["string", "null"],
+                    format="date-time",
+                )
+            for name, schema in properties.items():
+                if (
+                    is_json_schema(schema.to_dict())
+                    and column_policy(self.config, catalog_entry.tap_stream_id, name)
+                    != INLINE
+                ):
+                    properties[name] = Schema(type=["string", "null"])
+        super().setup_mapper()
+
     @property
     def catalog_dict(self) -> dict:
         """Get catalog dictionary.
@@ -342,7 +869,309 @@ class TapMySQL(SQLTap):
         Returns:
             List of discovered Stream objects.
         """
+        streams: list[Stream] = []
+        for catalog_entry in self.catalog_dict["streams"]:
+            stream_class = (
+                MySQLLogBasedStream
+                if is_log_based(CatalogEntry.from_dict(catalog_entry))
+                else MySQLStream
+            )
+            streams.append(stream_class(self, catalog_entry, connector=self.connector))
+        return streams
+
+    @cached_property
+    def _json_encoder(self) -> Callable[[Any], bytes] | None:
+        """The `json_encoder` messages are encoded with, None for the SDK's."""
+        encode = json_encoder(self.config.get("json_encoder") or SIMPLEJSON)
+        if encode is not None and self.config.get("json_encoder") == ORJSON:
+            orjson = importlib.import_module("orjson")
+            if not hasattr(orjson, "Fragment"):
+                self.logger.warning(
+                    "orjson %s cannot write decimals, messages with them are "
+                    "encoded by simplejson. Upgrade to orjson 3.9 or later.",
+                    orjson.__version__,
+                )
+        return encode
+
+    @cached_property
+    def output(self) -> OutputSink:
+        """Where messages are written, buffered as `output_flush_*` say."""
+        flush_seconds = self.config.get("output_flush_seconds")
+        sink = OutputSink(
+            flush_bytes=self.config.get("output_flush_bytes"),
+            flush_records=self.config.get("output_flush_records"),
+            flush_seconds=None if flush_seconds is None else float(flush_seconds),
+        )
+        if sink.buffered:
+            # Nothing held is lost when the tap exits outside of `sync_all`.
+            atexit.register(self.flush_output)
+        return sink
+
+    def encode_message(self, message: Message) -> bytes:
+        """Encode a message as a line of JSON, with `json_encoder`.
+
+        Args:
+            message: The message to encode.
+
+        Returns:
+            The UTF-8 encoded line, with its trailing newline.
+        """
+        encode = self._json_encoder
+        if encode is not None:
+            try:
+                return encode(message.to_dict())
+            except TypeError:
+                # Values it has no JSON for are left to the SDK's encoding.
+                pass
+        return (self.format_message(message) + "\n").encode()
+
+    def write_message(self, message: Message) -> None:
+        """Write a message to stdout, one whole message at a time.
+
+        Args:
+            message: The message to write.
+        """
+        self.write_line(self.encode_message(message))
+
+    def write_line(self, line: bytes) -> None:
+        """Write an encoded message to stdout, whole.
+
+        Args:
+            line: The message, with its trailing newline.
+        """
+        with self.sync_lock:
+            self.output.write(line)
+
+    def flush_output(self) -> None:
+        """Write out the messages held by `output`."""
+        with self.sync_lock:
+            self.output.flush()
+
+    def _estimate_stream_sizes(self) -> None:
+        """Give selected streams their table's size, and order them by it.
+
+        Sizes are read afresh from information_schema for all the tables at
+        once, else taken from the catalog's `row_count`. They set each
+        stream's `row_count_estimate`, against which its progress is logged,
+        and the stream order when `stream_order` is not `catalog`.
+        """
+        streams = [
+            cast("MySQLStream", stream)
+            for stream in self.streams.values()
+            if stream.selected
+        ]
+        table_names = {
+            (str(schema_name), table_name): stream
+            for stream in streams
+            for _, schema_name, table_name in [
+                self.connector.parse_full_table_name(stream.fully_qualified_name)
+            ]
+        }
+        estimates = (
+            self.connector.get_table_estimates(
+                sorted({schema_name for schema_name, _ in table_names}),
+                list(table_names),
+            )
+            if table_names
+            else {}
+        )
+        sizes: dict[str, tuple[int, int]] = {}
+        for key, stream in table_names.items():
+            row_count, data_length = estimates.get(key, (None, None))
+            if row_count is None:
+                row_count = stream._singer_catalog_entry.row_count  # noqa: SLF001
+            stream.row_count_estimate = row_count
+            sizes[stream.name] = (data_length or 0, row_count or 0)
+
+        stream_order = self.config.get("stream_order") or "catalog"
+        if stream_order == "catalog":
+            return
+        ordered = sorted(
+            self.streams.items(),
+            key=lambda item: sizes.get(item[0], (0, 0)),
+            reverse=stream_order == "largest_first",
+        )
+        self._streams = dict(ordered)
+        self.logger.info(
+            "Syncing streams %s: %s",
+            stream_order.replace("_", " "),
+            ", ".join(name for name, _ in ordered if name in sizes),
+        )
+
+    def _open_snapshot(self) -> ConsistentSnapshot:
+        """Take a consistent snapshot for the selected streams to read from.
+
+        It has a connection for each stream synced at once, times
+        `partition_workers` if a selected stream is partitioned, and twice
+        as many if a selected stream writes large objects to side files,
+        which are read on a connection of their own.
+
+        Returns:
+            The open snapshot, see `ConsistentSnapshot`.
+
+        Raises:
+            ValueError: On Vitess, which has no consistent snapshots.
+        """
+        if self.connector.is_vitess:
+            msg = "consistent_snapshot is not supported for Vitess."
+            raise ValueError(msg)
+        size = max(1, int(self.config.get("max_concurrent_streams") or 1))
+        if any(
+            cast("MySQLStream", stream).partition_key is not None
+            for stream in self.streams.values()
+            if stream.selected
+        ):
+            size *= max(1, int(self.config.get("partition_workers") or 1))
+        if any(
+            cast("MySQLStream", stream)._lob_files  # noqa: SLF001
+            for stream in self.streams.values()
+            if stream.selected
+        ):
+            size *= 2
+        snapshot = ConsistentSnapshot(
+            self.connector._engine,  # noqa: SLF001
+            size,
+            lock=self.config.get("snapshot_lock") or FLUSH_TABLES,
+        )
+        snapshot.open()
+        return snapshot
+
+    def sync_all(self) -> None:  # type: ignore[misc]
+        """Sync all streams, up to `max_concurrent_streams` at a time.
+
+        Streams are synced in `stream_order`, see `_estimate_stream_sizes`.
+        With `consistent_snapshot`, all of them read from one snapshot. With
+        `openmetrics_path`, the streams' metrics are written there once more
+        at the end. Messages still held by `output` are written out last.
+        Parquet batch files need `pyarrow`, which is checked up front.
+        """
+        batch_config = self.config.get("batch_config")
+        if batch_config and batch_config["encoding"]["format"] == "parquet":
+            # Fail before any stream is read, not on its first batch file.
+            import_parquet()
+        self._estimate_stream_sizes()
+        if self.config.get("consistent_snapshot"):
+            self.connector.snapshot = self._open_snapshot()
+        try:
+            self._sync_streams()
+        finally:
+            snapshot, self.connector.snapshot = self.connector.snapshot, None
+            if snapshot is not None:
+                snapshot.close()
+            if self.sync_metrics is not None:
+                self.sync_metrics.export()
+            self.flush_output()
+
+    def _sync_streams(self) -> None:
+        max_workers = int(self.config.get("max_concurrent_streams") or 1)
+        if max_workers <= 1:
+            super().sync_all()
+            return
+
+        self._reset_state_progress_markers()
+        self._set_compatible_replication_methods()
+        if self.state:
+            self.write_message(StateMessage(value=self.state))
+
+        streams: list[Stream] = []
+        for stream in self.streams.values():
+            if not stream.selected:
+                self.logger.info("Skipping deselected stream '%s'.", stream.name)
+                continue
+            # Create the bookmark up front, so worker threads only ever change
+            # their own stream's part of the state.
+            _ = stream.stream_state
+            streams.append(stream)
+        _ = self.connector._engine  # noqa: SLF001
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="tap-mysql-stream",
+        ) as executor:
+            futures = [executor.submit(self._sync_stream, stream) for stream in streams]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception:  # noqa: PERF203
+                    # Streams already running finish, the rest never start.
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+
+        for stream in self.streams.values():
+            stream.log_sync_costs()
+
+    def plan_extraction(self) -> list[dict[str, Any]]:
+        """Plan how each selected stream would be extracted, without extracting.
+
+        Streams are given their table's size first, see
+        `_estimate_stream_sizes`, which strategies are recommended for.
+
+        Returns:
+            The plan of each selected stream, see `MySQLStream.extraction_plan`.
+        """
+        self._estimate_stream_sizes()
         return [
-            MySQLStream(self, catalog_entry, connector=self.connector)
-            for catalog_entry in self.catalog_dict["streams"]
+            cast("MySQLStream", stream).extraction_plan()
+            for stream in self.streams.values()
+            if stream.selected
         ]
+
+    @classmethod
+    def get_singer_command(cls: type[TapMySQL]) -> click.Command:
+        """Execute standard CLI handler for taps, with a `--plan` option.
+
+        Returns:
+            A click.Command object.
+        """
+        command = super().get_singer_command()
+        command.params.append(
+            click.Option(
+                ["--plan"],
+                is_flag=True,
+                help=(
+                    "Print how each selected stream would be extracted, as "
+                    "JSON, without extracting anything. Without --catalog, "
+                    "every table discovered is selected, so every table is "
+                    "planned: pass a catalog to plan only its selected streams."
+                ),
+            ),
+        )
+        return command
+
+    @classmethod
+    def invoke(  # type: ignore[override]
+        cls: type[TapMySQL],
+        *,
+        plan: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Invoke the tap's command line interface.
+
+        Args:
+            plan: Print the extraction plan of the selected streams, rather
+                than syncing them.
+            kwargs: The SDK's command line options.
+        """
+        if not plan:
+            super().invoke(**kwargs)
+            return
+
+        config_files, parse_env_config = cls.config_from_cli_args(
+            *kwargs.get("config", ())
+        )
+        options: dict[str, Any] = {
+            "config": config_files,
+            "state": kwargs.get("state"),
+            "catalog": kwargs.get("catalog"),
+            "parse_env_config": parse_env_config,
+            "validate_config": True,
+        }
+        tap = cls(**options)
+        plans = {"streams": tap.plan_extraction()}
+        sys.stdout.write(json.dumps(plans, indent=2, default=str) + "\n")
+
+    @staticmethod
+    def _sync_stream(stream: Stream) -> None:
+        stream.sync()
+        stream.finalize_state_progress_markers()
@@ -0,0 +1,98 @@
+"""Rows/sec of turning fetched rows into JSON-ready records vs Arrow batches.
+
+Compares building a dict per row and conforming it with `RecordConformer`
+(what `get_records` feeds the SDK) with `ArrowBatchBuilder`, on in-memory
+row tuples of a numeric-heavy table. Needs `pyarrow`.
+
+Run with:
+
+    python tests/benchmarks/bench_arrow.py --columns 60 --rows 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import decimal
+import time
+
+from singer_sdk._singerlib import MetadataMapping
+from sqlalchemy import BigInteger, Column, Float, Numeric
+from sqlalchemy.dialects.mysql import DATETIME
+
+from tap_mysql.arrow import ArrowBatchBuilder
+from tap_mysql.client import MySQLConnector
+from tap_mysql.conform import RecordConformer
+
+BATCH_SIZE = 10000
+COLUMN_KINDS = [
+    (BigInteger(), 123456789),
+    (Float(), 0.25),
+    (Numeric(12, 2), decimal.Decimal("1234.50")),
+    (DATETIME(), datetime.datetime(2024, 6, 10, 6, 15, 20)),
+]
+
+
+def make_columns_and_row(columns):
+    """Return `columns` mixed numeric columns and a row of values for them."""
+    table_columns = []
+    row = []
+    for i in range(columns):
+        column_type, value = COLUMN_KINDS[i % len(COLUMN_KINDS)]
+        table_columns.append(Column(f"col_{i}", column_type))
+        row.append(value)
+    return table_columns, tuple(row)
+
+
+def conform_records(columns):
+    """Build and conform one record dict per row."""
+    schema = {
+        "type": "object",
+        "properties": {
+            column.name: MySQLConnector.sdk_typing_object(column.type).type_dict
+            for column in columns
+        },
+    }
+    metadata = MetadataMapping.get_standard_metadata(schema=schema)
+    metadata.root.selected = True
+    conform = RecordConformer(schema, metadata.resolve_selection(), lambda _: None)
+    keys = [column.name for column in columns]
+
+    def build(rows):
+        return [conform(dict(zip(keys, row))) for row in rows]
+
+    return build
+
+
+def rows_per_second(build, row, rows, repeat):
+    """Return the best rows/sec of `repeat` runs over `rows` rows."""
+    batch = [row] * BATCH_SIZE
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(rows // BATCH_SIZE):
+            build(batch)
+        best = min(best, time.perf_counter() - start)
+    return rows // BATCH_SIZE * BATCH_SIZE / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--columns", type=int, default=60)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    columns, row = make_columns_and_row(args.columns)
+    before = rows_per_second(conform_records(columns), row, args.rows, args.repeat)
+    after = rows_per_second(
+        ArrowBatchBuilder(columns).build, row, args.rows, args.repeat
+    )
+
+    print(f"{args.columns} columns, {args.rows} rows")
+    print(f"records + RecordConformer: {before:12,.0f} rows/s")
+    print(f"ArrowBatchBuilder:         {after:12,.0f} rows/s ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Bytes on the wire and rows/sec of reading a table with protocol compression.
+
+Reads all rows of a table uncompressed, with zlib and with zstd, over the
+connection the tap would use, SSH tunnel included. Bytes are the session's
+`Bytes_sent` status on the server, which counts the compressed packets. Needs
+a server, and mysqlclient for the compressed reads.
+
+Run with:
+
+    python tests/benchmarks/bench_compression.py --config config.json \
+        --table melty.orders
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import sqlalchemy
+
+from tap_mysql.tap import TapMySQL
+
+BYTES_SENT = sqlalchemy.text("SHOW SESSION STATUS LIKE 'Bytes_sent'")
+
+
+def bytes_sent(conn):
+    """Return the bytes the server sent on this connection so far."""
+    return int(conn.execute(BYTES_SENT).one()[1])
+
+
+def read_table(config, table, fetch_size):
+    """Read all rows of `table`, return the rows, bytes sent and seconds."""
+    tap = TapMySQL(config=config, setup_mapper=False)
+    engine = tap.connector._engine  # noqa: SLF001
+    schema, name = table.split(".")
+    query = sqlalchemy.text(f"SELECT * FROM `{schema}`.`{name}`")  # noqa: S608
+    rows = 0
+    with engine.connect() as conn:
+        sent = bytes_sent(conn)
+        start = time.perf_counter()
+        result = conn.execution_options(stream_results=True).execute(query)
+        while batch := result.fetchmany(fetch_size):
+            rows += len(batch)
+        seconds = time.perf_counter() - start
+        sent = bytes_sent(conn) - sent
+    engine.dispose()
+    return rows, sent, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", required=True, help="Tap config.")
+    parser.add_argument("--table", required=True, help="Table, as schema.table.")
+    parser.add_argument("--fetch-size", type=int, default=10000)
+    parser.add_argument("--zstd-level", type=int, default=3)
+    args = parser.parse_args()
+
+    config = json.loads(Path(args.config).read_text(encoding="utf-8"))
+    runs = {
+        "uncompressed": {**config, "compression": None},
+        "zlib": {**config, "driver": "mysqldb", "compression": "zlib"},
+        f"zstd ({args.zstd_level})": {
+            **config,
+            "driver": "mysqldb",
+            "compression": "zstd",
+            "zstd_compression_level": args.zstd_level,
+        },
+    }
+
+    baseline = None
+    for label, run_config in runs.items():
+        rows, sent, seconds = read_table(run_config, args.table, args.fetch_size)
+        baseline = baseline or sent
+        print(
+            f"{label:14} {rows:10,} rows {sent / 1e6:10,.1f} MB "
+            f"({baseline / sent:4.1f}x fewer) {rows / seconds:12,.0f} rows/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Records/sec of conforming wide records to their schema.
+
+Compares the SDK's per-value conformance, which the tap used before, with
+`RecordConformer`, which picks each property's converter once.
+
+Run with:
+
+    python tests/benchmarks/bench_conform.py --columns 120 --rows 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import decimal
+import time
+
+from singer_sdk._singerlib import MetadataMapping
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import TypeConformanceLevel, conform_record_data_types
+
+from tap_mysql.conform import RecordConformer
+
+COLUMN_KINDS = [
+    ({"type": ["integer", "null"]}, 42),
+    ({"type": ["string", "null"]}, "some text"),
+    ({"type": ["number", "null"]}, decimal.Decimal("12.50")),
+    (
+        {"type": ["string", "null"], "format": "date-time"},
+        datetime.datetime(2024, 6, 10, 6, 15, 20),
+    ),
+    ({"type": ["string", "null"], "format": "date"}, datetime.date(2024, 6, 10)),
+    ({"type": ["boolean", "null"]}, 1),
+]
+
+
+def make_schema_and_record(columns):
+    """Return a schema and a record with `columns` mixed type columns."""
+    properties = {}
+    record = {}
+    for i in range(columns):
+        property_schema, value = COLUMN_KINDS[i % len(COLUMN_KINDS)]
+        properties[f"col_{i}"] = property_schema
+        record[f"col_{i}"] = value
+    return {"type": "object", "properties": properties}, record
+
+
+def sdk_conform(schema, mask):
+    """Conform records the way `_generate_record_messages` does in the SDK."""
+
+    def conform(record):
+        pop_deselected_record_properties(record, schema, mask)
+        return conform_record_data_types(
+            "bench",
+            record,
+            schema,
+            TypeConformanceLevel.ROOT_ONLY,
+            None,
+        )
+
+    return conform
+
+
+def records_per_second(conform, record, rows, repeat):
+    """Return the best records/sec of `repeat` runs over `rows` records."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(rows):
+            conform(dict(record))
+        best = min(best, time.perf_counter() - start)
+    return rows / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--columns", type=int, default=120)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    schema, record = make_schema_and_record(args.columns)
+    metadata = MetadataMapping.get_standard_metadata(schema=schema)
+    metadata.root.selected = True
+    mask = metadata.resolve_selection()
+
+    before = records_per_second(
+        sdk_conform(schema, mask), record, args.rows, args.repeat
+    )
+    after = records_per_second(
+        RecordConformer(schema, mask, lambda _: None), record, args.rows, args.repeat
+    )
+
+    print(f"{args.columns} columns, {args.rows} records")
+    print(f"SDK conformance: {before:12,.0f} records/s")
+    print(f"RecordConformer: {after:12,.0f} records/s ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
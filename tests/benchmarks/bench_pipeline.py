@@ -0,0 +1,515 @@
+"""Rows/sec and bytes/row of the extraction pipeline, on synthetic tables.
+
+Syncs a table of each shape below through the whole tap: `get_records`,
+`RecordConformer` and Singer serialization to a byte-counting stdout. It also
+times `MySQLStream.get_records` alone. Rows come from a fake DBAPI whose
+cursor replays a result set generated with `faker`, behind the real MySQL
+dialect, so no server is needed and runs are repeatable.
+
+- narrow: an id, a name, a flag and a timestamp.
+- wide: 120 integer, text and float columns.
+- dates: DATE, DATETIME, TIMESTAMP and TIME columns.
+- decimals: DECIMAL columns.
+- lobs: TEXT, BLOB and JSON columns of a few KB.
+
+`--save` writes the results to a JSON baseline, and `--baseline` compares a
+run with one, exiting with status 1 when a scenario's rows/sec dropped by
+more than `--tolerance`, or its bytes/row grew. With `--config`, the same
+scenarios are loaded into the server it points at, such as the
+docker-compose MySQL, and synced from there.
+
+Run with:
+
+    python tests/benchmarks/bench_pipeline.py --rows 50000 --save baseline.json
+    python tests/benchmarks/bench_pipeline.py --rows 50000 --baseline baseline.json
+    python tests/benchmarks/bench_pipeline.py --config config.json --rows 50000
+    python tests/benchmarks/bench_pipeline.py --json-encoder orjson --flush-bytes 65536
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import copy
+import datetime
+import itertools
+import json
+import logging
+import platform
+import sys
+import time
+from pathlib import Path
+
+import sqlalchemy
+from faker import Faker
+from singer_sdk._singerlib import Catalog, CatalogEntry, MetadataMapping, Schema
+from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects.mysql.pymysql import MySQLDialect_pymysql
+
+from tap_mysql.client import MySQLConnector
+from tap_mysql.output import JSON_ENCODERS, SIMPLEJSON
+from tap_mysql.tap import TapMySQL
+
+SCHEMA = "melty"
+# Distinct rows generated per scenario, replayed until `--rows` are read.
+POOL_SIZE = 1000
+OFFLINE_CONFIG = {
+    "sqlalchemy_url": f"mysql+replay://bench@replay/{SCHEMA}",
+    "is_vitess": False,
+}
+
+
+def _id(fake, i):  # noqa: ARG001
+    return i
+
+
+def seconds(value):
+    """Drop the microseconds of a datetime, as a column without fsp has none."""
+    return value.replace(microsecond=0)
+
+
+SCENARIOS = {
+    "narrow": [
+        ("name", mysql.VARCHAR(100), lambda fake, _: fake.name()),
+        ("active", mysql.TINYINT(1), lambda fake, _: int(fake.pybool())),
+        ("updated_at", mysql.DATETIME(), lambda fake, _: seconds(fake.date_time())),
+    ],
+    "wide": [
+        column
+        for i in range(40)
+        for column in (
+            (f"count_{i}", mysql.INTEGER(), lambda fake, _: fake.pyint()),
+            (f"label_{i}", mysql.VARCHAR(50), lambda fake, _: fake.word()),
+            (f"ratio_{i}", mysql.DOUBLE(), lambda fake, _: fake.pyfloat()),
+        )
+    ],
+    "dates": [
+        column
+        for i in range(5)
+        for column in (
+            (f"day_{i}", mysql.DATE(), lambda fake, _: fake.date_object()),
+            (f"at_{i}", mysql.DATETIME(fsp=6), lambda fake, _: fake.date_time()),
+            (f"ts_{i}", mysql.TIMESTAMP(), lambda fake, _: seconds(fake.date_time())),
+            (
+                f"time_{i}",
+                mysql.TIME(),
+                lambda fake, _: datetime.timedelta(seconds=fake.pyint(0, 86399)),
+            ),
+        )
+    ],
+    "decimals": [
+        (
+            f"amount_{i}",
+            mysql.DECIMAL(18, 4),
+            lambda fake, _: fake.pydecimal(left_digits=12, right_digits=4),
+        )
+        for i in range(20)
+    ],
+    "lobs": [
+        ("body", mysql.TEXT(), lambda fake, _: fake.text(4000)),
+        ("scan", mysql.BLOB(), lambda fake, _: fake.binary(2048)),
+        (
+            "attributes",
+            mysql.JSON(),
+            lambda fake, _: json.dumps(fake.pydict(20, value_types=[str, int])),
+        ),
+    ],
+}
+
+
+def scenario_columns(name):
+    """Return the scenario's (name, type, make value) columns, id first."""
+    return [("id", mysql.BIGINT(), _id), *SCENARIOS[name]]
+
+
+def scenario_rows(name, count):
+    """Return `count` rows of the scenario, as its driver would return them."""
+    fake = Faker()
+    Faker.seed(0)
+    columns = scenario_columns(name)
+    return [tuple(make(fake, i) for _, _, make in columns) for i in range(1, count + 1)]
+
+
+def create_table_ddl(name):
+    """Return the scenario's CREATE TABLE, as SHOW CREATE TABLE gives it."""
+    dialect = mysql.dialect()
+    lines = [
+        f"  `{column}` {type_.compile(dialect=dialect).lower().replace(', ', ',')}"
+        + (" NOT NULL" if column == "id" else " DEFAULT NULL")
+        for column, type_, _ in scenario_columns(name)
+    ]
+    lines.append("  PRIMARY KEY (`id`)")
+    body = ",\n".join(lines)
+    return f"CREATE TABLE `bench_{name}` (\n{body}\n) ENGINE=InnoDB"
+
+
+# Answers to the queries the dialect sets connections up with.
+SETUP_ANSWERS = [
+    ("SELECT VERSION()", ["VERSION()"], [("8.0.36",)]),
+    ("SELECT @@sql_mode", ["@@sql_mode"], [("STRICT_TRANS_TABLES",)]),
+    ("SELECT @@lower_case_table_names", ["@@lower_case_table_names"], [(0,)]),
+    ("SELECT @@transaction_isolation", ["isolation"], [("REPEATABLE-READ",)]),
+]
+
+
+class ReplayError(Exception):
+    """Base of the fake DBAPI's errors."""
+
+
+class ReplayDBAPI:
+    """A DBAPI module whose connections answer with canned results.
+
+    `tables` maps table names to their CREATE TABLE and the rows a SELECT
+    from them returns, replayed over and over until `row_count` rows.
+    """
+
+    paramstyle = "pyformat"
+    apilevel = "2.0"
+    threadsafety = 1
+    Warning = Warning
+    Error = ReplayError
+    InterfaceError = DatabaseError = DataError = OperationalError = ReplayError
+    IntegrityError = InternalError = ProgrammingError = ReplayError
+    NotSupportedError = ReplayError
+
+    def __init__(self):
+        self.tables = {}
+
+    def connect(self, **kwargs):  # noqa: ARG002
+        return ReplayConnection(self)
+
+
+class ReplayConnection:
+    """A DBAPI connection of `ReplayDBAPI`."""
+
+    def __init__(self, dbapi):
+        self.dbapi = dbapi
+
+    def cursor(self, cursor_class=None):  # noqa: ARG002
+        return ReplayCursor(self.dbapi)
+
+    def character_set_name(self):
+        return "utf8mb4"
+
+    def get_server_info(self):
+        return "8.0.36"
+
+    def autocommit(self, value):
+        pass
+
+    def ping(self, reconnect=False):  # noqa: FBT002
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ReplayCursor:
+    """Answers the dialect's setup queries, and replays a table's rows."""
+
+    arraysize = 1
+    lastrowid = None
+
+    def __init__(self, dbapi):
+        self.dbapi = dbapi
+        self.description = None
+        self.rowcount = -1
+        self._rows = iter(())
+
+    def _answer(self, columns, rows):
+        self.description = [
+            (column, 253, None, None, None, None, True) for column in columns
+        ]
+        self._rows = iter(rows)
+
+    def execute(self, statement, parameters=None):  # noqa: ARG002
+        self.description = None
+        self._rows = iter(())
+        words = statement.split()
+        verb = words[0].upper()
+        if verb not in {"SELECT", "SHOW", "EXPLAIN"}:
+            return 0
+        for prefix, columns, rows in SETUP_ANSWERS:
+            if statement.startswith(prefix):
+                self._answer(columns, rows)
+                return 0
+        if statement.startswith("SHOW CREATE TABLE"):
+            table = words[-1].split(".")[-1].strip("`")
+            self._answer(
+                ["Table", "Create Table"], [(table, self.dbapi.tables[table][0])]
+            )
+        else:
+            self._answer(["value"], [])
+            for table, (_, rows, row_count, columns) in self.dbapi.tables.items():
+                if f"`{table}`" in statement or f".{table}" in statement:
+                    self._answer(
+                        columns,
+                        itertools.islice(itertools.cycle(rows), row_count),
+                    )
+                    break
+        return 0
+
+    def executemany(self, statement, parameters):
+        for params in parameters:
+            self.execute(statement, params)
+
+    def fetchone(self):
+        return next(self._rows, None)
+
+    def fetchmany(self, size=None):
+        return list(itertools.islice(self._rows, size or self.arraysize))
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        self._rows = iter(())
+
+
+REPLAY = ReplayDBAPI()
+
+
+class ReplayDialect(MySQLDialect_pymysql):
+    """The PyMySQL dialect, on `REPLAY`."""
+
+    driver = "replay"
+    supports_statement_cache = True
+    supports_server_side_cursors = True
+    _sscursor = ReplayCursor
+
+    @classmethod
+    def import_dbapi(cls):
+        return REPLAY
+
+    def _check_unicode_returns(self, connection):  # noqa: ARG002
+        return True
+
+
+sqlalchemy.dialects.registry.register("mysql.replay", __name__, "ReplayDialect")
+
+
+def database_of(config):
+    """Return the database the config connects to, where tables are created."""
+    if url := config.get("sqlalchemy_url"):
+        return sqlalchemy.engine.make_url(url).database or SCHEMA
+    return config.get("database") or SCHEMA
+
+
+def catalog_for(name, config):
+    """Return a catalog selecting the scenario's table, FULL_TABLE."""
+    schema_name = database_of(config)
+    connector = MySQLConnector(
+        config=config,
+        sqlalchemy_url="mysql://bench@localhost/melty",
+    )
+    properties = {
+        column: connector.to_jsonschema_type(type_)
+        for column, type_, _ in scenario_columns(name)
+    }
+    schema = {"type": "object", "properties": properties}
+    metadata = MetadataMapping.get_standard_metadata(
+        schema=schema,
+        schema_name=schema_name,
+        key_properties=["id"],
+        replication_method="FULL_TABLE",
+    )
+    metadata.root.selected = True
+    table = f"bench_{name}"
+    entry = CatalogEntry(
+        tap_stream_id=f"{schema_name}-{table}",
+        stream=f"{schema_name}-{table}",
+        table=table,
+        key_properties=["id"],
+        schema=Schema.from_dict(schema),
+        metadata=metadata,
+        replication_method="FULL_TABLE",
+    )
+    return Catalog({entry.tap_stream_id: entry}).to_dict()
+
+
+class ByteCounter:
+    """A stdout that counts the bytes written to it, as text or to its buffer."""
+
+    def __init__(self):
+        self.bytes = 0
+        self.buffer = self
+
+    def write(self, data):
+        self.bytes += len(data) if isinstance(data, bytes) else len(data.encode())
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def run_sync(config, catalog):
+    """Sync the catalog's stream to a `ByteCounter`, return it and the seconds."""
+    tap = TapMySQL(config=config, catalog=catalog, setup_mapper=True)
+    sink = ByteCounter()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sink):
+        tap.sync_all()
+    return sink, time.perf_counter() - start
+
+
+def run_get_records(config, catalog):
+    """Read the catalog's stream with `get_records`, return rows and seconds."""
+    tap = TapMySQL(config=config, catalog=catalog)
+    [stream] = tap.streams.values()
+    start = time.perf_counter()
+    rows = sum(1 for _ in stream.get_records(None))
+    return rows, time.perf_counter() - start
+
+
+def load_table(config, name, rows, row_count):
+    """Create the scenario's table on the server, with `row_count` rows."""
+    engine = TapMySQL(config=config, setup_mapper=False).connector._engine  # noqa: SLF001
+    table = f"bench_{name}"
+    columns = [column for column, _, _ in scenario_columns(name)]
+    insert = sqlalchemy.text(
+        f"INSERT INTO `{table}` ({', '.join(f'`{c}`' for c in columns)}) "  # noqa: S608
+        f"VALUES ({', '.join(f':{c}' for c in columns)})"
+    )
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS `{table}`")
+        conn.exec_driver_sql(create_table_ddl(name))
+        ids = itertools.count(1)
+        replayed = itertools.islice(itertools.cycle(rows), row_count)
+        while batch := list(itertools.islice(replayed, 1000)):
+            conn.execute(
+                insert,
+                [dict(zip(columns, (next(ids), *row[1:]))) for row in batch],
+            )
+    engine.dispose()
+
+
+def benchmark(name, args, base_config):
+    """Return the scenario's best rows/sec and its bytes/row."""
+    rows = scenario_rows(name, min(POOL_SIZE, args.rows))
+    config = copy.deepcopy(base_config)
+    config["fetch_size"] = args.fetch_size
+    config["json_encoder"] = args.json_encoder
+    if args.flush_bytes:
+        config["output_flush_bytes"] = args.flush_bytes
+    if args.config:
+        load_table(config, name, rows, args.rows)
+    else:
+        REPLAY.tables[f"bench_{name}"] = (
+            create_table_ddl(name),
+            rows,
+            args.rows,
+            [column for column, _, _ in scenario_columns(name)],
+        )
+    catalog = catalog_for(name, config)
+
+    sync_seconds = records_seconds = float("inf")
+    sink = None
+    for _ in range(args.repeat):
+        sink, seconds = run_sync(config, catalog)
+        sync_seconds = min(sync_seconds, seconds)
+        read, seconds = run_get_records(config, catalog)
+        records_seconds = min(records_seconds, seconds)
+    return {
+        "rows_per_second": round(args.rows / sync_seconds),
+        "get_records_rows_per_second": round(read / records_seconds),
+        "bytes_per_row": round(sink.bytes / args.rows, 1),
+    }
+
+
+def regressions(results, baseline, tolerance):
+    """Return the scenarios that got slower or bigger than in the baseline."""
+    found = []
+    for name, result in results.items():
+        if (before := baseline.get("scenarios", {}).get(name)) is None:
+            continue
+        found.extend(
+            f"{name}: {key} {before[key]:,} -> {result[key]:,}"
+            for key in ("rows_per_second", "get_records_rows_per_second")
+            if result[key] < before[key] * (1 - tolerance)
+        )
+        if result["bytes_per_row"] > before["bytes_per_row"]:
+            found.append(
+                f"{name}: bytes_per_row {before['bytes_per_row']} -> "
+                f"{result['bytes_per_row']}"
+            )
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--fetch-size", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="Scenario to run, all by default. Can be repeated.",
+    )
+    parser.add_argument(
+        "--json-encoder",
+        choices=list(JSON_ENCODERS),
+        default=SIMPLEJSON,
+        help="Library messages are encoded with.",
+    )
+    parser.add_argument(
+        "--flush-bytes",
+        type=int,
+        help="Bytes of messages held before they are written to stdout.",
+    )
+    parser.add_argument("--config", help="Tap config of a server to run against.")
+    parser.add_argument("--save", help="File to save the results to.")
+    parser.add_argument("--baseline", help="Results to compare with.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Drop in rows/sec, as a fraction, flagged as a regression.",
+    )
+    args = parser.parse_args()
+
+    base_config = (
+        json.loads(Path(args.config).read_text(encoding="utf-8"))
+        if args.config
+        else OFFLINE_CONFIG
+    )
+    # Progress and METRIC logs would be timed along with the tap.
+    logging.disable(logging.INFO)
+
+    results = {}
+    print(f"{'Scenario':10s} {'rows/s':>10s} {'get_records':>12s} {'bytes/row':>10s}")
+    for name in args.scenario or SCENARIOS:
+        results[name] = result = benchmark(name, args, base_config)
+        print(
+            f"{name:10s} {result['rows_per_second']:10,d} "
+            f"{result['get_records_rows_per_second']:12,d} "
+            f"{result['bytes_per_row']:10.1f}"
+        )
+
+    report = {
+        "mode": "server" if args.config else "offline",
+        "rows": args.rows,
+        "fetch_size": args.fetch_size,
+        "python": platform.python_version(),
+        "scenarios": results,
+    }
+    if args.save:
+        Path(args.save).write_text(json.dumps(report, indent=2) + "\n")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if baseline.get("mode") != report["mode"] or baseline.get("rows") != args.rows:
+            print("The baseline was run in another mode or with other --rows.")
+        if found := regressions(results, baseline, args.tolerance):
+            print("Regressions:\n  " + "\n  ".join(found))
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
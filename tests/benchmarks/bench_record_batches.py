@@ -0,0 +1,85 @@
+"""Rows/sec of building record dicts from a wide result set.
+
+Compares the previous `result.mappings()` plus `dict(row)` approach with
+`record_batches`, on an in-memory SQLite table so no server is needed.
+
+Run with:
+
+    python tests/benchmarks/bench_record_batches.py --columns 120 --rows 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import sqlalchemy
+
+from tap_mysql.client import record_batches
+
+BATCH_SIZE = 10000
+
+
+def mappings_batches(result, batch_size):
+    """Build records the way `get_records` did before `record_batches`."""
+    for rows in result.mappings().partitions(batch_size):
+        yield [dict(row) for row in rows]
+
+
+def make_table(engine, columns, rows):
+    """Create and fill a table with an id and `columns` mixed type columns."""
+    table = sqlalchemy.Table(
+        "wide",
+        sqlalchemy.MetaData(),
+        sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+        *[
+            sqlalchemy.Column(
+                f"col_{i}",
+                sqlalchemy.Integer if i % 2 else sqlalchemy.String(20),
+            )
+            for i in range(columns)
+        ],
+    )
+    table.metadata.create_all(engine)
+    row = {f"col_{i}": i if i % 2 else f"value {i}" for i in range(columns)}
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [{"id": n, **row} for n in range(rows)])
+    return table
+
+
+def rows_per_second(engine, table, build_batches, rows, repeat):
+    """Return the best rows/sec of `repeat` full reads of the table."""
+    best = float("inf")
+    for _ in range(repeat):
+        with engine.connect() as conn:
+            start = time.perf_counter()
+            count = 0
+            result = conn.execute(table.select())
+            for batch in build_batches(result, BATCH_SIZE):
+                count += len(batch)
+            best = min(best, time.perf_counter() - start)
+        if count != rows:
+            msg = f"Read {count} rows of {rows}."
+            raise RuntimeError(msg)
+    return rows / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--columns", type=int, default=120)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = sqlalchemy.create_engine("sqlite://")
+    table = make_table(engine, args.columns, args.rows)
+    before = rows_per_second(engine, table, mappings_batches, args.rows, args.repeat)
+    after = rows_per_second(engine, table, record_batches, args.rows, args.repeat)
+
+    print(f"{args.columns + 1} columns, {args.rows} rows")
+    print(f"mappings() + dict(row): {before:12,.0f} rows/s")
+    print(f"record_batches:         {after:12,.0f} rows/s ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""MB/s read through an SSH tunnel, with sshtunnel and with the tap's tunnel.
+
+Reads data from a local server through a local paramiko SSH server, which
+stands in for the bastion host, over `--concurrency` connections at once, as
+concurrent streams and partitions do. Both ends run in this process, so it
+measures the tunnels' own overhead: copying and encryption, not the network.
+
+Run from the repository root with:
+
+    python -m tests.benchmarks.bench_ssh --megabytes 256 --concurrency 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import paramiko
+from sshtunnel import SSHTunnelForwarder
+from tests.ssh_server import SSHServer
+
+from tap_mysql.ssh import SSHTunnel
+
+
+class SourceServer:
+    """Sends `size` bytes to every connection, as a large result set would."""
+
+    def __init__(self, size):
+        self.size = size
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self.listener.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        chunk = bytes(2**18)
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._send, args=(sock, chunk), daemon=True).start()
+
+    def _send(self, sock, chunk):
+        with sock:
+            for _ in range(self.size // len(chunk)):
+                sock.sendall(chunk)
+
+    def close(self):
+        """Stop accepting connections."""
+        self.listener.shutdown(socket.SHUT_RDWR)
+        self.listener.close()
+
+
+def read_all(port):
+    """Read a connection to its end, return the bytes read."""
+    size = 0
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        while chunk := sock.recv(2**18):
+            size += len(chunk)
+    return size
+
+
+def megabytes_per_second(tunnel, concurrency):
+    """Return the MB/s read through `tunnel` by `concurrency` connections."""
+    tunnel.start()
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            size = sum(pool.map(read_all, [tunnel.local_bind_port] * concurrency))
+        return size / 1e6 / (time.perf_counter() - start)
+    finally:
+        tunnel.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=int, default=256, help="Per connection.")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--cipher", default="aes128-ctr")
+    args = parser.parse_args()
+    logging.getLogger("paramiko").setLevel(logging.CRITICAL)
+
+    ssh_server = SSHServer()
+    source = SourceServer(args.megabytes * 2**20)
+    key = paramiko.RSAKey.generate(2048)
+    ssh_address = ("127.0.0.1", ssh_server.port)
+    remote_address = ("127.0.0.1", source.port)
+
+    def tuned(connections):
+        return SSHTunnel(
+            ssh_address,
+            "melty",
+            remote_address,
+            pkey=key,
+            ciphers=[args.cipher],
+            connections=connections,
+        )
+
+    tunnels = {
+        "sshtunnel": SSHTunnelForwarder(
+            ssh_address,
+            ssh_username="melty",
+            ssh_pkey=key,
+            remote_bind_address=remote_address,
+            allow_agent=False,
+            host_pkey_directories=[],
+        ),
+        "tuned, 1 connection": tuned(1),
+        f"tuned, {args.concurrency} connections": tuned(args.concurrency),
+    }
+    print(f"{args.concurrency} x {args.megabytes} MB")
+    baseline = None
+    for label, tunnel in tunnels.items():
+        rate = megabytes_per_second(tunnel, args.concurrency)
+        baseline = baseline or rate
+        print(f"{label:26} {rate:8,.1f} MB/s ({rate / baseline:.2f}x)")
+
+    ssh_server.close()
+    source.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Seconds the tap takes to start.
+
+Measures, each in a fresh interpreter:
+
+- importing `tap_mysql.tap`,
+- `tap-mysql --about`,
+- with `--config` (and optionally `--catalog`), the time until the first
+  RECORD message of a sync, which needs a server.
+
+Run with:
+
+    python tests/benchmarks/bench_startup.py
+    python tests/benchmarks/bench_startup.py --config config.json --catalog catalog.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+CLI = "from tap_mysql.tap import TapMySQL; TapMySQL.cli()"
+
+
+def best_seconds(command, repeat):
+    """Return the best wall time of `repeat` runs of `command`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, capture_output=True)  # noqa: S603
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def seconds_to_first_record(command, repeat):
+    """Return the best time until `command` writes its first RECORD message."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with subprocess.Popen(  # noqa: S603
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ) as process:
+            for line in process.stdout:
+                if json.loads(line).get("type") == "RECORD":
+                    best = min(best, time.perf_counter() - start)
+                    break
+            process.kill()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", help="Tap config, to time a sync.")
+    parser.add_argument("--catalog", help="Catalog of the sync, else discovered.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    python = [sys.executable, "-c"]
+    baseline = best_seconds([*python, "pass"], args.repeat)
+    imported = best_seconds([*python, "import tap_mysql.tap"], args.repeat)
+    about = best_seconds([*python, CLI, "--about"], args.repeat)
+    print(f"Interpreter start:    {baseline:6.3f}s")
+    print(f"import tap_mysql.tap: {imported - baseline:6.3f}s")
+    print(f"tap-mysql --about:    {about - baseline:6.3f}s")
+
+    if args.config:
+        sync = [*python, CLI, "--config", args.config]
+        if args.catalog:
+            sync += ["--catalog", args.catalog]
+        first_record = seconds_to_first_record(sync, args.repeat)
+        print(f"Time to first record: {first_record - baseline:6.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Columns/sec of resolving column types during discovery.
+
+Resolves the SQLAlchemy and JSON schema types of every column of a synthetic
+catalog, as discovery does, and compares the per-call resolution the tap used
+before with the memoized resolution of `tap_mysql.sql_types`.
+
+Run with:
+
+    python tests/benchmarks/bench_types.py --columns 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import sqlalchemy
+from singer_sdk import typing as th
+
+from tap_mysql.sql_types import parse_column_type, sdk_type_for_name
+
+
+def make_column_types(columns, seed=0):
+    """Return the types of `columns` columns, as information_schema lists them."""
+    rng = random.Random(seed)
+    kinds = [
+        lambda: "int",
+        lambda: "bigint unsigned",
+        lambda: "tinyint(1)",
+        lambda: f"varchar({rng.randint(1, 255)})",
+        lambda: f"decimal({rng.randint(10, 30)},{rng.randint(0, 8)})",
+        lambda: f"datetime({rng.randint(0, 6)})",
+        lambda: "date",
+        lambda: "text",
+        lambda: "json",
+        lambda: "double",
+    ]
+    return [rng.choice(kinds)() for _ in range(columns)]
+
+
+def old_sqlalchemy_type(col_meta_type):
+    """Parse a column type the way `get_sqlalchemy_type` did before."""
+    dialect = sqlalchemy.dialects.mysql.base.dialect()
+    ischema_names = dialect.ischema_names
+    type_info = col_meta_type.split("(")
+    base_type_name = type_info[0].split(" ")[0]
+    type_args = type_info[1].split(" ")[0].rstrip(")") if len(type_info) > 1 else None
+    type_class = ischema_names.get(base_type_name.lower())
+    if type_args:
+        return type_class(*map(int, type_args.split(",")))
+    return type_class()
+
+
+def old_sdk_typing_object(from_type):
+    """Look up a singer type the way `sdk_typing_object` did before."""
+    sqltype_lookup = {
+        "timestamp": th.DateTimeType(),
+        "datetime": th.DateTimeType(),
+        "date": th.DateType(),
+        "int": th.IntegerType(),
+        "numeric": th.NumberType(),
+        "decimal": th.NumberType(),
+        "double": th.NumberType(),
+        "float": th.NumberType(),
+        "string": th.StringType(),
+        "text": th.StringType(),
+        "char": th.StringType(),
+        "bool": th.BooleanType(),
+        "variant": th.StringType(),
+        "bit": th.IntegerType(),
+    }
+    type_name = from_type if isinstance(from_type, str) else type(from_type).__name__
+    for sqltype, jsonschema_type in sqltype_lookup.items():
+        if sqltype.lower() in type_name.lower():
+            return jsonschema_type
+    return sqltype_lookup["string"]
+
+
+def old_resolve(column_type):
+    """Resolve a column's types as discovery did before."""
+    return (
+        old_sqlalchemy_type(column_type),
+        old_sdk_typing_object(column_type).type_dict,
+    )
+
+
+def new_resolve(column_type):
+    """Resolve a column's types with the memoized functions."""
+    return parse_column_type(column_type), sdk_type_for_name(column_type).type_dict
+
+
+def columns_per_second(resolve, column_types, repeat):
+    """Return the best columns/sec of `repeat` runs over all the columns."""
+    best = float("inf")
+    for _ in range(repeat):
+        parse_column_type.cache_clear()
+        sdk_type_for_name.cache_clear()
+        start = time.perf_counter()
+        for column_type in column_types:
+            resolve(column_type)
+        best = min(best, time.perf_counter() - start)
+    return len(column_types) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--columns", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    column_types = make_column_types(args.columns)
+    before = columns_per_second(old_resolve, column_types, args.repeat)
+    after = columns_per_second(new_resolve, column_types, args.repeat)
+
+    print(f"{args.columns} columns, {len(set(column_types))} distinct types")
+    print(f"Per-call resolution: {before:12,.0f} columns/s")
+    print(f"Memoized resolution: {after:12,.0f} columns/s ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
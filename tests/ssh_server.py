@@ -0,0 +1,114 @@
+"""A local SSH server that forwards ports, standing in for a bastion host."""
+
+# flake8: noqa
+
+from __future__ import annotations
+
+import logging
+import socket
+import threading
+
+import paramiko
+
+# The server's transports log here, not to stderr, clients that hang up
+# before logging in are expected.
+LOG_CHANNEL = "tests.ssh_server"
+logging.getLogger(LOG_CHANNEL).addHandler(logging.NullHandler())
+
+
+class _Forwarding(paramiko.ServerInterface):
+    """Lets anyone in with a key, to forward ports."""
+
+    def __init__(self):
+        self.destinations = {}
+
+    def get_allowed_auths(self, username):  # noqa: ARG002
+        return "publickey"
+
+    def check_auth_publickey(self, username, key):  # noqa: ARG002
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_channel_request(self, kind, chanid):  # noqa: ARG002
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_direct_tcpip_request(self, chanid, origin, destination):  # noqa: ARG002
+        self.destinations[chanid] = destination
+        return paramiko.OPEN_SUCCEEDED
+
+
+def _copy(source, sink):
+    try:
+        while data := source.recv(2**18):
+            sink.sendall(data)
+        sink.shutdown(socket.SHUT_WR)
+    except (OSError, EOFError):
+        pass
+
+
+class SSHServer:
+    """Accepts SSH connections on `port`, and forwards their channels."""
+
+    def __init__(self, window_size=2**21, max_packet_size=2**15):
+        self.host_key = paramiko.RSAKey.generate(2048)
+        self.window_size = window_size
+        self.max_packet_size = max_packet_size
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self.listener.getsockname()[1]
+        self.transports = []
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._session, args=(sock,), daemon=True).start()
+
+    def _session(self, sock):
+        transport = paramiko.Transport(
+            sock,
+            default_window_size=self.window_size,
+            default_max_packet_size=self.max_packet_size,
+        )
+        transport.set_log_channel(LOG_CHANNEL)
+        self.transports.append(transport)
+        transport.add_server_key(self.host_key)
+        server = _Forwarding()
+        try:
+            transport.start_server(server=server)
+        except (paramiko.SSHException, EOFError):  # the client gave up
+            return
+        while (channel := transport.accept()) is not None:
+            target = socket.create_connection(server.destinations[channel.get_id()])
+            threading.Thread(target=_copy, args=(channel, target), daemon=True).start()
+            threading.Thread(target=_copy, args=(target, channel), daemon=True).start()
+
+    def close(self):
+        """Stop accepting connections, and close those accepted."""
+        self.listener.shutdown(socket.SHUT_RDWR)
+        self.listener.close()
+        for transport in self.transports:
+            transport.close()
+
+
+class EchoServer:
+    """Sends back what it receives, on `port`."""
+
+    def __init__(self):
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self.listener.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=_copy, args=(sock, sock), daemon=True).start()
+
+    def close(self):
+        """Stop accepting connections."""
+        self.listener.shutdown(socket.SHUT_RDWR)
+        self.listener.close()
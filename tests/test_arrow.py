@@ -0,0 +1,117 @@
+"""Tests for building Arrow record batches (no server needed)."""
+
+# flake8: noqa
+
+import datetime
+import decimal
+import sys
+
+import pytest
+from sqlalchemy import JSON, Boolean, Column, Integer, Numeric, String
+from sqlalchemy.dialects.mysql import BIGINT, BIT, DATETIME, DOUBLE, TIME
+
+from tap_mysql.arrow import ArrowBatchBuilder, import_pyarrow
+
+pa = pytest.importorskip("pyarrow")
+
+COLUMNS = [
+    Column("id", BIGINT(unsigned=True)),
+    Column("active", Boolean),
+    Column("flags", BIT(10)),
+    Column("ratio", DOUBLE),
+    Column("amount", Numeric(12, 4)),
+    Column("created_at", DATETIME(fsp=6)),
+    Column("starts_at", TIME),
+    Column("name", String(20)),
+    Column("data", JSON),
+]
+ROWS = [
+    (
+        2**64 - 1,
+        1,
+        513,
+        0.5,
+        decimal.Decimal("10000.0001"),
+        datetime.datetime(2024, 6, 10, 6, 15, 20, 123456),
+        datetime.time(9, 30),
+        "café",
+        {"a": [1, 2]},
+    ),
+    (1, 0, 0, None, None, None, None, None, None),
+]
+
+
+def test_column_types():
+    """Columns are typed from their SQL types."""
+    batch = ArrowBatchBuilder(COLUMNS).build(ROWS)
+
+    assert batch.schema == pa.schema(
+        [
+            ("id", pa.uint64()),
+            ("active", pa.bool_()),
+            ("flags", pa.uint64()),
+            ("ratio", pa.float64()),
+            ("amount", pa.decimal128(12, 4)),
+            ("created_at", pa.timestamp("us")),
+            ("starts_at", pa.time64("us")),
+            ("name", pa.string()),
+            ("data", pa.string()),
+        ]
+    )
+    assert batch.to_pylist()[0] == {
+        "id": 2**64 - 1,
+        "active": True,
+        "flags": 513,
+        "ratio": 0.5,
+        "amount": decimal.Decimal("10000.0001"),
+        "created_at": datetime.datetime(2024, 6, 10, 6, 15, 20, 123456),
+        "starts_at": datetime.time(9, 30),
+        "name": "café",
+        "data": '{"a": [1, 2]}',
+    }
+    assert batch.to_pylist()[1]["active"] is False
+
+
+@pytest.mark.parametrize(
+    ("decimal_as", "value", "expected_type"),
+    [("float", 12.5, pa.float64()), ("string", "12.50", pa.string())],
+)
+def test_decimal_as(decimal_as, value, expected_type):
+    """DECIMAL columns are typed as `decimal_as` reads them."""
+    builder = ArrowBatchBuilder([Column("amount", Numeric(4, 2))], decimal_as)
+
+    batch = builder.build([(value,)])
+
+    assert batch.schema.field("amount").type == expected_type
+    assert batch.column(0).to_pylist() == [value]
+
+
+def test_inferred_types():
+    """Without a precision, decimals are typed from their values."""
+    builder = ArrowBatchBuilder([Column("id", Integer), Column("amount", Numeric())])
+
+    batch = builder.build([(1, decimal.Decimal("1.5"))])
+
+    assert batch.column(1).to_pylist() == [decimal.Decimal("1.5")]
+
+
+def test_empty_batch():
+    """A batch without rows still has every column."""
+    batch = ArrowBatchBuilder(COLUMNS).build([])
+
+    assert batch.num_rows == 0
+    assert batch.schema.names == [column.name for column in COLUMNS]
+
+
+def test_invalid_decimal_as():
+    """Unknown `decimal_as` settings are refused."""
+    with pytest.raises(ValueError, match="decimal_as"):
+        ArrowBatchBuilder(COLUMNS, "text")
+
+
+def test_missing_pyarrow(monkeypatch):
+    """Without pyarrow, the error says which extra installs it."""
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    with pytest.raises(ImportError, match="`arrow` extra"):
+        import_pyarrow()
@@ -0,0 +1,87 @@
+"""Tests for writing BATCH files from row tuples (no server needed)."""
+
+# flake8: noqa
+
+import datetime
+import decimal
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from singer_sdk.helpers._batch import BatchConfig
+
+from tap_mysql.batch import BatchFileWriter
+
+KEYS = ("id", "created_at", "birthday", "amount", "blob", "name")
+ROWS = [
+    (
+        1,
+        datetime.datetime(2024, 6, 10, 6, 15, 20),
+        datetime.date(1990, 1, 31),
+        decimal.Decimal("10000.0001"),
+        b"\x01\xff",
+        "café",
+    ),
+    (2, None, None, None, None, None),
+]
+
+
+def make_writer(tmp_path, compression):
+    batch_config = BatchConfig.from_dict(
+        {
+            "encoding": {"format": "jsonl", "compression": compression},
+            "storage": {"root": f"file://{tmp_path}", "prefix": "test-"},
+        }
+    )
+    return BatchFileWriter(batch_config, tap_name="tap-mysql", stream_name="s")
+
+
+@pytest.mark.parametrize(
+    ("compression", "suffix", "open_file"),
+    [("gzip", ".json.gz", gzip.open), ("none", ".json", open)],
+)
+def test_jsonl_files(tmp_path, compression, suffix, open_file):
+    """Rows are written one JSON object per line, in the configured compression."""
+    writer = make_writer(tmp_path, compression)
+
+    manifests = [writer.write(KEYS, ROWS), writer.write(KEYS, ROWS[:1])]
+
+    paths = [Path(url.removeprefix("file://")) for [url] in manifests]
+    assert [path.name[-len(suffix) - 2 :] for path in paths] == [
+        f"-1{suffix}",
+        f"-2{suffix}",
+    ]
+    assert all(path.name.startswith("test-tap-mysql--s-") for path in paths)
+    with open_file(paths[0], "rt", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines[0] == (
+        '{"id":1,"created_at":"2024-06-10T06:15:20","birthday":"1990-01-31",'
+        '"amount":10000.0001,"blob":"01ff","name":"caf\\u00e9"}'
+    )
+    assert json.loads(lines[1]) == dict.fromkeys(KEYS) | {"id": 2}
+
+
+def test_unsupported_format(tmp_path):
+    """Formats other than JSONL and Parquet are refused."""
+    writer = make_writer(tmp_path, "none")
+    writer.batch_config.encoding.format = "csv"
+
+    with pytest.raises(ValueError, match="Unsupported batch encoding format"):
+        writer.write(KEYS, ROWS)
+
+
+def test_parquet_without_pyarrow(tmp_path, monkeypatch):
+    """Parquet batches fail up front, with how to install pyarrow."""
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    batch_config = BatchConfig.from_dict(
+        {
+            "encoding": {"format": "parquet", "compression": "none"},
+            "storage": {"root": f"file://{tmp_path}"},
+        }
+    )
+
+    with pytest.raises(ImportError, match="`parquet` extra"):
+        BatchFileWriter(batch_config, tap_name="tap-mysql", stream_name="s")
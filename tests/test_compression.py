@@ -0,0 +1,66 @@
+"""Tests for protocol compression settings (no server needed)."""
+
+# flake8: noqa
+
+from pathlib import Path
+
+import pytest
+
+from tap_mysql.compression import compression_connect_args
+from tap_mysql.tap import TapMySQL
+
+
+def test_no_compression():
+    assert compression_connect_args("pymysql", None) == {}
+
+
+def test_zlib():
+    assert compression_connect_args("mysqldb", "zlib") == {"compress": True}
+
+
+def test_zstd_option_file():
+    args = compression_connect_args("mysqldb", "zstd", 7)
+
+    options = Path(args["read_default_file"]).read_text(encoding="utf-8")
+    assert "compression-algorithms=zstd,zlib,uncompressed\n" in options
+    assert "zstd-compression-level=7\n" in options
+    assert compression_connect_args("mysqldb", "zstd", 7) == args
+
+
+def test_zstd_includes_default_file(tmp_path):
+    """An option file of the user's own is still read, before the zstd options."""
+    own = tmp_path / "my.cnf"
+    own.write_text("[client]\nssl-mode=REQUIRED\n", encoding="utf-8")
+
+    args = compression_connect_args("mysqldb", "zstd", 7, str(own))
+
+    options = Path(args["read_default_file"]).read_text(encoding="utf-8")
+    assert options.startswith(f"!include {own.resolve()}\n[client]\n")
+    assert "zstd-compression-level=7\n" in options
+    assert args != compression_connect_args("mysqldb", "zstd", 7)
+
+
+@pytest.mark.parametrize(
+    ("driver", "compression", "level", "match"),
+    [
+        ("pymysql", "zlib", None, "does not support protocol compression"),
+        ("mysqldb", "lz4", None, "compression must be one of"),
+        ("mysqldb", "zstd", 23, "from 1 to 22"),
+    ],
+)
+def test_invalid_compression(driver, compression, level, match):
+    with pytest.raises(ValueError, match=match):
+        compression_connect_args(driver, compression, level)
+
+
+def test_driver_in_url():
+    config = {
+        "host": "localhost",
+        "port": 3306,
+        "user": "melty",
+        "password": "secret",
+        "database": "melty",
+        "driver": "mysqldb",
+    }
+    url = TapMySQL.get_sqlalchemy_url(None, config)  # type: ignore[arg-type]
+    assert str(url).startswith("mysql+mysqldb://melty:")
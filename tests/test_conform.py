@@ -0,0 +1,105 @@
+"""Tests for record conformance (no server needed)."""
+
+# flake8: noqa
+
+import datetime
+import decimal
+
+from singer_sdk._singerlib import Schema
+from singer_sdk._singerlib.catalog import MetadataMapping
+
+from tap_mysql.conform import RecordConformer
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": ["integer"]},
+        "price": {"type": ["number", "null"]},
+        "created_at": {"type": ["string", "null"], "format": "date-time"},
+        "birthday": {"type": ["string", "null"], "format": "date"},
+        "starts_at": {"type": ["string", "null"], "format": "time"},
+        "blob": {"type": ["string", "null"]},
+        "is_active": {"type": ["boolean", "null"]},
+        "flag": {"type": ["boolean", "null"]},
+        "flags": {"type": ["integer", "null"]},
+        "data": {"type": ["object", "null"]},
+        "secret": {"type": ["string", "null"]},
+    },
+}
+RECORD = {
+    "id": 1,
+    "price": decimal.Decimal("9.99"),
+    "created_at": datetime.datetime(2024, 6, 10, 6, 15, 20, 123000),
+    "birthday": datetime.date(1990, 1, 31),
+    "starts_at": datetime.time(9, 30),
+    "blob": b"\x01\xff",
+    "is_active": 1,
+    "flag": b"\x00",
+    "flags": 5,
+    "data": {"a": [1, 2]},
+    "secret": "hidden",
+}
+
+
+def make_mask(schema):
+    metadata = MetadataMapping.get_standard_metadata(
+        schema=Schema.from_dict(schema).to_dict(),
+        key_properties=["id"],
+    )
+    metadata.root.selected = True
+    metadata[("properties", "secret")].selected = False
+    return metadata.resolve_selection()
+
+
+def test_conforms_values():
+    """Values are converted as the SDK does, but dates are written as they are."""
+    conform = RecordConformer(SCHEMA, make_mask(SCHEMA), lambda _: None)
+
+    assert conform(dict(RECORD)) == {
+        "id": 1,
+        "price": decimal.Decimal("9.99"),
+        "created_at": "2024-06-10T06:15:20.123000",
+        "birthday": "1990-01-31",
+        "starts_at": "09:30:00",
+        "blob": "01ff",
+        "is_active": True,
+        "flag": False,
+        "flags": 5,
+        "data": {"a": [1, 2]},
+    }
+
+
+def test_dates_keep_their_precision():
+    """Dates are not turned into datetimes, and datetimes keep their timezone."""
+    conform = RecordConformer(SCHEMA, make_mask(SCHEMA), lambda _: None)
+    created_at = datetime.datetime(2024, 6, 10, tzinfo=datetime.timezone.utc)
+
+    record = conform(
+        {"id": 1, "created_at": created_at, "blob": datetime.date(2024, 1, 2)}
+    )
+
+    assert record == {
+        "id": 1,
+        "created_at": "2024-06-10T00:00:00+00:00",
+        "blob": "2024-01-02",
+    }
+
+
+def test_nulls_pass_through():
+    """None is kept for every type."""
+    conform = RecordConformer(SCHEMA, make_mask(SCHEMA), lambda _: None)
+    record = dict.fromkeys(SCHEMA["properties"])
+
+    assert conform(record) == {
+        name: None for name in SCHEMA["properties"] if name != "secret"
+    }
+
+
+def test_unmapped_properties_warned_once():
+    """Properties missing from the schema are dropped, with a single warning."""
+    warnings = []
+    conform = RecordConformer(SCHEMA, make_mask(SCHEMA), warnings.append)
+
+    assert conform({"id": 1, "extra": "x"}) == {"id": 1}
+    assert conform({"id": 2, "extra": "y"}) == {"id": 2}
+    assert warnings == [("extra",)]
@@ -0,0 +1,82 @@
+"""Tests for the driver value converters (no server needed)."""
+
+# flake8: noqa
+
+import datetime
+import decimal
+
+import pytest
+from pymysql.constants import FIELD_TYPE
+from sqlalchemy import Column, MetaData, Numeric, Table
+from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects.mysql import DOUBLE
+
+from tap_mysql.binlog import BinlogDecoder
+from tap_mysql.converters import DecodedBit, driver_conversions
+
+
+def test_zero_dates_are_none():
+    """Zero dates become None, other dates are converted by the driver."""
+    conv = driver_conversions("pymysql")
+
+    assert conv[FIELD_TYPE.DATE]("0000-00-00") is None
+    assert conv[FIELD_TYPE.DATETIME]("0000-00-00 00:00:00") is None
+    assert conv[FIELD_TYPE.TIMESTAMP]("0000-00-00 00:00:00.000000") is None
+    assert conv[FIELD_TYPE.DATE]("2024-06-10") == datetime.date(2024, 6, 10)
+    assert conv[FIELD_TYPE.DATETIME]("2024-06-10 06:15:20.5") == datetime.datetime(
+        2024, 6, 10, 6, 15, 20, 500000
+    )
+
+
+def test_bit_is_int():
+    """BIT values are read as big-endian integers."""
+    conv = driver_conversions("pymysql")
+
+    assert conv[FIELD_TYPE.BIT](b"\x00") == 0
+    assert conv[FIELD_TYPE.BIT](b"\x01\x02") == 258
+
+
+def test_decoded_bit_type():
+    """BIT columns of decoded connections keep their int values as read."""
+    dialect = mysql.dialect()
+
+    assert DecodedBit(10).result_processor(dialect, None) is None
+    assert mysql.BIT(10).result_processor(dialect, None) is not None
+    # The dialect itself is left as it is.
+    assert not dialect.supports_native_bit
+
+
+@pytest.mark.parametrize(
+    ("decimal_as", "expected"),
+    [
+        ("decimal", decimal.Decimal("12.50")),
+        ("float", 12.5),
+        ("string", "12.50"),
+    ],
+)
+def test_decimal_as(decimal_as, expected):
+    """DECIMAL values are read as configured, by the driver and the binlog."""
+    conv = driver_conversions("pymysql", decimal_as=decimal_as)
+    table = Table("t", MetaData(), Column("amount", Numeric(10, 2)))
+    decoder = BinlogDecoder(table, decimal_as=decimal_as)
+
+    value = conv[FIELD_TYPE.NEWDECIMAL]("12.50")
+    assert value == expected
+    assert type(value) is type(expected)
+    value = decoder.decode_row({"amount": decimal.Decimal("12.50")})["amount"]
+    assert value == expected
+    assert type(value) is type(expected)
+
+
+def test_floats_are_not_decimals():
+    """Floating point columns are left alone whatever `decimal_as` is."""
+    table = Table("t", MetaData(), Column("ratio", DOUBLE))
+
+    assert BinlogDecoder(table, decimal_as="string").decode_row({"ratio": 0.5}) == {
+        "ratio": 0.5
+    }
+
+
+def test_unknown_driver():
+    """Drivers that do not take a `conv` map get none."""
+    assert driver_conversions("mysqlconnector") is None
@@ -1,8 +1,12 @@
 # flake8: noqa
 
+import contextlib
 import copy
 import datetime
 import decimal
+import gzip
+import hashlib
+import io
 import json
 
 import pytest
@@ -13,6 +17,7 @@ from singer_sdk.testing.runners import TapTestRunner
 from sqlalchemy import Column, DateTime, Integer, MetaData, Numeric, String, Table, text
 from sqlalchemy.dialects.mysql import DATE, DATETIME, JSON, TIME
 
+from tap_mysql.client import MySQLStream
 from tap_mysql.tap import TapMySQL
 
 from .test_replication_key import TABLE_NAME, TapTestReplicationKey
@@ -283,6 +288,60 @@ def test_decimal():
             assert "number" in schema_message["schema"]["properties"]["column"]["type"]
 
 
+def test_driver_conversions():
+    """Zero dates are null, BIT is an integer and decimals follow `decimal_as`."""
+    table_name = "test_driver_conversions"
+    stream_name = f"melty-{table_name}"
+    engine = sqlalchemy.create_engine(SAMPLE_CONFIG["sqlalchemy_url"])
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+        conn.execute(
+            text(
+                f"CREATE TABLE {table_name} (id INT PRIMARY KEY, "
+                "created_at DATETIME, birthday DATE, flags BIT(10), "
+                "amount DECIMAL(12, 4))"
+            )
+        )
+        conn.execute(text("SET SESSION sql_mode = ''"))
+        conn.execute(
+            text(
+                f"INSERT INTO {table_name} VALUES "
+                "(1, '0000-00-00 00:00:00', '0000-00-00', b'1000000001', 1.5), "
+                "(2, '2024-06-10 06:15:20', '2024-06-10', b'0', 10000.0001)"
+            )
+        )
+
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config["decimal_as"] = "string"
+    tap = TapMySQL(config=config)
+    tap_catalog = select_only(json.loads(tap.catalog_json_text), stream_name)
+    test_runner = MySQLTestRunner(
+        tap_class=TapMySQL,
+        config=config,
+        catalog=tap_catalog,
+    )
+    test_runner.sync_all()
+
+    schema = test_runner.schema_messages[0]["schema"]["properties"]
+    assert "string" in schema["amount"]["type"]
+    assert test_runner.records[stream_name] == [
+        {
+            "id": 1,
+            "created_at": None,
+            "birthday": None,
+            "flags": 513,
+            "amount": "1.5000",
+        },
+        {
+            "id": 2,
+            "created_at": "2024-06-10T06:15:20",
+            "birthday": "2024-06-10",
+            "flags": 0,
+            "amount": "10000.0001",
+        },
+    ]
+
+
 def test_filter_schemas():
     """Only return tables from a given schema"""
     table_name = "test_filter_schemas"
@@ -305,6 +364,669 @@ def test_filter_schemas():
     assert tap_catalog["streams"][0]["stream"] == altered_table_name
 
 
+def test_discovery_cache(tmp_path):
+    """Discovery reuses cached entries of tables that did not change."""
+    schema_name = "discovery_cache_schema"
+    engine = sqlalchemy.create_engine(SAMPLE_CONFIG["sqlalchemy_url"])
+    metadata_obj = MetaData(schema=schema_name)
+    Table("unchanged", metadata_obj, Column("id", Integer, primary_key=True))
+    Table("altered", metadata_obj, Column("id", Integer, primary_key=True))
+    with engine.connect() as conn:
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema_name}"))
+        metadata_obj.drop_all(conn)
+        metadata_obj.create_all(conn)
+        conn.commit()
+
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config["filter_schemas"] = [schema_name]
+    uncached = json.loads(TapMySQL(config=config).catalog_json_text)
+    config["discovery_cache_path"] = str(tmp_path / "discovery.json")
+    first = json.loads(TapMySQL(config=config).catalog_json_text)
+    second = json.loads(TapMySQL(config=config).catalog_json_text)
+    assert first == second == uncached
+    assert (tmp_path / "discovery.json").exists()
+
+    with engine.connect() as conn:
+        conn.execute(
+            text(f"ALTER TABLE {schema_name}.altered ADD COLUMN name VARCHAR(10)")
+        )
+    altered = json.loads(TapMySQL(config=config).catalog_json_text)
+    streams = {stream["stream"]: stream for stream in altered["streams"]}
+    assert "name" in streams[f"{schema_name}-altered"]["schema"]["properties"]
+    assert altered["streams"] != second["streams"]
+    assert streams[f"{schema_name}-unchanged"] in second["streams"]
+
+
+def select_only(
+    tap_catalog, *stream_names, replication_method="FULL_TABLE", replication_key=None
+):
+    """Select only the given streams (and all their columns) in a discovered catalog."""
+    for stream in tap_catalog["streams"]:
+        selected = stream["stream"] in stream_names
+        for metadata in stream["metadata"]:
+            metadata["metadata"]["selected"] = selected
+            if selected and metadata["breadcrumb"] == []:
+                metadata["metadata"]["replication-method"] = replication_method
+                if replication_key:
+                    metadata["metadata"]["replication-key"] = replication_key
+    return tap_catalog
+
+
+def test_stream_results_options():
+    """Buffered and streamed reads return the same rows, whatever the fetch size."""
+    table_name = "test_stream_results"
+    stream_name = f"melty-{table_name}"
+    setup_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    tap = TapMySQL(config=SAMPLE_CONFIG)
+    tap_catalog = select_only(json.loads(tap.catalog_json_text), stream_name)
+
+    records = []
+    for stream_results in (True, False):
+        config = copy.deepcopy(SAMPLE_CONFIG)
+        config["stream_options"] = {
+            stream_name: {"stream_results": stream_results, "fetch_size": 2},
+        }
+        test_runner = MySQLTestRunner(
+            tap_class=TapMySQL,
+            config=config,
+            catalog=tap_catalog,
+        )
+        test_runner.sync_all()
+        records.append(test_runner.records[stream_name])
+
+    teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+    assert len(records[0]) == 5
+    assert records[0] == records[1]
+
+
+def test_full_table_chunks_resume():
+    """A chunked FULL_TABLE sync resumes after the last primary key in state."""
+    table_name = "test_full_table_chunks"
+    stream_name = f"melty-{table_name}"
+    setup_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config["full_table_chunk_size"] = 2
+    tap = TapMySQL(config=config)
+    tap_catalog = select_only(json.loads(tap.catalog_json_text), stream_name)
+    state = {
+        "bookmarks": {
+            stream_name: {
+                "last_pk_fetched": {"id": 3},
+                "max_pk_values": {"id": 5},
+            },
+        },
+    }
+    test_runner = MySQLTestRunner(
+        tap_class=TapMySQL,
+        config=config,
+        catalog=tap_catalog,
+        state=state,
+    )
+    test_runner.sync_all()
+    teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    assert [r["id"] for r in test_runner.records[stream_name]] == [4, 5]
+    final_state = test_runner.state_messages[-1]["value"]["bookmarks"][stream_name]
+    assert "last_pk_fetched" not in final_state
+
+
+class Killed(Exception):
+    """Stands for the tap being killed in the middle of a sync."""
+
+
+def sync_until_killed(config, catalog):
+    """Sync until `Killed` is raised, returning the messages written until then."""
+    stdout = io.StringIO()
+    tap = TapMySQL(config=config, catalog=catalog)
+    with contextlib.redirect_stdout(stdout), pytest.raises(Killed):
+        tap.sync_all()
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def batched_ids(messages):
+    """Ids of the rows in the batch files of BATCH messages."""
+    ids = []
+    for message in messages:
+        if message.get("type") == "BATCH":
+            for url in message["manifest"]:
+                with gzip.open(url.removeprefix("file://"), "rt") as f:
+                    ids.extend(json.loads(line)["id"] for line in f)
+    return ids
+
+
+def test_batched_chunks_checkpoint_after_batch_files(tmp_path, monkeypatch):
+    """A batched chunked sync killed between chunks saves no key past its files."""
+    table_name = "test_batched_chunks_killed"
+    stream_name = f"melty-{table_name}"
+    setup_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config["full_table_chunk_size"] = 2
+    config["batch_config"] = {
+        "encoding": {"format": "jsonl", "compression": "gzip"},
+        "storage": {"root": f"file://{tmp_path}"},
+        "batch_size": 3,
+    }
+    tap = TapMySQL(config=config)
+    tap_catalog = select_only(json.loads(tap.catalog_json_text), stream_name)
+
+    queries = []
+    iter_query_records = MySQLStream._iter_query_records
+
+    def killed_on_third_chunk(self, conn, query):
+        queries.append(query)
+        if len(queries) == 3:
+            raise Killed
+        return iter_query_records(self, conn, query)
+
+    monkeypatch.setattr(MySQLStream, "_iter_query_records", killed_on_third_chunk)
+    messages = sync_until_killed(config, tap_catalog)
+    teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    # Rows 1 to 3 are in a batch file, row 4 was read but never written.
+    assert batched_ids(messages) == [1, 2, 3]
+    saved = [
+        message["value"]["bookmarks"][stream_name].get("last_pk_fetched")
+        for message in messages
+        if message["type"] == "STATE"
+        and stream_name in message["value"].get("bookmarks", {})
+    ]
+    assert {"id": 4} not in saved
+    assert saved[-1] == {"id": 2}
+
+
+def test_full_table_chunks_resume_binary_key():
+    """A chunked FULL_TABLE sync resumes after a binary primary key in state."""
+    table_name = "test_full_table_chunks_binary"
+    stream_name = f"melty-{table_name}"
+    engine = sqlalchemy.create_engine(SAMPLE_CONFIG["sqlalchemy_url"])
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+        conn.execute(
+            text(
+                f"CREATE TABLE {table_name} "
+                "(id VARBINARY(16) PRIMARY KEY, name VARCHAR(100))"
+            )
+        )
+        conn.execute(
+            text(f"INSERT INTO {table_name} VALUES (:id, :name)"),
+            [{"id": bytes([0, i]), "name": f"row {i}"} for i in range(1, 6)],
+        )
+
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config["full_table_chunk_size"] = 2
+    tap = TapMySQL(config=config)
+    tap_catalog = select_only(json.loads(tap.catalog_json_text), stream_name)
+    # Key values are saved as hex.
+    state = {
+        "bookmarks": {
+            stream_name: {
+                "last_pk_fetched": {"id": "0003"},
+                "max_pk_values": {"id": "0005"},
+            },
+        },
+    }
+    test_runner = MySQLTestRunner(
+        tap_class=TapMySQL,
+        config=config,
+        catalog=tap_catalog,
+        state=state,
+    )
+    test_runner.sync_all()
+    teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    assert [r["name"] for r in test_runner.records[stream_name]] == ["row 4", "row 5"]
+
+
+def test_partitioned_full_table():
+    """A partitioned FULL_TABLE stream plans its ranges when its sync starts."""
+    table_name = "test_partitioned_full_table"
+    stream_name = f"melty-{table_name}"
+    setup_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config["partition_count"] = 2
+    tap = TapMySQL(config=config)
+    tap_catalog = select_only(json.loads(tap.catalog_json_text), stream_name)
+    tap = TapMySQL(config=config, catalog=tap_catalog)
+    stream = tap.streams[stream_name]
+    assert stream.state_partitioning_keys == []
+    # Reading the partitions plans nothing.
+    assert stream.partitions is None
+    assert "partition_plan" not in stream.stream_state
+
+    test_runner = MySQLTestRunner(
+        tap_class=TapMySQL,
+        config=config,
+        catalog=tap_catalog,
+    )
+    test_runner.sync_all()
+    teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    assert sorted(r["id"] for r in test_runner.records[stream_name]) == [1, 2, 3, 4, 5]
+    final_state = test_runner.state_messages[-1]["value"]["bookmarks"][stream_name]
+    assert "partition_plan" not in final_state
+
+
+def test_incremental_pages_resume():
+    """A paged INCREMENTAL sync resumes after the replication key and primary key."""
+    table_name = "test_incremental_pages"
+    stream_name = f"melty-{table_name}"
+    setup_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+    engine = sqlalchemy.create_engine(SAMPLE_CONFIG["sqlalchemy_url"])
+    with engine.begin() as conn:
+        conn.execute(text(f"UPDATE {table_name} SET updated_at = '2022-11-15'"))
+
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config["incremental_chunk_size"] = 2
+    tap = TapMySQL(config=config)
+    tap_catalog = select_only(
+        json.loads(tap.catalog_json_text),
+        stream_name,
+        replication_method="INCREMENTAL",
+        replication_key="updated_at",
+    )
+    state = {
+        "bookmarks": {
+            stream_name: {
+                "replication_key": "updated_at",
+                "replication_key_value": "2022-11-15T00:00:00",
+                "replication_key_pk": {"id": 2},
+            },
+        },
+    }
+    test_runner = MySQLTestRunner(
+        tap_class=TapMySQL,
+        config=config,
+        catalog=tap_catalog,
+        state=state,
+    )
+    test_runner.sync_all()
+    teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    assert [r["id"] for r in test_runner.records[stream_name]] == [3, 4, 5]
+    final_state = test_runner.state_messages[-1]["value"]["bookmarks"][stream_name]
+    assert final_state["replication_key_pk"] == {"id": 5}
+
+
+def test_incremental_pages_resume_binary_key():
+    """A paged INCREMENTAL sync resumes after a binary primary key in state."""
+    table_name = "test_incremental_pages_binary"
+    stream_name = f"melty-{table_name}"
+    engine = sqlalchemy.create_engine(SAMPLE_CONFIG["sqlalchemy_url"])
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+        conn.execute(
+            text(
+                f"CREATE TABLE {table_name} (id VARBINARY(16) PRIMARY KEY, "
+                "updated_at DATETIME NOT NULL, name VARCHAR(100))"
+            )
+        )
+        conn.execute(
+            text(f"INSERT INTO {table_name} VALUES (:id, '2022-11-15', :name)"),
+            [{"id": bytes([0, i]), "name": f"row {i}"} for i in range(1, 6)],
+        )
+
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config["incremental_chunk_size"] = 2
+    tap = TapMySQL(config=config)
+    tap_catalog = select_only(
+        json.loads(tap.catalog_json_text),
+        stream_name,
+        replication_method="INCREMENTAL",
+        replication_key="updated_at",
+    )
+    state = {
+        "bookmarks": {
+            stream_name: {
+                "replication_key": "updated_at",
+                "replication_key_value": "2022-11-15T00:00:00",
+                "replication_key_pk": {"id": "0002"},
+            },
+        },
+    }
+    test_runner = MySQLTestRunner(
+        tap_class=TapMySQL,
+        config=config,
+        catalog=tap_catalog,
+        state=state,
+    )
+    test_runner.sync_all()
+    teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    assert [r["name"] for r in test_runner.records[stream_name]] == [
+        "row 3",
+        "row 4",
+        "row 5",
+    ]
+    final_state = test_runner.state_messages[-1]["value"]["bookmarks"][stream_name]
+    assert final_state["replication_key_pk"] == {"id": "0005"}
+
+
+def test_incremental_pages_null_replication_key():
+    """Rows with a NULL replication key are read first, without moving the state."""
+    table_name = "test_incremental_pages_null"
+    stream_name = f"melty-{table_name}"
+    engine = sqlalchemy.create_engine(SAMPLE_CONFIG["sqlalchemy_url"])
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+        conn.execute(
+            text(
+                f"CREATE TABLE {table_name} (id INT PRIMARY KEY, "
+                "updated_at DATETIME NULL, name VARCHAR(100))"
+            )
+        )
+        conn.execute(
+            text(f"INSERT INTO {table_name} VALUES (:id, :updated_at, :name)"),
+            [
+                {"id": 1, "updated_at": None, "name": "row 1"},
+                {"id": 2, "updated_at": "2022-11-15", "name": "row 2"},
+                {"id": 3, "updated_at": None, "name": "row 3"},
+                {"id": 4, "updated_at": "2022-11-16", "name": "row 4"},
+                {"id": 5, "updated_at": "2022-11-16", "name": "row 5"},
+            ],
+        )
+
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config["incremental_chunk_size"] = 2
+    tap = TapMySQL(config=config)
+    tap_catalog = select_only(
+        json.loads(tap.catalog_json_text),
+        stream_name,
+        replication_method="INCREMENTAL",
+        replication_key="updated_at",
+    )
+    test_runner = MySQLTestRunner(
+        tap_class=TapMySQL,
+        config=config,
+        catalog=tap_catalog,
+    )
+    test_runner.sync_all()
+    teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    assert [r["id"] for r in test_runner.records[stream_name]] == [1, 3, 2, 4, 5]
+    bookmarks = [
+        message["value"]["bookmarks"].get(stream_name, {})
+        for message in test_runner.state_messages
+    ]
+    # No state saved points at a row with a NULL replication key.
+    assert {"id": 1} not in [b.get("replication_key_pk") for b in bookmarks]
+    assert {"id": 3} not in [b.get("replication_key_pk") for b in bookmarks]
+    assert bookmarks[-1]["replication_key_value"] == "2022-11-16T00:00:00"
+    assert bookmarks[-1]["replication_key_pk"] == {"id": 5}
+
+
+def test_consistent_snapshot():
+    """Streams read from one snapshot save its binlog position in state."""
+    table_names = ["test_snapshot_a", "test_snapshot_b"]
+    stream_names = [f"melty-{table_name}" for table_name in table_names]
+    for table_name in table_names:
+        setup_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config["consistent_snapshot"] = True
+    config["max_concurrent_streams"] = 2
+    tap = TapMySQL(config=config)
+    tap_catalog = select_only(json.loads(tap.catalog_json_text), *stream_names)
+    test_runner = MySQLTestRunner(
+        tap_class=TapMySQL,
+        config=config,
+        catalog=tap_catalog,
+    )
+    test_runner.sync_all()
+    for table_name in table_names:
+        teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    bookmarks = test_runner.state_messages[-1]["value"]["bookmarks"]
+    positions = [
+        bookmarks[stream_name]["snapshot_position"] for stream_name in stream_names
+    ]
+    assert positions[0] == positions[1]
+    assert positions[0]["log_file"]
+    for stream_name in stream_names:
+        assert len(test_runner.records[stream_name]) == 5
+
+
+def test_lob_policies(tmp_path):
+    """Large values are truncated, hashed or written to side files."""
+    table_name = "test_lob_policies"
+    stream_name = f"melty-{table_name}"
+    engine = sqlalchemy.create_engine(SAMPLE_CONFIG["sqlalchemy_url"])
+    body = "x" * 3000
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+        conn.execute(
+            text(
+                f"CREATE TABLE {table_name} "
+                "(id INT PRIMARY KEY, body LONGTEXT, summary TEXT, attributes JSON)"
+            )
+        )
+        conn.execute(
+            text(f"INSERT INTO {table_name} VALUES (1, :body, :body, :attributes)"),
+            {"body": body, "attributes": '{"a": 1}'},
+        )
+
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config["lob_policy"] = "hash"
+    config["lob_storage_root"] = str(tmp_path)
+    config["stream_options"] = {
+        stream_name: {"lob_columns": {"body": "file", "summary": "truncate"}},
+    }
+    config["lob_max_length"] = 10
+    tap = TapMySQL(config=config)
+    tap_catalog = select_only(json.loads(tap.catalog_json_text), stream_name)
+    test_runner = MySQLTestRunner(
+        tap_class=TapMySQL,
+        config=config,
+        catalog=tap_catalog,
+    )
+    test_runner.sync_all()
+    teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    [record] = test_runner.records[stream_name]
+    digest = hashlib.sha256(body.encode()).hexdigest()
+    assert record["body"].endswith(f"{stream_name}/body/{digest}")
+    assert (tmp_path / stream_name / "body" / digest).read_text() == body
+    assert record["summary"] == "x" * 10
+    assert record["attributes"] == hashlib.sha256(b'{"a": 1}').hexdigest()
+
+
+def test_stage_metrics(tmp_path):
+    """Stage metrics go to an OpenMetrics file, and a stream is profiled."""
+    table_name = "test_stage_metrics"
+    stream_name = f"melty-{table_name}"
+    setup_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config["openmetrics_path"] = str(tmp_path / "tap-mysql.prom")
+    config["profile_stream"] = stream_name
+    config["profile_path"] = str(tmp_path / "profile.folded")
+    config["profile_interval"] = 0.001
+    tap = TapMySQL(config=config)
+    tap_catalog = select_only(json.loads(tap.catalog_json_text), stream_name)
+    test_runner = MySQLTestRunner(
+        tap_class=TapMySQL,
+        config=config,
+        catalog=tap_catalog,
+    )
+    test_runner.sync_all()
+    teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    text = (tmp_path / "tap-mysql.prom").read_text()
+    assert f'tap_mysql_rows_read_total{{stream="{stream_name}"}} 5' in text
+    assert f'tap_mysql_queries_total{{stream="{stream_name}"}} 1' in text
+    assert f'tap_mysql_read_bytes_total{{stream="{stream_name}"}}' in text
+    assert text.endswith("# EOF\n")
+    assert (tmp_path / "profile.folded").exists()
+
+
+def test_extraction_plan():
+    """The plan of a stream warns of an unindexed replication key."""
+    table_name = "test_extraction_plan"
+    stream_name = f"melty-{table_name}"
+    setup_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    tap = TapMySQL(config=SAMPLE_CONFIG)
+    tap_catalog = select_only(
+        json.loads(tap.catalog_json_text),
+        stream_name,
+        replication_method="INCREMENTAL",
+        replication_key="updated_at",
+    )
+    plans = TapMySQL(config=SAMPLE_CONFIG, catalog=tap_catalog).plan_extraction()
+    teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    assert [plan["tap_stream_id"] for plan in plans] == [stream_name]
+    assert plans[0]["strategy"] == "single_scan"
+    assert plans[0]["replication_key_index"] is None
+    assert plans[0]["warnings"][0].startswith("No index starts with")
+    # A small table is best read in one query.
+    assert plans[0]["recommended_strategy"] == "single_scan"
+    assert plans[0]["recommendation"].endswith("few enough to read in one query.")
+
+
+def test_row_count_estimate():
+    """Discovered streams have their table's estimated row count."""
+    table_name = "test_row_count_estimate"
+    stream_name = f"melty-{table_name}"
+    setup_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    tap = TapMySQL(config=SAMPLE_CONFIG)
+    entries = {entry["tap_stream_id"]: entry for entry in tap.catalog_dict["streams"]}
+    estimates = tap.connector.get_table_estimates(["melty"], [("melty", table_name)])
+    teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    assert isinstance(entries[stream_name]["row_count"], int)
+    row_count, data_length = estimates["melty", table_name]
+    assert row_count == entries[stream_name]["row_count"]
+    assert data_length > 0
+
+
+def test_max_concurrent_streams():
+    """Streams synced concurrently write every record after their schema."""
+    table_names = ["test_concurrent_a", "test_concurrent_b", "test_concurrent_c"]
+    stream_names = [f"melty-{table_name}" for table_name in table_names]
+    for table_name in table_names:
+        setup_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config["max_concurrent_streams"] = 3
+    tap = TapMySQL(config=config)
+    tap_catalog = select_only(json.loads(tap.catalog_json_text), *stream_names)
+    test_runner = MySQLTestRunner(
+        tap_class=TapMySQL,
+        config=config,
+        catalog=tap_catalog,
+    )
+    test_runner.sync_all()
+    for table_name in table_names:
+        teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    for stream_name in stream_names:
+        assert len(test_runner.records[stream_name]) == 5
+    schemas_seen = set()
+    for message in test_runner.raw_messages:
+        if message.get("type") == "SCHEMA":
+            schemas_seen.add(message["stream"])
+        elif message.get("type") == "RECORD":
+            assert message["stream"] in schemas_seen
+    final_state = test_runner.state_messages[-1]["value"]["bookmarks"]
+    assert set(stream_names) <= set(final_state)
+
+
+def test_batch_files(tmp_path):
+    """Batch files hold every row, and the bookmark follows the files."""
+    table_name = "test_batch_files"
+    stream_name = f"melty-{table_name}"
+    setup_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config["batch_config"] = {
+        "encoding": {"format": "jsonl", "compression": "gzip"},
+        "storage": {"root": f"file://{tmp_path}"},
+        "batch_size": 2,
+    }
+    tap = TapMySQL(config=config)
+    tap_catalog = select_only(
+        json.loads(tap.catalog_json_text),
+        stream_name,
+        replication_method="INCREMENTAL",
+        replication_key="updated_at",
+    )
+    test_runner = MySQLTestRunner(
+        tap_class=TapMySQL,
+        config=config,
+        catalog=tap_catalog,
+    )
+    test_runner.sync_all()
+    teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    batches = [m for m in test_runner.raw_messages if m.get("type") == "BATCH"]
+    assert len(batches) == 3
+    records = []
+    for batch in batches:
+        for url in batch["manifest"]:
+            with gzip.open(url.removeprefix("file://"), "rt") as f:
+                records.extend(json.loads(line) for line in f)
+    assert len(records) == 5
+    bookmark = test_runner.state_messages[-1]["value"]["bookmarks"][stream_name]
+    assert bookmark["replication_key_value"].startswith(
+        max(record["updated_at"] for record in records)
+    )
+
+
+def test_log_based_replication():
+    """A LOG_BASED stream copies the table once, then reads changes from the binlog."""
+    pytest.importorskip("pymysqlreplication")
+    table_name = "test_log_based"
+    stream_name = f"melty-{table_name}"
+    setup_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    tap = TapMySQL(config=SAMPLE_CONFIG)
+    tap_catalog = select_only(json.loads(tap.catalog_json_text), stream_name)
+    for stream in tap_catalog["streams"]:
+        if stream["stream"] == stream_name:
+            stream["replication_method"] = "LOG_BASED"
+
+    test_runner = MySQLTestRunner(
+        tap_class=TapMySQL,
+        config=SAMPLE_CONFIG,
+        catalog=tap_catalog,
+    )
+    test_runner.sync_all()
+    assert len(test_runner.records[stream_name]) == 5
+    state = test_runner.state_messages[-1]["value"]
+    assert "log_file" in state["bookmarks"][stream_name]
+
+    engine = sqlalchemy.create_engine(SAMPLE_CONFIG["sqlalchemy_url"])
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                f"INSERT INTO {table_name} (id, updated_at, name) "
+                "VALUES (6, '2022-11-15 00:00:00', 'Sam')"
+            )
+        )
+        conn.execute(text(f"UPDATE {table_name} SET name = 'Kim' WHERE id = 1"))
+        conn.execute(text(f"DELETE FROM {table_name} WHERE id = 2"))
+
+    test_runner = MySQLTestRunner(
+        tap_class=TapMySQL,
+        config=SAMPLE_CONFIG,
+        catalog=tap_catalog,
+        state=state,
+    )
+    test_runner.sync_all()
+    teardown_test_table(table_name, SAMPLE_CONFIG["sqlalchemy_url"])
+
+    records = test_runner.records[stream_name]
+    assert [(r["id"], r["name"]) for r in records[:2]] == [(6, "Sam"), (1, "Kim")]
+    assert records[0]["_sdc_deleted_at"] is None
+    assert records[2]["id"] == 2
+    assert records[2]["_sdc_deleted_at"] is not None
+
+
 class MySQLTestRunner(TapTestRunner):
     def run_sync_dry_run(self) -> bool:
         """Dislike this function and how TestRunner does this so just hacking it here.
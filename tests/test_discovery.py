@@ -0,0 +1,355 @@
+"""Tests for bulk discovery and its cache (no server needed)."""
+
+# flake8: noqa
+
+import json
+
+import pytest
+import sqlalchemy
+from sqlalchemy import text
+
+from tap_mysql.discovery import (
+    DiscoveryCache,
+    leading_index_columns,
+    reflect_tables,
+    schema_columns,
+    table_estimates,
+    table_fingerprints,
+)
+
+SETTINGS = {"decimal_as": "decimal", "is_vitess": False, "reflect_indices": True}
+ENTRY = {"tap_stream_id": "melty-orders", "table_name": "orders"}
+
+
+def write_cache(path, settings=SETTINGS):
+    cache = DiscoveryCache(path, settings)
+    cache.put("melty", "orders", "BASE TABLE/3/123/1/456", ENTRY)
+    cache.save()
+
+
+def test_cached_entry_reused_while_fingerprint_matches(tmp_path):
+    path = tmp_path / "cache" / "discovery.json"
+    write_cache(path)
+
+    cache = DiscoveryCache(path, SETTINGS)
+    assert cache.get("melty", "orders", "BASE TABLE/3/123/1/456") == ENTRY
+    assert cache.get("melty", "orders", "BASE TABLE/4/789/1/456") is None
+    assert cache.get("melty", "orders", None) is None
+    assert cache.get("melty", "customers", "BASE TABLE/3/123/1/456") is None
+
+
+def test_cache_ignored_with_other_settings(tmp_path):
+    path = tmp_path / "discovery.json"
+    write_cache(path)
+
+    cache = DiscoveryCache(path, {**SETTINGS, "decimal_as": "string"})
+    assert cache.get("melty", "orders", "BASE TABLE/3/123/1/456") is None
+
+
+def test_unreadable_cache_ignored(tmp_path):
+    path = tmp_path / "discovery.json"
+    path.write_text("{not json")
+
+    cache = DiscoveryCache(path, SETTINGS)
+    assert cache.get("melty", "orders", "BASE TABLE/3/123/1/456") is None
+
+    missing = DiscoveryCache(tmp_path / "missing.json", SETTINGS)
+    assert missing.get("melty", "orders", "BASE TABLE/3/123/1/456") is None
+
+
+def test_save_keeps_only_tables_discovered_this_time(tmp_path):
+    path = tmp_path / "discovery.json"
+    write_cache(path)
+
+    cache = DiscoveryCache(path, SETTINGS)
+    cache.put("melty", "customers", "BASE TABLE/2/1/0/0", {"table_name": "c"})
+    cache.put("melty", "orders_view", None, {"table_name": "v"})
+    cache.save()
+
+    tables = json.loads(path.read_text())["tables"]
+    assert list(tables) == ["melty.customers"]
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.fixture
+def information_schema():
+    """A SQLite connection with the information_schema tables discovery reads."""
+    engine = sqlalchemy.create_engine("sqlite://")
+    with engine.connect() as conn:
+        conn.execute(text("ATTACH DATABASE ':memory:' AS information_schema"))
+        conn.execute(
+            text(
+                "CREATE TABLE information_schema.TABLES "
+                "(TABLE_SCHEMA, TABLE_NAME, TABLE_TYPE, TABLE_ROWS, DATA_LENGTH)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE information_schema.COLUMNS (TABLE_SCHEMA, TABLE_NAME, "
+                "COLUMN_NAME, ORDINAL_POSITION, COLUMN_TYPE, IS_NULLABLE, "
+                "COLUMN_DEFAULT, EXTRA, COLUMN_COMMENT)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE information_schema.STATISTICS (TABLE_SCHEMA, "
+                "TABLE_NAME, INDEX_NAME, NON_UNIQUE, SEQ_IN_INDEX, COLUMN_NAME)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO information_schema.TABLES "
+                "VALUES (:s, :t, :type, :rows, :length)"
+            ),
+            [
+                {
+                    "s": "melty",
+                    "t": "orders",
+                    "type": "BASE TABLE",
+                    "rows": 1200,
+                    "length": 98304,
+                },
+                {
+                    "s": "melty",
+                    "t": "order_totals",
+                    "type": "VIEW",
+                    "rows": None,
+                    "length": None,
+                },
+                {
+                    "s": "melty",
+                    "t": "events",
+                    "type": "BASE TABLE",
+                    "rows": 0,
+                    "length": 16384,
+                },
+                {
+                    "s": "other",
+                    "t": "orders",
+                    "type": "BASE TABLE",
+                    "rows": 7,
+                    "length": 16384,
+                },
+            ],
+        )
+        conn.execute(
+            text(
+                "INSERT INTO information_schema.COLUMNS VALUES "
+                "(:s, :t, :name, :pos, :type, :null, NULL, :extra, :comment)"
+            ),
+            [
+                {
+                    "s": "melty",
+                    "t": "orders",
+                    "name": "amount",
+                    "pos": 3,
+                    "type": "decimal(25,4) unsigned",
+                    "null": "YES",
+                    "extra": "",
+                    "comment": "",
+                },
+                {
+                    "s": "melty",
+                    "t": "orders",
+                    "name": "id",
+                    "pos": 1,
+                    "type": "int",
+                    "null": "NO",
+                    "extra": "auto_increment",
+                    "comment": "",
+                },
+                {
+                    "s": "melty",
+                    "t": "orders",
+                    "name": "shop",
+                    "pos": 2,
+                    "type": "tinyint(1)",
+                    "null": "NO",
+                    "extra": "",
+                    "comment": "Shop id",
+                },
+                {
+                    "s": "melty",
+                    "t": "order_totals",
+                    "name": "total",
+                    "pos": 1,
+                    "type": "double",
+                    "null": "YES",
+                    "extra": "",
+                    "comment": "",
+                },
+                {
+                    "s": "melty",
+                    "t": "events",
+                    "name": "code",
+                    "pos": 1,
+                    "type": "varchar(10)",
+                    "null": "NO",
+                    "extra": "",
+                    "comment": "",
+                },
+            ],
+        )
+        conn.execute(
+            text(
+                "INSERT INTO information_schema.STATISTICS VALUES "
+                "(:s, :t, :index, :non_unique, :seq, :column)"
+            ),
+            [
+                {
+                    "s": "melty",
+                    "t": "orders",
+                    "index": "shop_id",
+                    "non_unique": 0,
+                    "seq": 2,
+                    "column": "id",
+                },
+                {
+                    "s": "melty",
+                    "t": "orders",
+                    "index": "shop_id",
+                    "non_unique": 0,
+                    "seq": 1,
+                    "column": "shop",
+                },
+                {
+                    "s": "melty",
+                    "t": "orders",
+                    "index": "PRIMARY",
+                    "non_unique": 0,
+                    "seq": 1,
+                    "column": "id",
+                },
+                {
+                    "s": "melty",
+                    "t": "events",
+                    "index": "code",
+                    "non_unique": 1,
+                    "seq": 1,
+                    "column": "code",
+                },
+            ],
+        )
+        yield conn
+
+
+def test_reflect_tables(information_schema):
+    tables = reflect_tables(information_schema, ["melty"])
+
+    assert list(tables) == [
+        ("melty", "events"),
+        ("melty", "order_totals"),
+        ("melty", "orders"),
+    ]
+    orders = tables["melty", "orders"]
+    assert not orders.is_view
+    assert [
+        (column["name"], repr(column["type"]), column["nullable"], column["comment"])
+        for column in orders.columns
+    ] == [
+        ("id", "INTEGER()", False, None),
+        ("shop", "TINYINT(display_width=1)", False, "Shop id"),
+        ("amount", "DECIMAL(unsigned=True, precision=25, scale=4)", True, None),
+    ]
+    assert orders.primary_key == {"constrained_columns": ["id"], "name": None}
+    assert orders.indexes == [
+        {"name": "shop_id", "column_names": ["shop", "id"], "unique": True}
+    ]
+
+    events = tables["melty", "events"]
+    assert events.primary_key == {"constrained_columns": [], "name": None}
+    assert events.indexes == [
+        {"name": "code", "column_names": ["code"], "unique": False}
+    ]
+
+    view = tables["melty", "order_totals"]
+    assert view.is_view
+    assert view.primary_key is None
+    assert [column["name"] for column in view.columns] == ["total"]
+
+
+def test_reflect_some_tables(information_schema):
+    tables = reflect_tables(
+        information_schema,
+        ["melty", "other"],
+        [("melty", "events"), ("other", "orders")],
+        reflect_indices=False,
+    )
+
+    assert list(tables) == [("melty", "events"), ("other", "orders")]
+    assert tables["melty", "events"].indexes == []
+    assert reflect_tables(information_schema, ["melty"], []) == {}
+
+
+def test_schema_columns(information_schema):
+    columns = schema_columns(information_schema, "melty")
+
+    assert list(columns) == ["events", "order_totals", "orders"]
+    assert columns["orders"] == [
+        {"Field": "id", "Type": "int", "Null": "NO"},
+        {"Field": "shop", "Type": "tinyint(1)", "Null": "NO"},
+        {"Field": "amount", "Type": "decimal(25,4) unsigned", "Null": "YES"},
+    ]
+    assert schema_columns(information_schema, "missing") == {}
+
+
+def test_leading_index_columns(information_schema):
+    assert leading_index_columns(information_schema, "melty", "orders") == {
+        "id": "PRIMARY",
+        "shop": "shop_id",
+    }
+    assert leading_index_columns(information_schema, "melty", "order_totals") == {}
+
+
+def test_table_estimates(information_schema):
+    assert table_estimates(information_schema, ["melty"]) == {
+        ("melty", "orders"): (1200, 98304),
+        ("melty", "order_totals"): (None, None),
+        ("melty", "events"): (0, 16384),
+    }
+    assert table_estimates(
+        information_schema, ["melty", "other"], [("other", "orders")]
+    ) == {("other", "orders"): (7, 16384)}
+    assert table_estimates(information_schema, ["melty"], []) == {}
+
+
+class FingerprintConnection:
+    """Answers fingerprint queries from canned rows, recording their schemas."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queried = []
+
+    def execute(self, query, params):
+        self.queried.append(params["schema_names"])
+        return [row for row in self.rows if row[0] in params["schema_names"]]
+
+
+def test_table_fingerprints():
+    conn = FingerprintConnection(
+        [
+            ("melty", "orders", "BASE TABLE/3/123/1/456"),
+            ("other", "orders", "VIEW/2/789//"),
+        ]
+    )
+    assert table_fingerprints(conn, ["melty", "other"]) == {
+        ("melty", "orders"): "BASE TABLE/3/123/1/456",
+        ("other", "orders"): "VIEW/2/789//",
+    }
+    assert conn.queried == [["melty", "other"]]
+    assert table_fingerprints(conn, []) == {}
+
+
+def test_table_fingerprints_per_schema():
+    """On Vitess, each keyspace is fingerprinted by a query of its own."""
+    conn = FingerprintConnection(
+        [
+            ("melty", "orders", "BASE TABLE/3/123/1/456"),
+            ("other", "orders", "VIEW/2/789//"),
+        ]
+    )
+    assert table_fingerprints(conn, ["melty", "other"], per_schema=True) == {
+        ("melty", "orders"): "BASE TABLE/3/123/1/456",
+        ("other", "orders"): "VIEW/2/789//",
+    }
+    assert conn.queried == [["melty"], ["other"]]
@@ -0,0 +1,164 @@
+"""Tests for stage metrics and the sampling profiler (no server needed)."""
+
+# flake8: noqa
+
+import json
+import logging
+import sys
+import threading
+import time
+
+import sqlalchemy
+
+from tap_mysql.instrumentation import (
+    FETCH,
+    FIRST_ROW,
+    QUERY,
+    SERIALIZE,
+    SamplingProfiler,
+    StageMetrics,
+    SyncMetrics,
+    bytes_sent,
+    folded_stack,
+    openmetrics_text,
+)
+
+
+def logged_points(caplog):
+    return [
+        json.loads(record.getMessage().removeprefix("METRIC: "))
+        for record in caplog.records
+        if record.getMessage().startswith("METRIC: ")
+    ]
+
+
+def test_timed_batches_counts_queries_and_rows():
+    stage_metrics = StageMetrics("melty-orders")
+    executed = time.perf_counter()
+    batches = [[{"id": 1}, {"id": 2}], [{"id": 3}]]
+    assert list(stage_metrics.timed_batches(executed, batches)) == batches
+    assert list(stage_metrics.timed_batches(time.perf_counter(), [])) == []
+
+    assert stage_metrics.queries == 2
+    assert stage_metrics.rows == 3
+    assert stage_metrics.seconds[QUERY] >= 0
+    assert stage_metrics.seconds[FIRST_ROW] >= stage_metrics.seconds[FETCH] > 0
+
+
+def test_report_logs_metric_lines(caplog):
+    stage_metrics = StageMetrics("melty-orders")
+    stage_metrics.add(SERIALIZE, 1.5)
+    stage_metrics.add_bytes(2048)
+    with caplog.at_level(logging.INFO):
+        stage_metrics.report()
+
+    points = logged_points(caplog)
+    serialize = next(
+        point
+        for point in points
+        if point["metric"] == "stage_duration" and point["tags"]["stage"] == SERIALIZE
+    )
+    assert serialize == {
+        "type": "timer",
+        "metric": "stage_duration",
+        "value": 1.5,
+        "tags": {"stream": "melty-orders", "stage": SERIALIZE},
+    }
+    metric_names = {point["metric"] for point in points}
+    assert {"query_count", "rows_read", "bytes_read", "rows_per_second"} <= metric_names
+
+
+def test_reports_periodically(caplog):
+    reports = []
+    stage_metrics = StageMetrics(
+        "melty-orders",
+        interval=0,
+        on_report=lambda: reports.append(stage_metrics.rows),
+    )
+    with caplog.at_level(logging.INFO):
+        list(stage_metrics.timed_batches(time.perf_counter(), [[{}], [{}, {}]]))
+    assert reports == [1, 3]
+
+
+def test_openmetrics_text():
+    orders = StageMetrics("melty-orders")
+    orders.add(QUERY, 0.25)
+    orders.add_bytes(100)
+    customers = StageMetrics('melty-"customers"')
+
+    text = openmetrics_text([orders, customers])
+    lines = text.splitlines()
+    assert lines[-1] == "# EOF"
+    assert "# TYPE tap_mysql_stage_seconds counter" in lines
+    assert "# UNIT tap_mysql_stage_seconds seconds" in lines
+    assert (
+        'tap_mysql_stage_seconds_total{stream="melty-orders",stage="query"} 0.25'
+        in lines
+    )
+    assert 'tap_mysql_read_bytes_total{stream="melty-orders"} 100' in lines
+    assert 'tap_mysql_rows_read_total{stream="melty-\\"customers\\""} 0' in lines
+    # Only the process's peak RSS, not one per stream.
+    assert (
+        len([line for line in lines if line.startswith("tap_mysql_peak_rss_bytes ")])
+        == 1
+    )
+
+
+def test_sync_metrics_export(tmp_path):
+    path = tmp_path / "tap-mysql.prom"
+    sync_metrics = SyncMetrics(openmetrics_path=str(path))
+    sync_metrics.stream("melty-orders").report()
+    sync_metrics.stream("melty-customers").report()
+
+    text = path.read_text()
+    assert 'stream="melty-orders"' in text
+    assert 'stream="melty-customers"' in text
+    assert text.endswith("# EOF\n")
+    assert [p.name for p in tmp_path.iterdir()] == ["tap-mysql.prom"]
+
+
+def test_bytes_sent_without_session_status():
+    engine = sqlalchemy.create_engine("sqlite://")
+    with engine.connect() as conn:
+        assert bytes_sent(conn) is None
+
+
+def spin(stop):
+    while not stop.is_set():
+        sum(range(100))
+
+
+def test_profiler_samples_tracked_threads(tmp_path):
+    profiler = SamplingProfiler(interval=0.001)
+    stop = threading.Event()
+
+    def tracked():
+        with profiler.track():
+            spin(stop)
+
+    untracked = threading.Thread(target=spin, args=(stop,))
+    thread = threading.Thread(target=tracked)
+    profiler.start()
+    untracked.start()
+    thread.start()
+    time.sleep(0.1)
+    stop.set()
+    thread.join()
+    untracked.join()
+    profiler.stop()
+
+    path = tmp_path / "melty-orders.folded"
+    samples = profiler.write(path)
+    assert samples > 0
+    lines = path.read_text().splitlines()
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == samples
+    # Only the tracked thread's stacks.
+    assert all("tracked;" in line for line in lines)
+    assert any("tracked;tests.test_instrumentation:spin" in line for line in lines)
+
+
+def test_folded_stack():
+    frame = sys._getframe()  # noqa: SLF001
+    stack = folded_stack(frame).split(";")
+    assert stack[-1] == "tests.test_instrumentation:test_folded_stack"
+    assert len(stack) > 1
@@ -0,0 +1,86 @@
+"""Tests for keyset page conditions (no server needed)."""
+
+# flake8: noqa
+
+import datetime
+import decimal
+import itertools
+import json
+
+import sqlalchemy
+from sqlalchemy.dialects import mysql
+
+from tap_mysql.client import key_from_state, key_to_state, rows_after
+
+
+def test_rows_after_sql():
+    a, b, c = sqlalchemy.column("a"), sqlalchemy.column("b"), sqlalchemy.column("c")
+    sql = str(
+        rows_after([a, b, c], [1, 2, 3]).compile(
+            dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert sql == "a > 1 OR a = 1 AND (b > 2 OR b = 2 AND c > 3)"
+
+
+def test_rows_after_selects_later_rows():
+    engine = sqlalchemy.create_engine("sqlite://")
+    metadata = sqlalchemy.MetaData()
+    table = sqlalchemy.Table(
+        "pairs",
+        metadata,
+        sqlalchemy.Column("a", sqlalchemy.Integer),
+        sqlalchemy.Column("b", sqlalchemy.Integer),
+    )
+    metadata.create_all(engine)
+    rows = list(itertools.product(range(3), range(3)))
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [{"a": a, "b": b} for a, b in rows])
+        for last in rows:
+            query = (
+                sqlalchemy.select(table.c.a, table.c.b)
+                .where(rows_after([table.c.a, table.c.b], list(last)))
+                .order_by(table.c.a, table.c.b)
+            )
+            assert [tuple(row) for row in conn.execute(query)] == [
+                row for row in rows if row > last
+            ]
+
+
+def saved(value):
+    """Return a key value as it is read back from a STATE message."""
+    return json.loads(json.dumps(key_to_state(value)))
+
+
+def test_key_state_round_trip():
+    for value, sql_type in [
+        (b"\x00\xffkey", mysql.VARBINARY(16)),
+        (datetime.datetime(2024, 1, 2, 3, 4, 5, 6), mysql.DATETIME(fsp=6)),
+        (datetime.date(2024, 1, 2), mysql.DATE()),
+        (decimal.Decimal("12345678901234567890.1234"), mysql.DECIMAL(24, 4)),
+        (datetime.timedelta(hours=-838, microseconds=5), mysql.TIME(fsp=6)),
+        (7, mysql.BIGINT()),
+        ("key", mysql.VARCHAR(10)),
+    ]:
+        assert key_from_state(saved(value), sql_type) == value
+
+
+def test_binary_key_resumes_after_saved_key():
+    engine = sqlalchemy.create_engine("sqlite://")
+    metadata = sqlalchemy.MetaData()
+    table = sqlalchemy.Table(
+        "keys",
+        metadata,
+        sqlalchemy.Column("id", sqlalchemy.LargeBinary, primary_key=True),
+    )
+    metadata.create_all(engine)
+    keys = [b"\x00\x01", b"\x00\x02", b"\x7f", b"\xff"]
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [{"id": key} for key in keys])
+        last = key_from_state(saved(b"\x00\x02"), table.c.id.type)
+        query = (
+            sqlalchemy.select(table.c.id)
+            .where(rows_after([table.c.id], [last]))
+            .order_by(table.c.id)
+        )
+        assert [row.id for row in conn.execute(query)] == [b"\x7f", b"\xff"]
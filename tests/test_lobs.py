@@ -0,0 +1,251 @@
+"""Tests for large object policies and side files (no server needed)."""
+
+# flake8: noqa
+
+import hashlib
+import threading
+
+import pytest
+import sqlalchemy
+from sqlalchemy.dialects import mysql
+
+from tap_mysql import lobs
+from tap_mysql.lobs import (
+    FILE,
+    HASH,
+    INLINE,
+    TRUNCATE,
+    LobStore,
+    apply_policy,
+    as_text,
+    column_policy,
+    is_json_schema,
+    is_lob,
+    select_column,
+)
+
+TABLE = sqlalchemy.Table(
+    "documents",
+    sqlalchemy.MetaData(),
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("title", mysql.VARCHAR(200)),
+    sqlalchemy.Column("body", mysql.LONGTEXT),
+    sqlalchemy.Column("scan", mysql.MEDIUMBLOB),
+    sqlalchemy.Column("attributes", mysql.JSON),
+)
+
+
+def compiled(expression):
+    return str(
+        sqlalchemy.select(expression).compile(
+            dialect=mysql.dialect(),
+            compile_kwargs={"literal_binds": True},
+        )
+    )
+
+
+def test_is_lob():
+    assert [column.name for column in TABLE.columns if is_lob(column)] == [
+        "body",
+        "scan",
+        "attributes",
+    ]
+
+
+def test_is_json_schema():
+    assert is_json_schema({"type": ["object", "null"]})
+    assert is_json_schema({"type": "object"})
+    assert not is_json_schema({"type": ["string", "null"]})
+    assert not is_json_schema({})
+
+
+def test_column_policy_precedence():
+    config = {
+        "lob_policy": HASH,
+        "lob_columns": {"body": TRUNCATE},
+        "stream_options": {
+            "db-documents": {"lob_policy": FILE, "lob_columns": {"scan": INLINE}},
+        },
+    }
+    assert column_policy(config, "db-documents", "scan") == INLINE
+    assert column_policy(config, "db-documents", "body") == TRUNCATE
+    assert column_policy(config, "db-documents", "attributes") == FILE
+    assert column_policy(config, "db-other", "attributes") == HASH
+    assert column_policy({}, "db-documents", "body") == INLINE
+
+
+def test_column_policy_unknown():
+    with pytest.raises(ValueError, match="LOB policy must be one of"):
+        column_policy({"lob_policy": "zip"}, "db-documents", "body")
+
+
+def test_select_truncate():
+    body = select_column(TABLE.c.body, TRUNCATE, max_length=100)
+    assert compiled(body) == (
+        "SELECT substring(documents.body, 1, 100) AS body \nFROM documents"
+    )
+    attributes = select_column(TABLE.c.attributes, TRUNCATE, max_length=100)
+    assert isinstance(attributes.type, sqlalchemy.String)
+
+
+def test_select_hash():
+    assert compiled(select_column(TABLE.c.scan, HASH, max_length=100)) == (
+        "SELECT sha2(documents.scan, 256) AS scan \nFROM documents"
+    )
+
+
+def test_select_file_hashes_text_as_utf8():
+    assert compiled(select_column(TABLE.c.body, FILE, max_length=100)) == (
+        "SELECT sha2(CAST(documents.body AS CHAR CHARACTER SET utf8mb4), 256) "
+        "AS body \nFROM documents"
+    )
+    assert compiled(select_column(TABLE.c.scan, FILE, max_length=100)) == (
+        "SELECT sha2(documents.scan, 256) AS scan \nFROM documents"
+    )
+
+
+def test_select_inline():
+    assert select_column(TABLE.c.body, INLINE, max_length=100) is TABLE.c.body
+
+
+def reader(value, reads):
+    """Return a `read_chunk` of `value`, appending each read to `reads`."""
+
+    def read_chunk(offset, size):
+        reads.append((offset, size))
+        return value[offset - 1 : offset - 1 + size]
+
+    return read_chunk
+
+
+def test_store_reads_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(lobs, "CHUNK_SIZE", 4)
+    value = "ten chars!"
+    digest = hashlib.sha256(value.encode()).hexdigest()
+    store = LobStore(str(tmp_path), "db-documents")
+    reads = []
+    try:
+        url = store.put("body", digest, reader(value, reads))
+    finally:
+        store.close()
+
+    path = tmp_path / "db-documents" / "body" / digest
+    assert path.read_text() == value
+    assert url.endswith(f"db-documents/body/{digest}")
+    assert reads == [(1, 4), (5, 4), (9, 4)]
+
+
+def test_store_skips_stored_values(tmp_path):
+    value = b"\x00\x01 scan"
+    digest = hashlib.sha256(value).hexdigest()
+    store = LobStore(str(tmp_path), "db-documents")
+    reads = []
+    try:
+        first = store.put("scan", digest, reader(value, reads))
+        second = store.put("scan", digest, reader(value, reads))
+    finally:
+        store.close()
+
+    assert first == second
+    assert reads == [(1, lobs.CHUNK_SIZE)]
+
+
+def test_store_names_changed_values_by_their_hash(tmp_path):
+    # The row was updated between reading its hash and reading its value.
+    stale = hashlib.sha256(b"before").hexdigest()
+    actual = hashlib.sha256(b"after").hexdigest()
+    store = LobStore(str(tmp_path), "db-documents")
+    try:
+        url = store.put("scan", stale, reader(b"after", []))
+    finally:
+        store.close()
+
+    assert url.endswith(actual)
+    assert not (tmp_path / "db-documents" / "scan" / stale).exists()
+    assert (tmp_path / "db-documents" / "scan" / actual).read_bytes() == b"after"
+
+
+def test_store_skips_deleted_rows(tmp_path):
+    # The row was deleted between reading its hash and reading its value.
+    digest = hashlib.sha256(b"gone").hexdigest()
+    store = LobStore(str(tmp_path), "db-documents")
+    try:
+        url = store.put("scan", digest, lambda offset, size: None)
+    finally:
+        store.close()
+
+    assert url is None
+    assert not (tmp_path / "db-documents" / "scan").exists()
+
+
+def test_store_writes_a_value_once_across_threads(tmp_path):
+    value = b"shared by many rows"
+    digest = hashlib.sha256(value).hexdigest()
+    store = LobStore(str(tmp_path), "db-documents")
+    reads = []
+    started = threading.Barrier(4)
+
+    def put():
+        started.wait()
+        return store.put("scan", digest, reader(value, reads))
+
+    try:
+        threads = [threading.Thread(target=put) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        store.close()
+
+    assert reads == [(1, lobs.CHUNK_SIZE)]
+    assert (tmp_path / "db-documents" / "scan" / digest).read_bytes() == value
+
+
+def test_store_checks_storage_once_per_value(tmp_path, monkeypatch):
+    value = "body"
+    digest = hashlib.sha256(value.encode()).hexdigest()
+    store = LobStore(str(tmp_path), "db-documents")
+    exists = []
+    fs_exists = store._fs.exists
+    monkeypatch.setattr(
+        store._fs, "exists", lambda path: exists.append(path) or fs_exists(path)
+    )
+    try:
+        first = store.put("body", digest, reader(value, []))
+        assert store.stored("body", digest) == first
+        assert store.put("body", digest, reader(value, [])) == first
+    finally:
+        store.close()
+
+    assert len(exists) == 1
+
+
+def test_store_put_value(tmp_path):
+    store = LobStore(str(tmp_path), "db-documents")
+    try:
+        url = store.put_value("body", "Crème")
+    finally:
+        store.close()
+
+    digest = hashlib.sha256("Crème".encode()).hexdigest()
+    assert url.endswith(f"db-documents/body/{digest}")
+    assert (tmp_path / "db-documents" / "body" / digest).read_text() == "Crème"
+
+
+def test_apply_policy():
+    assert apply_policy("ten chars!", TRUNCATE, max_length=3) == "ten"
+    assert apply_policy(b"\x00\x01\x02", TRUNCATE, max_length=2) == b"\x00\x01"
+    assert (
+        apply_policy("Crème", HASH, max_length=3)
+        == hashlib.sha256("Crème".encode()).hexdigest()
+    )
+    assert (
+        apply_policy(b"scan", HASH, max_length=3) == hashlib.sha256(b"scan").hexdigest()
+    )
+
+
+def test_as_text():
+    assert as_text({"a": [1, "é"]}, is_json=True) == '{"a": [1, "é"]}'
+    assert as_text("x", is_json=True) == '"x"'
+    assert as_text("x", is_json=False) == "x"
@@ -0,0 +1,49 @@
+"""Tests for the files kept between runs (no server needed)."""
+
+# flake8: noqa
+
+import time
+
+from tap_mysql.local_cache import ProbeCache, read_json, write_json
+
+
+def test_write_json_replaces_file(tmp_path):
+    path = tmp_path / "cache" / "probe.json"
+    write_json(path, {"a": 1})
+    write_json(path, {"b": 2})
+
+    assert read_json(path) == {"b": 2}
+    assert list(path.parent.iterdir()) == [path]
+
+
+def test_read_json_ignores_missing_and_invalid_files(tmp_path):
+    path = tmp_path / "probe.json"
+    assert read_json(path) is None
+    path.write_text("{not json")
+    assert read_json(path) is None
+
+
+def test_probe_cache(tmp_path):
+    path = tmp_path / "probe.json"
+    cache = ProbeCache(path, ttl=60)
+    assert cache.get("is_vitess:db:3306") is None
+
+    cache.set("is_vitess:db:3306", False)
+    cache.set("is_vitess:other:3306", True)
+
+    cache = ProbeCache(path, ttl=60)
+    assert cache.get("is_vitess:db:3306") is False
+    assert cache.get("is_vitess:other:3306") is True
+
+
+def test_probe_cache_expires(tmp_path, monkeypatch):
+    path = tmp_path / "probe.json"
+    ProbeCache(path, ttl=60).set("is_vitess:db:3306", True)
+
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    cache = ProbeCache(path, ttl=60)
+    assert cache.get("is_vitess:db:3306") is None
+
+    cache.set("is_vitess:other:3306", False)
+    assert list(read_json(path)) == ["is_vitess:other:3306"]
@@ -0,0 +1,184 @@
+"""Tests for fast message encoding and the buffered output sink (no server needed)."""
+
+# flake8: noqa
+
+import datetime
+import decimal
+import io
+import json
+import sys
+
+import pytest
+from singer_sdk._singerlib import RecordMessage, StateMessage
+from singer_sdk._singerlib.json import serialize_json
+
+from tap_mysql import output
+from tap_mysql.output import (
+    MSGSPEC,
+    ORJSON,
+    SIMPLEJSON,
+    OutputSink,
+    encode_default,
+    json_encoder,
+)
+
+TIME_EXTRACTED = datetime.datetime(2024, 1, 2, 3, 4, 5, 6, tzinfo=datetime.timezone.utc)
+RECORD = {
+    "id": 1,
+    "price": 1.5,
+    "name": "Melty",
+    "born": datetime.date(2024, 1, 2),
+    "opens": datetime.time(9, 30),
+    "updated": datetime.datetime(2024, 1, 2, 3, 4, 5, 6),
+    "deleted": None,
+    "tags": ["a", "b"],
+}
+
+
+def sdk_line(message):
+    return (serialize_json(message.to_dict()) + "\n").encode()
+
+
+def test_simplejson_is_the_sdks():
+    assert json_encoder(SIMPLEJSON) is None
+
+
+def test_unknown_encoder():
+    with pytest.raises(ValueError, match="JSON encoder must be one of"):
+        json_encoder("ujson")
+
+
+def test_encoder_not_installed(monkeypatch):
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+    with pytest.raises(ValueError, match="pip install msgspec"):
+        json_encoder(MSGSPEC)
+
+
+def test_encode_default():
+    assert encode_default(b"\x00\xff") == "00ff"
+    assert encode_default(memoryview(b"\x01")) == "01"
+    assert encode_default(datetime.datetime(2024, 1, 2)) == "2024-01-02T00:00:00"
+    assert encode_default(decimal.Decimal("1.50")) == "1.50"
+
+
+def test_orjson_matches_the_sdk():
+    pytest.importorskip("orjson")
+    encode = json_encoder(ORJSON)
+    record = RecordMessage(
+        stream="melty-orders",
+        record=RECORD,
+        time_extracted=TIME_EXTRACTED,
+    )
+    assert encode(record.to_dict()) == sdk_line(record)
+    state = StateMessage(value={"bookmarks": {"melty-orders": {"id": 1}}})
+    assert encode(state.to_dict()) == sdk_line(state)
+
+
+def test_orjson_writes_text_as_utf8():
+    pytest.importorskip("orjson")
+    record = RecordMessage(stream="melty-orders", record={"name": "Crème"})
+    line = json_encoder(ORJSON)(record.to_dict())
+    assert "Crème".encode() in line
+    assert json.loads(line) == json.loads(sdk_line(record))
+
+
+def test_orjson_decimals():
+    orjson = pytest.importorskip("orjson")
+    encode = json_encoder(ORJSON)
+    record = RecordMessage(
+        stream="melty-orders",
+        record={"total": decimal.Decimal("12345678901234567890.10")},
+    )
+    if not hasattr(orjson, "Fragment"):
+        # Left to the SDK.
+        with pytest.raises(TypeError):
+            encode(record.to_dict())
+        return
+    assert encode(record.to_dict()) == sdk_line(record)
+
+
+def test_msgspec_decimals():
+    pytest.importorskip("msgspec")
+    record = RecordMessage(
+        stream="melty-orders",
+        record={"total": decimal.Decimal("12345678901234567890.10")},
+    )
+    line = json_encoder(MSGSPEC)(record.to_dict())
+    assert b'"total":12345678901234567890.10' in line
+
+
+class FakeStdout(io.StringIO):
+    """A text stdout over a binary buffer, recording what reaches it."""
+
+    def __init__(self):
+        super().__init__()
+        self.buffer = io.BytesIO()
+
+
+def fake_stdout(monkeypatch):
+    # Set in the test, as pytest sets its own once fixtures are set up.
+    fake = FakeStdout()
+    monkeypatch.setattr(sys, "stdout", fake)
+    return fake
+
+
+def test_unbuffered_sink_writes_each_line(monkeypatch):
+    stdout = fake_stdout(monkeypatch)
+    sink = OutputSink()
+    assert not sink.buffered
+    sink.write(b"{}\n")
+    assert stdout.buffer.getvalue() == b"{}\n"
+
+
+def test_sink_flushes_on_bytes(monkeypatch):
+    stdout = fake_stdout(monkeypatch)
+    sink = OutputSink(flush_bytes=8)
+    sink.write(b"{}\n")
+    sink.write(b"{}\n")
+    assert stdout.buffer.getvalue() == b""
+    sink.write(b"{}\n")
+    assert stdout.buffer.getvalue() == b"{}\n{}\n{}\n"
+
+
+def test_sink_flushes_on_records(monkeypatch):
+    stdout = fake_stdout(monkeypatch)
+    sink = OutputSink(flush_records=2)
+    sink.write(b"1\n")
+    assert stdout.buffer.getvalue() == b""
+    sink.write(b"2\n")
+    sink.write(b"3\n")
+    assert stdout.buffer.getvalue() == b"1\n2\n"
+    sink.flush()
+    assert stdout.buffer.getvalue() == b"1\n2\n3\n"
+
+
+def test_sink_flushes_on_time(monkeypatch):
+    stdout = fake_stdout(monkeypatch)
+    now = [100.0]
+    monkeypatch.setattr(output.time, "monotonic", lambda: now[0])
+    sink = OutputSink(flush_seconds=1)
+    sink.write(b"1\n")
+    now[0] += 0.5
+    sink.write(b"2\n")
+    assert stdout.buffer.getvalue() == b""
+    now[0] += 0.5
+    sink.write(b"3\n")
+    assert stdout.buffer.getvalue() == b"1\n2\n3\n"
+
+
+def test_sink_writes_text_first(monkeypatch):
+    stdout = fake_stdout(monkeypatch)
+    sink = OutputSink(flush_records=1)
+    stdout.write("text\n")
+    sink.write(b"{}\n")
+    assert stdout.getvalue() == "text\n"
+    assert stdout.buffer.getvalue() == b"{}\n"
+
+
+def test_sink_to_captured_stdout(monkeypatch):
+    captured = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", captured)
+    sink = OutputSink(flush_records=2)
+    sink.write('{"name":"Crème"}\n'.encode())
+    sink.flush()
+    assert captured.getvalue() == '{"name":"Crème"}\n'
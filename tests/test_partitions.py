@@ -0,0 +1,66 @@
+"""Tests for partition range planning and concurrent partition reads."""
+
+# flake8: noqa
+
+import datetime
+
+import pytest
+
+from tap_mysql.partitions import PartitionReader, histogram_bounds, linear_bounds
+
+
+def test_linear_bounds_integers():
+    """Integer ranges are split into near-equal widths."""
+    assert linear_bounds(1, 100, 4) == [26, 51, 76]
+    assert linear_bounds(1, 2, 4) == [2]
+    assert linear_bounds(5, 5, 4) == []
+
+
+def test_linear_bounds_datetimes():
+    """Datetime ranges are split on equal time spans."""
+    lower = datetime.datetime(2024, 1, 1)
+    upper = datetime.datetime(2024, 1, 5)
+    assert linear_bounds(lower, upper, 2) == [datetime.datetime(2024, 1, 3)]
+
+
+def test_histogram_bounds():
+    """Cut points follow the cumulative frequency of histogram buckets."""
+    equi_height = {
+        "histogram-type": "equi-height",
+        "buckets": [[1, 10, 0.7, 10], [11, 20, 0.8, 10], [21, 30, 1.0, 10]],
+    }
+    assert histogram_bounds(equi_height, 2) == [10]
+    assert histogram_bounds(equi_height, 4) == [10, 20]
+    singleton = {"histogram-type": "singleton", "buckets": [["base64:dHlwZQ==", 1.0]]}
+    assert histogram_bounds(singleton, 2) == []
+
+
+def test_partition_reader_keeps_partition_order():
+    """Partitions read concurrently still come back in order."""
+
+    def read_partition(partition):
+        start = partition["partition_index"] * 10
+        for batch_start in range(start, start + 10, 3):
+            yield [
+                {"id": i} for i in range(batch_start, min(batch_start + 3, start + 10))
+            ]
+
+    partitions = [{"partition_index": i} for i in range(5)]
+    reader = PartitionReader(read_partition, partitions, max_workers=2)
+    ids = [record["id"] for p in partitions for record in reader.read(p)]
+    reader.close()
+    assert ids == list(range(50))
+
+
+def test_partition_reader_raises_worker_errors():
+    """An error in a worker is raised to the reader."""
+
+    def read_partition(partition):
+        yield [{"id": 1}]
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    reader = PartitionReader(read_partition, [{"partition_index": 0}], max_workers=1)
+    with pytest.raises(RuntimeError, match="boom"):
+        list(reader.read({"partition_index": 0}))
+    reader.close()
@@ -0,0 +1,109 @@
+"""Tests for extraction plan summaries (no server needed)."""
+
+# flake8: noqa
+
+from tap_mysql.planner import (
+    BINLOG,
+    KEYSET_CHUNKS,
+    PARALLEL_RANGES,
+    SINGLE_SCAN,
+    recommend_strategy,
+    summarize_plan,
+)
+
+
+def test_summarize_indexed_range_scans():
+    plan = summarize_plan(
+        strategy=PARALLEL_RANGES,
+        explained=[
+            [{"type": "range", "key": "PRIMARY", "rows": 400, "Extra": "Using where"}],
+            [{"type": "range", "key": "PRIMARY", "rows": 600, "Extra": "Using where"}],
+        ],
+        indexes={"id": "PRIMARY"},
+        partition_key="id",
+    )
+
+    assert plan == {
+        "strategy": PARALLEL_RANGES,
+        "expected_rows": 1000,
+        "index": "PRIMARY",
+        "access": "range",
+        "replication_key_index": None,
+        "partition_key_index": "PRIMARY",
+        "warnings": [],
+    }
+
+
+def test_summarize_unindexed_replication_key():
+    plan = summarize_plan(
+        strategy=KEYSET_CHUNKS,
+        explained=[
+            [{"type": "ALL", "key": None, "rows": 5000, "Extra": "Using filesort"}],
+        ],
+        indexes={"id": "PRIMARY"},
+        replication_key="updated_at",
+    )
+
+    assert plan["replication_key_index"] is None
+    assert plan["warnings"] == [
+        "No index starts with the replication key `updated_at`: "
+        "every sync reads the whole table.",
+        "MySQL sorts the rows with a filesort.",
+        "Every chunk reads the whole table.",
+    ]
+
+
+def test_summarize_without_queries():
+    plan = summarize_plan(strategy="binlog", explained=[], indexes={})
+
+    assert plan["expected_rows"] is None
+    assert plan["index"] is None
+
+
+def recommended(**kwargs):
+    return recommend_strategy(
+        **{
+            "replication_method": "FULL_TABLE",
+            "estimated_rows": 5_000_000,
+            "indexes": {"id": "PRIMARY", "updated_at": "ix_updated_at"},
+            "primary_keys": ["id"],
+            **kwargs,
+        }
+    )
+
+
+def test_recommend_small_tables_in_one_query():
+    strategy, reason = recommended(estimated_rows=5000, partition_key="id")
+    assert strategy == SINGLE_SCAN
+    assert reason == "About 5000 rows, few enough to read in one query."
+    assert recommended(estimated_rows=None)[0] == SINGLE_SCAN
+
+
+def test_recommend_large_full_tables_in_ranges_or_chunks():
+    strategy, reason = recommended(partition_key="id")
+    assert strategy == PARALLEL_RANGES
+    assert "`partition_count`" in reason
+    strategy, reason = recommended(primary_keys=["id"], partition_key=None)
+    assert strategy == KEYSET_CHUNKS
+    assert "`full_table_chunk_size`" in reason
+    strategy, reason = recommended(indexes={}, partition_key="id")
+    assert strategy == SINGLE_SCAN
+    assert reason == "About 5000000 rows, but no indexed key to split them by."
+
+
+def test_recommend_large_incremental_tables_in_pages():
+    strategy, reason = recommended(
+        replication_method="INCREMENTAL",
+        replication_key="updated_at",
+    )
+    assert strategy == KEYSET_CHUNKS
+    assert "`incremental_chunk_size`" in reason
+    strategy, _ = recommended(
+        replication_method="INCREMENTAL",
+        replication_key="price",
+    )
+    assert strategy == SINGLE_SCAN
+
+
+def test_recommend_binlog():
+    assert recommended(replication_method="LOG_BASED")[0] == BINLOG
@@ -0,0 +1,50 @@
+"""Tests for the progress logs of reading a stream."""
+
+# flake8: noqa
+
+import logging
+
+import pytest
+
+from tap_mysql.progress import ReadProgress, format_duration
+
+LOGGER = logging.getLogger("tap-mysql.tests")
+
+
+@pytest.mark.parametrize(
+    ("seconds", "expected"),
+    [(0, "0s"), (4.6, "5s"), (184, "3m04s"), (3720, "1h02m"), (-3, "0s")],
+)
+def test_format_duration(seconds, expected):
+    assert format_duration(seconds) == expected
+
+
+def test_message_with_estimate():
+    progress = ReadProgress(LOGGER, "melty-orders", 1_000_000, interval=3600)
+    progress.add(250_000)
+    now = progress._start + 50  # noqa: SLF001
+    assert progress.message(now) == (
+        "Read 250,000 of ~1,000,000 rows of 'melty-orders' (25.0%), "
+        "5,000 rows/s, ~2m30s left."
+    )
+    progress.add(800_000)
+    assert progress.message(now).endswith(", past the estimate.")
+
+
+def test_message_without_estimate():
+    progress = ReadProgress(LOGGER, "melty-orders", None, interval=3600)
+    progress.add(1_000)
+    now = progress._start + 4  # noqa: SLF001
+    assert progress.message(now) == "Read 1,000 rows of 'melty-orders', 250 rows/s."
+
+
+def test_logs_every_interval(caplog):
+    progress = ReadProgress(LOGGER, "melty-orders", 10, interval=0)
+    with caplog.at_level(logging.INFO, logger=LOGGER.name):
+        progress.add(3)
+        progress.add(3)
+        progress.finish()
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 3
+    assert messages[1].startswith("Read 6 of ~10 rows of 'melty-orders' (60.0%)")
+    assert messages[2].startswith("Read 6 rows of 'melty-orders' in ")
@@ -0,0 +1,27 @@
+"""Tests for building record dicts from query results."""
+
+# flake8: noqa
+
+import sqlalchemy
+
+from tap_mysql.client import record_batches
+
+
+def test_record_batches():
+    """Rows come back as dicts keyed by column name, in batches."""
+    engine = sqlalchemy.create_engine("sqlite://")
+    table = sqlalchemy.Table(
+        "t",
+        sqlalchemy.MetaData(),
+        sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+        sqlalchemy.Column("name", sqlalchemy.String(10)),
+    )
+    table.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [{"id": i, "name": f"n{i}"} for i in range(5)])
+
+    with engine.connect() as conn:
+        batches = list(record_batches(conn.execute(table.select()), 2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[0][0] == {"id": 0, "name": "n0"}
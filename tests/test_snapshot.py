@@ -0,0 +1,99 @@
+"""Tests for consistent snapshots, on SQLite transactions (no server needed)."""
+
+# flake8: noqa
+
+import threading
+
+import pytest
+import sqlalchemy
+
+from tap_mysql import snapshot
+from tap_mysql.snapshot import NO_LOCK, ConsistentSnapshot
+
+POSITION = {"log_file": "binlog.000001", "log_pos": 157, "gtid_set": ""}
+MOVED = {"log_file": "binlog.000001", "log_pos": 420, "gtid_set": ""}
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """A SQLite engine, with SQLite's own way of starting a snapshot."""
+    monkeypatch.setattr(snapshot, "ISOLATION_LEVEL", "SERIALIZABLE")
+    monkeypatch.setattr(snapshot, "START_SNAPSHOT", "BEGIN")
+    monkeypatch.setattr(snapshot, "RETRY_DELAY", 0)
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'melty.db'}")
+    yield engine
+    engine.dispose()
+
+
+def binlog_positions(monkeypatch, *positions):
+    """Make the server report `positions` in turn, then the last one forever."""
+    remaining = list(positions)
+
+    def binlog_position(conn):
+        return remaining.pop(0) if len(remaining) > 1 else remaining[0]
+
+    monkeypatch.setattr(snapshot, "binlog_position", binlog_position)
+
+
+def test_retries_until_position_holds(engine, monkeypatch):
+    binlog_positions(monkeypatch, POSITION, MOVED, MOVED)
+    consistent = ConsistentSnapshot(engine, 2, lock=NO_LOCK)
+    consistent.open()
+    try:
+        assert consistent.position == MOVED
+        with consistent.connection() as first, consistent.connection() as second:
+            assert first is not second
+    finally:
+        consistent.close()
+
+
+def test_gives_up_when_always_committing(engine, monkeypatch):
+    monkeypatch.setattr(snapshot, "ATTEMPTS", 3)
+    positions = [{**POSITION, "log_pos": log_pos} for log_pos in range(10)]
+    binlog_positions(monkeypatch, *positions)
+    with pytest.raises(RuntimeError, match="in 3 attempts"):
+        ConsistentSnapshot(engine, 2, lock=NO_LOCK).open()
+    assert engine.pool.checkedout() == 0
+
+
+def test_without_binlog(engine, monkeypatch):
+    binlog_positions(monkeypatch, None)
+    with pytest.raises(ValueError, match="needs binary logging"):
+        ConsistentSnapshot(engine, 2, lock=NO_LOCK).open()
+
+    single = ConsistentSnapshot(engine, 1, lock=NO_LOCK)
+    single.open()
+    assert single.position is None
+    single.close()
+
+
+def test_connections_are_shared(engine, monkeypatch):
+    binlog_positions(monkeypatch, POSITION)
+    consistent = ConsistentSnapshot(engine, 1, lock=NO_LOCK)
+    consistent.open()
+    borrowed = []
+
+    def borrow():
+        with consistent.connection() as conn:
+            borrowed.append(conn)
+
+    with consistent.connection() as conn:
+        waiting = threading.Thread(target=borrow)
+        waiting.start()
+        waiting.join(timeout=0.2)
+        assert waiting.is_alive()
+    waiting.join(timeout=5)
+    assert borrowed == [conn]
+
+    # A connection given back by an error is gone, with its snapshot.
+    with pytest.raises(KeyError), consistent.connection():
+        raise KeyError
+    with pytest.raises(RuntimeError, match="no connections left"):
+        borrow()
+    consistent.close()
+    assert engine.pool.checkedout() == 0
+
+
+def test_unknown_lock(engine):
+    with pytest.raises(ValueError, match="Snapshot lock must be one of"):
+        ConsistentSnapshot(engine, 1, lock="table_locks")
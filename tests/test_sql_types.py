@@ -0,0 +1,55 @@
+"""Tests for memoized type resolution (no server needed)."""
+
+# flake8: noqa
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from tap_mysql.sql_types import parse_column_type, sdk_type_for_name
+
+
+@pytest.mark.parametrize(
+    ("column_type", "expected"),
+    [
+        ("decimal(25,4) unsigned", mysql.DECIMAL(25, 4, unsigned=True)),
+        ("tinyint(1)", mysql.TINYINT(display_width=1)),
+        ("bigint unsigned", mysql.BIGINT(unsigned=True)),
+        ("datetime(6)", mysql.DATETIME(fsp=6)),
+        ("varchar(97)", mysql.VARCHAR(97)),
+        ("enum('a','b''c')", mysql.ENUM("a", "b'c")),
+        ("bit(1)", mysql.BIT(1)),
+    ],
+)
+def test_parse_column_type(column_type, expected):
+    """Types are parsed with their arguments, as the MySQL dialect reflects them."""
+    assert repr(parse_column_type(column_type)) == repr(expected)
+
+
+def test_parse_column_type_is_memoized():
+    assert parse_column_type("int(11)") is parse_column_type("int(11)")
+
+
+@pytest.mark.parametrize(
+    ("type_name", "expected"),
+    [
+        ("timestamp", {"type": ["string"], "format": "date-time"}),
+        ("DATETIME", {"type": ["string"], "format": "date-time"}),
+        ("date", {"type": ["string"], "format": "date"}),
+        ("tinyint(1)", {"type": ["integer"]}),
+        ("decimal(25,4) unsigned", {"type": ["number"]}),
+        ("DOUBLE", {"type": ["number"]}),
+        ("mediumtext", {"type": ["string"]}),
+        ("BIT", {"type": ["integer"]}),
+        ("geometry", {"type": ["string"]}),
+    ],
+)
+def test_sdk_type_for_name(type_name, expected):
+    assert sdk_type_for_name(type_name).type_dict == expected
+
+
+def test_sdk_type_dicts_are_not_shared():
+    """Callers may update the type dict, as `Property.to_dict` does."""
+    type_dict = sdk_type_for_name("varchar(10)").type_dict
+    type_dict["description"] = "changed"
+
+    assert sdk_type_for_name("varchar(10)").type_dict == {"type": ["string"]}
@@ -0,0 +1,89 @@
+"""Tests for the high-throughput SSH tunnel, against a local SSH server."""
+
+# flake8: noqa
+
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+import paramiko
+import pytest
+
+from tap_mysql.ssh import SSHTunnel
+from tests.ssh_server import EchoServer, SSHServer
+
+
+@pytest.fixture(scope="module")
+def servers():
+    ssh_server, echo_server = SSHServer(), EchoServer()
+    yield ssh_server, echo_server
+    ssh_server.close()
+    echo_server.close()
+
+
+@pytest.fixture(scope="module")
+def client_key():
+    return paramiko.RSAKey.generate(2048)
+
+
+def echo(port, data):
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        sock.sendall(data)
+        sock.shutdown(socket.SHUT_WR)
+        received = bytearray()
+        while chunk := sock.recv(2**16):
+            received += chunk
+    return bytes(received)
+
+
+def test_forwards_concurrent_connections(servers, client_key):
+    ssh_server, echo_server = servers
+    tunnel = SSHTunnel(
+        ssh_address=("127.0.0.1", ssh_server.port),
+        username="melty",
+        remote_address=("127.0.0.1", echo_server.port),
+        pkey=client_key,
+        connections=2,
+    )
+    tunnel.start()
+    payloads = [bytes([i]) * (2**20 + i) for i in range(6)]
+    try:
+        with ThreadPoolExecutor(max_workers=len(payloads)) as pool:
+            echoed = list(
+                pool.map(lambda data: echo(tunnel.local_bind_port, data), payloads)
+            )
+    finally:
+        tunnel.stop()
+
+    assert echoed == payloads
+    assert len(tunnel._transports) == 0  # noqa: SLF001
+
+
+def test_cipher_preference(servers, client_key):
+    ssh_server, echo_server = servers
+    tunnel = SSHTunnel(
+        ssh_address=("127.0.0.1", ssh_server.port),
+        username="melty",
+        remote_address=("127.0.0.1", echo_server.port),
+        pkey=client_key,
+        ciphers=["no-such-cipher", "aes256-ctr"],
+    )
+    tunnel.start()
+    try:
+        assert echo(tunnel.local_bind_port, b"melty") == b"melty"
+        options = tunnel._transports[0].get_security_options()  # noqa: SLF001
+        assert options.ciphers[0] == "aes256-ctr"
+    finally:
+        tunnel.stop()
+
+
+def test_no_supported_cipher(servers, client_key):
+    ssh_server, echo_server = servers
+    tunnel = SSHTunnel(
+        ssh_address=("127.0.0.1", ssh_server.port),
+        username="melty",
+        remote_address=("127.0.0.1", echo_server.port),
+        pkey=client_key,
+        ciphers=["no-such-cipher"],
+    )
+    with pytest.raises(ValueError, match="None of the ciphers"):
+        tunnel.start()
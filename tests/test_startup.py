@@ -0,0 +1,27 @@
+"""Tests for what starting the tap costs (no server needed)."""
+
+# flake8: noqa
+
+import subprocess
+import sys
+
+# Optional or rarely needed, imported only when used.
+DEFERRED_MODULES = ("paramiko", "sshtunnel", "pymysqlreplication", "pyarrow")
+
+
+def test_import_defers_optional_modules():
+    """Importing the tap does not import SSH, binlog or Arrow modules."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            (
+                "import sys, tap_mysql.tap; "
+                f"print(' '.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+            ),
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert result.stdout.split() == []